@@ -0,0 +1,795 @@
+"""
+Reading and writing assessment files.
+
+Nothing in this module touches Qt, so it can be used from worker threads
+and command line tools as well as from the GUI.
+
+File format
+-----------
+Version 3 files look like::
+
+    {
+      "format": "risk-assessment",
+      "version": 3,
+      "project_info": {...},
+      "strings": ["Operator", "Cleaning", "Electrical", ...],
+      "users": [{"name": ..., "tasks": [{"name": ..., "hazards": [...]}]}],
+      "risk_reduction_text": "",
+      "risk_rows": {"fields": [...], "rows": [[...], ...]},
+      "control_systems": {"fields": [...], "rows": [[...], ...]},
+      "alternative_methods": {"fields": [...], "rows": [[...], ...]}
+    }
+
+Each table names its fields once and stores rows as arrays in that order.
+Severity, probability, risk level, control category and the "risk
+assessment complete" answer are stored as integer codes (their position in
+the matching list in risk_assessment), or null when a cell was left empty.
+A cell holding any other text (the control table's risk cells are typed in
+freely) stores that text, and is read back as it was.
+Derived values such as the item number are not stored; the risk levels are,
+so other tools can read them without the risk matrix.
+
+Text fields that repeat from row to row (see STRING_FIELDS: user, task,
+category, hazard and cause of a risk row, and so on) hold an index into the
+"strings" list instead of the text. Each distinct value is stored once in
+the file, and once in memory after loading, as every row that uses it
+shares the same interned str.
+
+The tables come last, risk rows first, so stream_assessment can hand out
+the project and the first risk rows before the rest of the file has been
+read, and before the GUI builds the widget-heavy control system and
+alternative method tables.
+
+Files whose name ends in ".json.gz" are written gzip-compressed and ".rjz"
+files zstd-compressed (gzip when the optional zstandard package is not
+installed). Compressed files are written without indentation. Reading
+looks at the first bytes of the file rather than its name.
+
+Older files are migrated on load: version 2 (the same layout with the
+text inline), version 1 (``hazard_data`` and
+``risk_assessment_data`` with ``col_N`` keys) and version 0 (``hazards`` and
+``risk_assessment`` with the ten column Low/Medium/High layout).
+"""
+
+import gzip
+import io
+import json
+import os
+import re
+import stat
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from risk_assessment import (
+    ASSESSMENT_COMPLETE_OPTIONS, CONTROL_CATEGORIES, PROBABILITY_LEVELS, RISK_LEVELS, RISK_MATRIX, SEVERITY_LEVELS,
+    AlternativeMethodRow, Assessment, ControlSystemRow, Hazard, Project, RiskRow, Task, User,
+    matrix_risk_level, split_hazard_text
+)
+from hazard_catalog import categorize_hazard
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+FORMAT_NAME = "risk-assessment"
+FORMAT_VERSION = 3
+
+RISK_ROW_FIELDS = [
+    "user", "task", "category", "hazard", "cause",
+    "initial_severity", "initial_probability", "initial_risk", "measures",
+    "residual_severity", "residual_probability", "residual_risk"
+]
+CONTROL_SYSTEM_FIELDS = [
+    "safety_function", "hazard", "initial_risk", "final_risk",
+    "required_category", "actual_category", "control_type", "verification"
+]
+ALTERNATIVE_METHOD_FIELDS = [
+    "task", "hazard", "risk_assessment_complete", "justification", "procedure",
+    "engineering_controls", "training_requirements", "verification_steps", "approvals"
+]
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# Fields stored as indexes into the file's "strings" list
+STRING_FIELDS = {
+    'risk_rows': ("user", "task", "category", "hazard", "cause"),
+    'control_systems': ("control_type",),
+    'alternative_methods': ("task",),
+}
+_TABLE_FIELDS = {
+    'risk_rows': RISK_ROW_FIELDS,
+    'control_systems': CONTROL_SYSTEM_FIELDS,
+    'alternative_methods': ALTERNATIVE_METHOD_FIELDS,
+}
+
+# Column order of the col_N dictionaries written by version 1
+_V1_CONTROL_SYSTEM_COLUMNS = len(CONTROL_SYSTEM_FIELDS)
+_V1_ALTERNATIVE_METHOD_COLUMNS = len(ALTERNATIVE_METHOD_FIELDS)
+
+# Version 0 used a 3x3 matrix; these land on the nearest cells of the 4x4 one,
+# and _v0_rating moves a row to the closest cell that keeps its stored risk
+_V0_SEVERITY = {"High": "Catastrophic", "Medium": "Serious", "Low": "Moderate"}
+_V0_LIKELIHOOD = {"Frequent": "Very Likely", "Occasional": "Likely", "Rare": "Unlikely"}
+
+
+class AssessmentFormatError(ValueError):
+    """Raised when a file is not an assessment this version can read"""
+
+
+def _codes(labels: Sequence[str]) -> Dict[str, int]:
+    return {label: code for code, label in enumerate(labels)}
+
+_SEVERITY_CODES = _codes(SEVERITY_LEVELS)
+_PROBABILITY_CODES = _codes(PROBABILITY_LEVELS)
+_RISK_CODES = _codes(RISK_LEVELS)
+_CATEGORY_CODES = _codes(CONTROL_CATEGORIES)
+_COMPLETE_CODES = _codes(ASSESSMENT_COMPLETE_OPTIONS)
+
+
+def _encode(codes: Dict[str, int], label: str) -> Union[int, str, None]:
+    """The code of one of the choices, other text as it is, null for an empty cell"""
+    code = codes.get(label)
+    if code is None:
+        return label or None
+    return code
+
+
+def risk_level_code(label: str) -> Optional[int]:
+    """File code for a risk level label ("High", "Medium", "Low")"""
+    return _RISK_CODES.get(label)
+
+
+def _decoder(labels: Sequence[str]) -> Callable[[Union[int, str, None]], str]:
+    """Inverse of _encode. A null or unknown code reads as an empty cell, never
+    as one of the choices, so nothing is filled in that the user did not pick."""
+    labels = list(labels)
+    count = len(labels)
+
+    def decode(code):
+        if isinstance(code, str):
+            return code
+        if not isinstance(code, int) or not 0 <= code < count:
+            return ""
+        return labels[code]
+    return decode
+
+_decode_severity = _decoder(SEVERITY_LEVELS)
+_decode_probability = _decoder(PROBABILITY_LEVELS)
+_decode_risk = _decoder(RISK_LEVELS)
+_decode_category = _decoder(CONTROL_CATEGORIES)
+_decode_complete = _decoder(ASSESSMENT_COMPLETE_OPTIONS)
+
+
+# Writing
+
+class _StringTable:
+    """Hands out one index per distinct string, in first-seen order"""
+    __slots__ = ('strings', '_codes')
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+
+def encode_assessment(assessment: Assessment) -> Dict[str, Any]:
+    """Turn an Assessment into plain data in the current file format.
+
+    The result shares no mutable state with the assessment, so it can be
+    handed to another thread for serializing.
+    """
+    strings = _StringTable()
+    code = strings.code
+    risk_rows = [
+        [
+            code(row.user), code(row.task), code(row.category), code(row.hazard), code(row.cause),
+            _encode(_SEVERITY_CODES, row.initial_severity),
+            _encode(_PROBABILITY_CODES, row.initial_probability),
+            _encode(_RISK_CODES, row.initial_risk),
+            row.measures,
+            _encode(_SEVERITY_CODES, row.residual_severity),
+            _encode(_PROBABILITY_CODES, row.residual_probability),
+            _encode(_RISK_CODES, row.residual_risk)
+        ]
+        for row in assessment.risk_rows
+    ]
+    control_systems = [
+        [
+            row.safety_function, row.hazard,
+            _encode(_RISK_CODES, row.initial_risk),
+            _encode(_RISK_CODES, row.final_risk),
+            _encode(_CATEGORY_CODES, row.required_category),
+            _encode(_CATEGORY_CODES, row.actual_category),
+            code(row.control_type), row.verification
+        ]
+        for row in assessment.control_systems
+    ]
+    alternative_methods = [
+        [
+            code(row.task), row.hazard,
+            _encode(_COMPLETE_CODES, row.risk_assessment_complete),
+            row.justification, row.procedure, row.engineering_controls,
+            row.training_requirements, row.verification_steps, row.approvals
+        ]
+        for row in assessment.alternative_methods
+    ]
+    return {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'saved_date': datetime.now().isoformat(),
+        'project_info': dict(assessment.project_info),
+        'strings': strings.strings,
+        'users': [
+            {
+                'name': user.name,
+                'tasks': [
+                    {'name': task.name, 'hazards': [hazard.description for hazard in task.hazards]}
+                    for task in user.tasks
+                ]
+            }
+            for user in assessment.project.users
+        ],
+        'risk_reduction_text': assessment.risk_reduction_text,
+        'risk_rows': {'fields': RISK_ROW_FIELDS, 'rows': risk_rows},
+        'control_systems': {'fields': CONTROL_SYSTEM_FIELDS, 'rows': control_systems},
+        'alternative_methods': {'fields': ALTERNATIVE_METHOD_FIELDS, 'rows': alternative_methods}
+    }
+
+
+def compression_for_path(file_path: str) -> Optional[str]:
+    """The compression ("gzip", "zstd" or None) to write file_path with"""
+    name = file_path.lower()
+    if name.endswith('.rjz'):
+        return 'zstd' if zstandard is not None else 'gzip'
+    if name.endswith('.gz'):
+        return 'gzip'
+    return None
+
+
+def _read_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once at import: os.umask can only be read by setting it, which is not
+# safe while other threads may be creating files
+UMASK = _read_umask()
+
+
+def replacement_mode(file_path: str) -> int:
+    """Permission bits for a file written in place of file_path: those of the
+    file it replaces, or the ones open() would give a new file"""
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~UMASK
+
+
+def write_json_atomic(file_path: str, data: Dict[str, Any]):
+    """Write data as JSON so that file_path holds either the old or the new file.
+
+    The JSON goes to a temporary file in the same directory, which is fsynced
+    and then renamed over the target, so a crash mid-write cannot leave a
+    truncated assessment behind. The new file keeps the permissions of the
+    one it replaces. The name picks the compression, see
+    compression_for_path.
+    """
+    compression = compression_for_path(file_path)
+    if compression is None:
+        text = json.dumps(data, indent=2)
+    else:
+        text = json.dumps(data, separators=(',', ':'))
+    directory = os.path.dirname(os.path.abspath(file_path))
+    mode = replacement_mode(file_path)
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            encoded = text.encode('utf-8')
+            if compression == 'gzip':
+                encoded = gzip.compress(encoded, compresslevel=GZIP_LEVEL, mtime=0)
+            elif compression == 'zstd':
+                encoded = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(encoded)
+            f.write(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)  # mkstemp creates the file readable by its owner only
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Reading
+
+def _table_rows(table: Dict[str, Any], fields: List[str]) -> List[list]:
+    """Return a table's rows with their values in `fields` order"""
+    return _reorder(table.get('rows', []), table.get('fields', fields), fields)
+
+
+def _reorder(rows: List[list], stored: List[str], fields: List[str]) -> List[list]:
+    if stored == fields:
+        return rows
+    # Fields this version does not know are dropped and missing ones read as None
+    positions = {name: index for index, name in enumerate(stored)}
+    picks = [positions.get(name) for name in fields]
+    return [[row[p] if p is not None and p < len(row) else None for p in picks] for row in rows]
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value)
+
+
+def decode_assessment(data: Dict[str, Any]) -> Assessment:
+    """Build an Assessment from parsed file data of any supported version"""
+    if not isinstance(data, dict):
+        raise AssessmentFormatError("Not an assessment file")
+    data = migrate(data)
+
+    project_info = dict(data.get('project_info') or {})
+    strings = _intern_strings(data.get('strings', []))
+    return Assessment(
+        project_info=project_info,
+        project=decode_project(data.get('users', []), project_info),
+        risk_rows=decode_risk_rows(_table_rows(data.get('risk_rows', {}), RISK_ROW_FIELDS), strings),
+        control_systems=decode_control_system_rows(
+            _table_rows(data.get('control_systems', {}), CONTROL_SYSTEM_FIELDS), strings
+        ),
+        alternative_methods=decode_alternative_method_rows(
+            _table_rows(data.get('alternative_methods', {}), ALTERNATIVE_METHOD_FIELDS), strings
+        ),
+        risk_reduction_text=data.get('risk_reduction_text') or ""
+    )
+
+
+def _intern_strings(strings: List[Any]) -> List[str]:
+    return [sys.intern(_text(value)) for value in strings]
+
+
+def decode_project(users: List[Dict[str, Any]], project_info: Dict[str, Any]) -> Project:
+    """The user -> task -> hazard tree from a file's "users" section"""
+    project = Project(name=project_info.get('name', ''), description=project_info.get('description', ''))
+    for user_data in users:
+        user = User(name=user_data['name'])
+        for task_data in user_data.get('tasks', []):
+            user.add_task(Task(
+                name=task_data['name'],
+                hazards=[Hazard(description=description) for description in task_data.get('hazards', [])]
+            ))
+        project.add_user(user)
+    return project
+
+
+def decode_risk_rows(rows: Iterable[Sequence[Any]], strings: Optional[Sequence[str]] = None) -> List[RiskRow]:
+    """RiskRows from encoded rows in RISK_ROW_FIELDS order.
+
+    With strings, the STRING_FIELDS are indexes into it; without, they are
+    the text itself (the version 2 layout, as kept by assessment_store).
+    """
+    text = _text if strings is None else strings.__getitem__
+    return [
+        RiskRow(
+            text(user), text(task), text(category), text(hazard), text(cause),
+            _decode_severity(initial_severity), _decode_probability(initial_probability),
+            _text(measures),
+            _decode_severity(residual_severity), _decode_probability(residual_probability)
+        )
+        for (user, task, category, hazard, cause,
+             initial_severity, initial_probability, _initial_risk, measures,
+             residual_severity, residual_probability, _residual_risk) in rows
+    ]
+
+
+def decode_control_system_rows(rows: Iterable[Sequence[Any]],
+                               strings: Optional[Sequence[str]] = None) -> List[ControlSystemRow]:
+    """ControlSystemRows from encoded rows in CONTROL_SYSTEM_FIELDS order"""
+    text = _text if strings is None else strings.__getitem__
+    return [
+        ControlSystemRow(
+            _text(safety_function), _text(hazard),
+            _decode_risk(initial_risk), _decode_risk(final_risk),
+            _decode_category(required_category), _decode_category(actual_category),
+            text(control_type), _text(verification)
+        )
+        for (safety_function, hazard, initial_risk, final_risk,
+             required_category, actual_category, control_type, verification) in rows
+    ]
+
+
+def decode_alternative_method_rows(rows: Iterable[Sequence[Any]],
+                                   strings: Optional[Sequence[str]] = None) -> List[AlternativeMethodRow]:
+    """AlternativeMethodRows from encoded rows in ALTERNATIVE_METHOD_FIELDS order"""
+    text = _text if strings is None else strings.__getitem__
+    return [
+        AlternativeMethodRow(
+            text(task), _text(hazard), _decode_complete(complete),
+            *(_text(value) for value in rest)
+        )
+        for (task, hazard, complete, *rest) in rows
+    ]
+
+
+@contextmanager
+def open_assessment_file(file_path: str):
+    """Open an assessment file for reading as text, decompressing it if needed.
+
+    Yields (text stream, raw file); raw.tell() is how far into the file on
+    disk reading has got.
+    """
+    with open(file_path, 'rb') as raw:
+        magic = raw.read(len(ZSTD_MAGIC))
+        raw.seek(0)
+        if magic.startswith(GZIP_MAGIC):
+            binary = gzip.GzipFile(fileobj=raw, mode='rb')
+        elif magic.startswith(ZSTD_MAGIC):
+            if zstandard is None:
+                raise AssessmentFormatError(
+                    f"{file_path} is zstd-compressed; install the zstandard package to open it"
+                )
+            binary = zstandard.ZstdDecompressor().stream_reader(raw, read_size=1 << 14, closefd=False)
+        else:
+            binary = raw
+        with io.TextIOWrapper(binary, encoding='utf-8') as text:
+            yield text, raw
+
+
+def load_assessment(file_path: str) -> Assessment:
+    """Read an assessment file of any supported version"""
+    with open_assessment_file(file_path) as (f, _raw):
+        return decode_assessment(json.load(f))
+
+
+# Streaming
+
+STREAM_CHUNK_ROWS = 500
+_READ_SIZE = 1 << 16
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Tables that are read a chunk at a time, with their field order and decoder
+_STREAMED_TABLES = {
+    'risk_rows': (RISK_ROW_FIELDS, decode_risk_rows),
+    'control_systems': (CONTROL_SYSTEM_FIELDS, decode_control_system_rows),
+    'alternative_methods': (ALTERNATIVE_METHOD_FIELDS, decode_alternative_method_rows),
+}
+
+
+class _StreamParser:
+    """Just enough of an incremental JSON reader to walk an object key by key"""
+
+    def __init__(self, f):
+        self._f = f
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.consumed = 0  # characters before the start of the buffer
+
+    @property
+    def position(self) -> int:
+        return self.consumed + self._pos
+
+    def _fill(self, size: int = _READ_SIZE) -> bool:
+        chunk = self._f.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self.consumed += self._pos
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise AssessmentFormatError(f"Expected '{char}' at character {self.position}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        size = _READ_SIZE
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+                size *= 2  # one big value (e.g. the users tree) needs bigger reads
+                continue
+            # A number that runs to the end of the buffer may continue in the file
+            if end == len(self._buffer) and isinstance(value, (int, float)) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def items(self) -> Iterator[str]:
+        """Walk the keys of an object; the caller must read each value"""
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self.expect(separator if separator in ',}' else ',')
+            if separator == '}':
+                return
+
+    def elements(self) -> Iterator[Any]:
+        """Yield the values of an array one at a time"""
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.expect(separator if separator in ',]' else ',')
+            if separator == ']':
+                return
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _header_assessment(header: Dict[str, Any]) -> Assessment:
+    project_info = dict(header.get('project_info') or {})
+    return Assessment(
+        project_info=project_info,
+        project=decode_project(header.get('users', []), project_info),
+        risk_reduction_text=header.get('risk_reduction_text') or ""
+    )
+
+
+def stream_assessment(file_path: str, chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[Tuple[str, Any, float]]:
+    """Read an assessment a piece at a time, yielding (kind, payload, progress).
+
+    kind is "header" with an Assessment holding everything but the table rows,
+    or a table name ("risk_rows", "control_systems", "alternative_methods")
+    with a list of at most chunk_rows decoded rows. progress runs from 0 to 1.
+
+    A "header" always comes before any rows. For current files the tables
+    are read as they are yielded, so the caller can show the first rows
+    before the rest of the file is parsed; older files are read whole,
+    migrated and then handed out in the same chunks. A second "header" may
+    follow the rows if the file had header fields after its tables.
+    """
+    size = max(os.path.getsize(file_path), 1)
+    with open_assessment_file(file_path) as (f, raw):
+        parser = _StreamParser(f)
+        header: Dict[str, Any] = {}
+        header_sent = False
+        header_changed = False
+        for key in parser.items():
+            streamable = (
+                key in _STREAMED_TABLES and header.get('version') == FORMAT_VERSION and 'strings' in header
+            )
+            if not streamable or parser.peek() != '{':
+                header[key] = parser.value()
+                header_changed = True
+                continue
+            if header_changed or not header_sent:
+                yield 'header', _header_assessment(header), raw.tell() / size
+                header_sent, header_changed = True, False
+                strings = _intern_strings(header['strings'])
+            fields, decode = _STREAMED_TABLES[key]
+            stored = fields
+            for table_key in parser.items():
+                if table_key == 'fields':
+                    stored = parser.value()
+                elif table_key == 'rows':
+                    chunk = []
+                    for row in parser.elements():
+                        chunk.append(row)
+                        if len(chunk) >= chunk_rows:
+                            yield key, decode(_reorder(chunk, stored, fields), strings), min(raw.tell() / size, 1.0)
+                            chunk = []
+                    if chunk:
+                        yield key, decode(_reorder(chunk, stored, fields), strings), min(raw.tell() / size, 1.0)
+                else:
+                    parser.value()
+
+    if header_sent:
+        if header_changed:
+            yield 'header', _header_assessment(header), 1.0
+        return
+
+    # Nothing was streamed: an older version, or tables written before the version
+    assessment = decode_assessment(header)
+    rows = {
+        'risk_rows': assessment.risk_rows,
+        'control_systems': assessment.control_systems,
+        'alternative_methods': assessment.alternative_methods,
+    }
+    assessment.risk_rows, assessment.control_systems, assessment.alternative_methods = [], [], []
+    yield 'header', assessment, 1.0
+    for kind, table_rows in rows.items():
+        for start in range(0, len(table_rows), chunk_rows):
+            yield kind, table_rows[start:start + chunk_rows], 1.0
+
+
+# Migrations
+
+def file_version(data: Dict[str, Any]) -> int:
+    """Work out which version of the format data was written in"""
+    if 'version' in data:
+        return data['version']
+    if 'hazard_data' in data or 'risk_assessment_data' in data:
+        return 1
+    if 'hazards' in data or 'risk_assessment' in data:
+        return 0
+    raise AssessmentFormatError("Not an assessment file")
+
+
+def migrate(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Bring parsed file data up to FORMAT_VERSION"""
+    version = file_version(data)
+    if not isinstance(version, int) or version > FORMAT_VERSION:
+        raise AssessmentFormatError(
+            f"Assessment file version {version} is newer than this program supports ({FORMAT_VERSION})"
+        )
+    while version < FORMAT_VERSION:
+        data = _MIGRATIONS[version](data)
+        version += 1
+    return data
+
+
+def _columns(row: Dict[str, Any], count: int) -> List[str]:
+    return [row.get(f'col_{col}', "") or "" for col in range(count)]
+
+
+def _v0_rating(severity: str, likelihood: str, risk: str) -> Tuple[str, str]:
+    """The 4x4 severity and probability for a version 0 row rated risk.
+
+    The mapped cell is kept when the matrix agrees with the stored risk (or
+    there is none); otherwise the nearest cell at that risk level is used,
+    preferring one with the same severity, so no row changes level.
+    """
+    mapped = (_V0_SEVERITY.get(severity, severity), _V0_LIKELIHOOD.get(likelihood, likelihood))
+    if (risk not in RISK_LEVELS or mapped[0] not in SEVERITY_LEVELS or mapped[1] not in PROBABILITY_LEVELS
+            or matrix_risk_level(*mapped) == risk):
+        return mapped
+    row, col = SEVERITY_LEVELS.index(mapped[0]), PROBABILITY_LEVELS.index(mapped[1])
+    _distance, _moved, i, j = min(
+        (abs(i - row) + abs(j - col), abs(i - row), i, j)
+        for i, levels in enumerate(RISK_MATRIX) for j, level in enumerate(levels) if level == risk
+    )
+    return SEVERITY_LEVELS[i], PROBABILITY_LEVELS[j]
+
+
+def _migrate_v0(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Version 0 -> 1: rename the sections and widen risk rows to 13 columns"""
+    risk_rows = []
+    for item_id, row in enumerate(data.get('risk_assessment', []), 1):
+        (user, task, hazard_text, severity, likelihood, risk, measures,
+         residual_severity, residual_likelihood, residual_risk) = _columns(row, 10)
+        hazard, cause = split_hazard_text(hazard_text)
+        initial = _v0_rating(severity, likelihood, risk)
+        residual = _v0_rating(residual_severity, residual_likelihood, residual_risk)
+        values = [str(item_id), user, task, categorize_hazard(hazard, cause), hazard, cause,
+                  initial[0], initial[1], matrix_risk_level(*initial), measures,
+                  residual[0], residual[1], matrix_risk_level(*residual)]
+        risk_rows.append({f'col_{col}': value for col, value in enumerate(values)})
+    return {
+        'project_info': data.get('project_info', {}),
+        'hazard_data': data.get('hazards', []),
+        'risk_assessment_data': risk_rows,
+        'control_system_data': data.get('control_systems', []),
+        'alternative_method_data': data.get('alternative_methods', []),
+        'risk_reduction_text': data.get('risk_reduction_text', "")
+    }
+
+
+def _migrate_v1(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Version 1 -> 2: col_N dictionaries become named fields with enum codes"""
+    risk_rows = []
+    for row in data.get('risk_assessment_data', []):
+        (_item_id, user, task, category, hazard, cause, severity, probability, risk,
+         measures, residual_severity, residual_probability, residual_risk) = _columns(row, 13)
+        risk_rows.append([
+            user, task, category, hazard, cause,
+            _encode(_SEVERITY_CODES, severity), _encode(_PROBABILITY_CODES, probability),
+            _encode(_RISK_CODES, risk), measures,
+            _encode(_SEVERITY_CODES, residual_severity), _encode(_PROBABILITY_CODES, residual_probability),
+            _encode(_RISK_CODES, residual_risk)
+        ])
+    control_systems = []
+    for row in data.get('control_system_data', []):
+        (safety_function, hazard, initial_risk, final_risk, required_category,
+         actual_category, control_type, verification) = _columns(row, _V1_CONTROL_SYSTEM_COLUMNS)
+        control_systems.append([
+            safety_function, hazard,
+            _encode(_RISK_CODES, initial_risk), _encode(_RISK_CODES, final_risk),
+            _encode(_CATEGORY_CODES, required_category), _encode(_CATEGORY_CODES, actual_category),
+            control_type, verification
+        ])
+    alternative_methods = []
+    for row in data.get('alternative_method_data', []):
+        task, hazard, complete, *rest = _columns(row, _V1_ALTERNATIVE_METHOD_COLUMNS)
+        alternative_methods.append([task, hazard, _encode(_COMPLETE_CODES, complete), *rest])
+    return {
+        'format': FORMAT_NAME,
+        'version': 2,
+        'project_info': data.get('project_info', {}),
+        'users': [
+            {
+                'name': user_data['user'],
+                'tasks': [
+                    {'name': task_data['task'], 'hazards': list(task_data.get('hazards', []))}
+                    for task_data in user_data.get('tasks', [])
+                ]
+            }
+            for user_data in data.get('hazard_data', [])
+        ],
+        'risk_rows': {'fields': RISK_ROW_FIELDS, 'rows': risk_rows},
+        'control_systems': {'fields': CONTROL_SYSTEM_FIELDS, 'rows': control_systems},
+        'alternative_methods': {'fields': ALTERNATIVE_METHOD_FIELDS, 'rows': alternative_methods},
+        'risk_reduction_text': data.get('risk_reduction_text', "")
+    }
+
+
+def _convert_strings(data: Dict[str, Any], convert: Callable[[Any], Any]) -> Dict[str, Any]:
+    """Copy data with convert applied to every STRING_FIELDS cell"""
+    data = dict(data)
+    for table, names in STRING_FIELDS.items():
+        if table not in data:
+            continue
+        fields = data[table].get('fields', _TABLE_FIELDS[table])
+        positions = [fields.index(name) for name in names if name in fields]
+        rows = []
+        for row in data[table].get('rows', []):
+            row = list(row)
+            for position in positions:
+                row[position] = convert(row[position])
+            rows.append(row)
+        data[table] = {'fields': fields, 'rows': rows}
+    return data
+
+
+def _migrate_v2(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Version 2 -> 3: repeated text moves into the "strings" table"""
+    strings = _StringTable()
+    data = _convert_strings(data, lambda value: strings.code(_text(value)))
+    data['strings'] = strings.strings
+    data['version'] = 3
+    return data
+
+
+def unpack_strings(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Current file data with the string indexes replaced by their text (the version 2 layout)"""
+    if data.get('version', FORMAT_VERSION) < 3:
+        return data
+    strings = data.get('strings', [])
+    data = _convert_strings(data, strings.__getitem__)
+    del data['strings']
+    data['version'] = 2
+    return data
+
+
+_MIGRATIONS = {
+    0: _migrate_v0,
+    1: _migrate_v1,
+    2: _migrate_v2,
+}
@@ -0,0 +1,348 @@
+"""
+SQLite-backed assessment store (".rdb" files).
+
+An alternative to the JSON format for large projects. Each part of the
+assessment lives in its own table, risk rows are indexed on risk level and
+category so they can be queried without loading the project, and saving
+only writes the rows that changed since the store was last read or written,
+as UPSERTs and DELETEs inside one transaction.
+
+The store works on the same plain data as assessment_io.encode_assessment,
+with the same integer codes, so nothing here touches Qt. A store may be
+used from a worker thread, but only one thread at a time.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.request import pathname2url
+
+from assessment_io import (
+    ALTERNATIVE_METHOD_FIELDS, CONTROL_SYSTEM_FIELDS, FORMAT_NAME, RISK_ROW_FIELDS,
+    decode_assessment, decode_risk_rows, risk_level_code, unpack_strings
+)
+from risk_assessment import RISK_LEVELS, Assessment, RiskRow
+
+STORE_EXTENSION = ".rdb"
+# Rows are kept with their text inline, as in version 2 of the file format;
+# SQLite already stores each row's text compactly and the indexes need it
+STORE_VERSION = 2
+
+# Table name -> (key columns, value columns). Rows are matched between saves
+# by their key; risk rows use their identity so inserting a hazard does not
+# rewrite every row after it, the other tables use their position.
+_TABLES = {
+    'project_info': (("name",), ("value",)),
+    'texts': (("name",), ("value",)),
+    'users': (("position",), ("name",)),
+    'tasks': (("user_position", "position"), ("name",)),
+    'hazards': (("user_position", "task_position", "position"), ("description",)),
+    'risk_rows': (
+        ("user", "task", "hazard", "cause", "occurrence"),
+        ("position", "category", "initial_severity", "initial_probability", "initial_risk", "measures",
+         "residual_severity", "residual_probability", "residual_risk")
+    ),
+    'control_systems': (("position",), tuple(CONTROL_SYSTEM_FIELDS)),
+    'alternative_methods': (("position",), tuple(ALTERNATIVE_METHOD_FIELDS)),
+}
+
+_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS risk_rows_residual_risk ON risk_rows (residual_risk, category)",
+    "CREATE INDEX IF NOT EXISTS risk_rows_initial_risk ON risk_rows (initial_risk, category)",
+    "CREATE INDEX IF NOT EXISTS risk_rows_category ON risk_rows (category)",
+    "CREATE INDEX IF NOT EXISTS risk_rows_position ON risk_rows (position)",
+]
+
+_RISK_SELECT = ", ".join(RISK_ROW_FIELDS)
+
+Row = Tuple[Any, ...]
+
+
+def _create_statement(table: str) -> str:
+    keys, values = _TABLES[table]
+    columns = ", ".join(keys + values)
+    return f"CREATE TABLE IF NOT EXISTS {table} ({columns}, PRIMARY KEY ({', '.join(keys)})) WITHOUT ROWID"
+
+
+def _upsert_statement(table: str) -> str:
+    keys, values = _TABLES[table]
+    placeholders = ", ".join("?" for _ in keys + values)
+    updates = ", ".join(f"{column} = excluded.{column}" for column in values)
+    return (
+        f"INSERT INTO {table} ({', '.join(keys + values)}) VALUES ({placeholders}) "
+        f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}"
+    )
+
+
+def _delete_statement(table: str) -> str:
+    keys, _values = _TABLES[table]
+    return f"DELETE FROM {table} WHERE " + " AND ".join(f"{column} = ?" for column in keys)
+
+
+def _assign_positions(keys: List[Row], old_rows: Dict[Row, Row]) -> List[float]:
+    """Sort positions for risk rows in table order.
+
+    Rows keep their stored position while it still sorts after the rows
+    before them, and new or moved rows get positions in the gaps, so a row
+    inserted into a large table does not renumber everything after it.
+    """
+    count = len(keys)
+    positions: List[Optional[float]] = [None] * count
+    last = float('-inf')
+    for index, key in enumerate(keys):
+        old = old_rows.get(key)
+        if old is not None and old[0] > last:
+            positions[index] = last = old[0]
+
+    index = 0
+    while index < count:
+        if positions[index] is not None:
+            index += 1
+            continue
+        end = index
+        while end < count and positions[end] is None:
+            end += 1
+        low = positions[index - 1] if index else None
+        high = positions[end] if end < count else None
+        gap = end - index
+        if low is None and high is None:
+            fill = [float(n) for n in range(gap)]
+        elif high is None:
+            fill = [low + 1 + n for n in range(gap)]
+        elif low is None:
+            fill = [high - gap + n for n in range(gap)]
+        else:
+            step = (high - low) / (gap + 1)
+            fill = [low + step * (n + 1) for n in range(gap)]
+        positions[index:end] = fill
+        index = end
+
+    # Repeated inserts at one spot eventually run out of float precision
+    if any(a >= b for a, b in zip(positions, positions[1:])):
+        return [float(n) for n in range(count)]
+    return positions
+
+
+def _table_rows(data: Dict[str, Any], old_tables: Dict[str, Dict[Row, Row]]) -> Dict[str, Dict[Row, Row]]:
+    """Split encoded assessment data into {table: {key: values}}"""
+    tables = {table: {} for table in _TABLES}
+
+    tables['project_info'] = {
+        (name,): (json.dumps(value),) for name, value in data.get('project_info', {}).items()
+    }
+    tables['texts'] = {("risk_reduction_text",): (data.get('risk_reduction_text', ""),)}
+
+    for user_position, user in enumerate(data.get('users', [])):
+        tables['users'][(user_position,)] = (user['name'],)
+        for task_position, task in enumerate(user.get('tasks', [])):
+            tables['tasks'][(user_position, task_position)] = (task['name'],)
+            for position, description in enumerate(task.get('hazards', [])):
+                tables['hazards'][(user_position, task_position, position)] = (description,)
+
+    keys, values = [], []
+    occurrences = Counter()
+    for row in data['risk_rows']['rows']:
+        (user, task, category, hazard, cause, initial_severity, initial_probability, initial_risk,
+         measures, residual_severity, residual_probability, residual_risk) = row
+        identity = (user, task, hazard, cause)
+        keys.append(identity + (occurrences[identity],))
+        occurrences[identity] += 1
+        values.append((
+            category, initial_severity, initial_probability, initial_risk, measures,
+            residual_severity, residual_probability, residual_risk
+        ))
+    positions = _assign_positions(keys, old_tables.get('risk_rows', {}))
+    tables['risk_rows'] = {
+        key: (position,) + row_values for key, position, row_values in zip(keys, positions, values)
+    }
+
+    for table in ('control_systems', 'alternative_methods'):
+        tables[table] = {(position,): tuple(row) for position, row in enumerate(data[table]['rows'])}
+    return tables
+
+
+class AssessmentStore:
+    """An open .rdb file"""
+
+    def __init__(self, file_path: str, read_only: bool = False):
+        """Open or create the store at file_path.
+
+        A read-only store never writes to the file: no schema is created and
+        no pragmas are changed, so opening a file that is not a store (or
+        one from a newer version) raises ValueError and leaves it untouched.
+        Unless another connection has a write-ahead log open, the file is
+        also read as immutable, so SQLite does not create -wal and -shm files
+        next to it.
+        """
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._written: Optional[Dict[str, Dict[Row, Row]]] = None
+        if read_only:
+            uri = f"file:{pathname2url(os.path.abspath(file_path))}?mode=ro"
+            if not os.path.exists(file_path + "-wal"):
+                uri += "&immutable=1"
+            self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            try:
+                self._check_version(read_only=True)
+            except (sqlite3.Error, ValueError):
+                self._connection.close()
+                raise
+            return
+        self._connection = sqlite3.connect(file_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS meta (name PRIMARY KEY, value)")
+            for table in _TABLES:
+                self._connection.execute(_create_statement(table))
+            for statement in _INDEXES:
+                self._connection.execute(statement)
+            self._check_version()
+
+    def _check_version(self, read_only: bool = False):
+        try:
+            row = self._connection.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        except sqlite3.DatabaseError as e:
+            if not read_only:
+                raise
+            raise ValueError(f"{self.file_path} is not an assessment store") from e
+        if row is None and read_only:
+            raise ValueError(f"{self.file_path} is not an assessment store")
+        if row is None:
+            self._connection.executemany(
+                "INSERT INTO meta (name, value) VALUES (?, ?)",
+                [("format", FORMAT_NAME), ("version", STORE_VERSION)]
+            )
+        elif row[0] > STORE_VERSION:
+            raise ValueError(f"Assessment store version {row[0]} is newer than this program supports")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Reading
+
+    def _read_tables(self) -> Dict[str, Dict[Row, Row]]:
+        tables = {}
+        for table, (keys, values) in _TABLES.items():
+            count = len(keys)
+            cursor = self._connection.execute(
+                f"SELECT {', '.join(keys + values)} FROM {table} ORDER BY {', '.join(keys)}"
+            )
+            tables[table] = {row[:count]: row[count:] for row in cursor}
+        return tables
+
+    def load_data(self) -> Dict[str, Any]:
+        """The stored assessment as encoded data (see assessment_io)"""
+        with self._lock:
+            tables = self._read_tables()
+            self._written = tables
+
+        project_info = {name: json.loads(value) for (name,), (value,) in tables['project_info'].items()}
+        texts = {name: value for (name,), (value,) in tables['texts'].items()}
+
+        users = [{'name': name, 'tasks': []} for (_position,), (name,) in tables['users'].items()]
+        for (user_position, _position), (name,) in tables['tasks'].items():
+            users[user_position]['tasks'].append({'name': name, 'hazards': []})
+        for (user_position, task_position, _position), (description,) in tables['hazards'].items():
+            users[user_position]['tasks'][task_position]['hazards'].append(description)
+
+        risk_rows = sorted(
+            (values[0], [user, task, values[1], hazard, cause, *values[2:]])
+            for (user, task, hazard, cause, _occurrence), values in tables['risk_rows'].items()
+        )
+        return {
+            'format': FORMAT_NAME,
+            'version': STORE_VERSION,
+            'project_info': project_info,
+            'users': users,
+            'risk_rows': {'fields': RISK_ROW_FIELDS, 'rows': [row for _position, row in risk_rows]},
+            'control_systems': {
+                'fields': CONTROL_SYSTEM_FIELDS, 'rows': [list(row) for row in tables['control_systems'].values()]
+            },
+            'alternative_methods': {
+                'fields': ALTERNATIVE_METHOD_FIELDS,
+                'rows': [list(row) for row in tables['alternative_methods'].values()]
+            },
+            'risk_reduction_text': texts.get("risk_reduction_text", "")
+        }
+
+    def load(self) -> Assessment:
+        return decode_assessment(self.load_data())
+
+    # Writing
+
+    def save_data(self, data: Dict[str, Any]) -> int:
+        """Write encoded assessment data, touching only rows that changed.
+
+        Returns the number of rows upserted or deleted.
+        """
+        data = unpack_strings(data)
+        with self._lock:
+            written = self._written if self._written is not None else self._read_tables()
+            tables = _table_rows(data, written)
+            changes = 0
+            with self._connection:
+                for table, rows in tables.items():
+                    old_rows = written.get(table, {})
+                    upserts = [key + values for key, values in rows.items() if old_rows.get(key) != values]
+                    deletes = [key for key in old_rows if key not in rows]
+                    if upserts:
+                        self._connection.executemany(_upsert_statement(table), upserts)
+                    if deletes:
+                        self._connection.executemany(_delete_statement(table), deletes)
+                    changes += len(upserts) + len(deletes)
+            self._written = tables
+        return changes
+
+    # Queries
+
+    def find_risk_rows(self, residual_risk: Optional[str] = None, initial_risk: Optional[str] = None,
+                       category: Optional[str] = None) -> List[RiskRow]:
+        """Risk rows matching every given filter, in table order"""
+        conditions, parameters = [], []
+        if residual_risk is not None:
+            conditions.append("residual_risk = ?")
+            parameters.append(risk_level_code(residual_risk))
+        if initial_risk is not None:
+            conditions.append("initial_risk = ?")
+            parameters.append(risk_level_code(initial_risk))
+        if category is not None:
+            conditions.append("category = ?")
+            parameters.append(category)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {_RISK_SELECT} FROM risk_rows{where} ORDER BY position", parameters
+            ).fetchall()
+        return decode_risk_rows(rows)
+
+    def risk_level_counts(self, residual: bool = True) -> Dict[str, int]:
+        """How many risk rows sit at each residual (or initial) risk level"""
+        column = "residual_risk" if residual else "initial_risk"
+        with self._lock:
+            counts = dict(self._connection.execute(
+                f"SELECT {column}, COUNT(*) FROM risk_rows GROUP BY {column}"
+            ).fetchall())
+        return {level: counts.get(code, 0) for code, level in enumerate(RISK_LEVELS)}
+
+
+def is_store_path(file_path: str) -> bool:
+    return file_path.lower().endswith(STORE_EXTENSION)
+
+
+def iter_matching_rows(file_paths, **filters) -> Iterator[Tuple[str, RiskRow]]:
+    """Yield (file_path, row) for risk rows matching filters across several stores"""
+    for file_path in file_paths:
+        with AssessmentStore(file_path, read_only=True) as store:
+            for row in store.find_risk_rows(**filters):
+                yield file_path, row
@@ -0,0 +1,194 @@
+"""
+Append-only autosave journal.
+
+While a window is open every edit is appended to a journal file as one JSON
+line, so the cost of autosaving an edit is proportional to the edit, not to
+the project. The first line of a journal is a "base" record holding a full
+snapshot of the assessment (in the assessment_io file format) and the path
+of the file it belongs to. Compaction starts the journal again from a fresh
+base, which the window does whenever it saves the main file.
+
+Writing happens on a background thread. After a crash the journal is left
+behind in AUTOSAVE_DIR, and replaying its records on top of the base brings
+the assessment back to the last edit that reached the disk. A journal's name
+holds the id of the process writing it, so the journals of other windows
+that are still running are not mistaken for crashed ones.
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+AUTOSAVE_DIR = os.path.join(os.path.expanduser("~"), ".risk_assessment", "autosave")
+JOURNAL_SUFFIX = ".journal"
+
+_BASE = "base"
+_APPEND = "append"
+_STOP = "stop"
+
+
+class Journal:
+    """The journal for one open window"""
+
+    def __init__(self, directory: str = AUTOSAVE_DIR):
+        os.makedirs(directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{id(self):x}{JOURNAL_SUFFIX}"
+        self.path = os.path.join(directory, name)
+        self.edits_since_base = 0
+        self.error: Optional[OSError] = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="autosave-journal", daemon=True)
+        self._thread.start()
+
+    def restart(self, file_path: Optional[str], data: Dict[str, Any]):
+        """Replace the journal with a new base snapshot and no edits"""
+        self.edits_since_base = 0
+        self._queue.put((_BASE, {
+            'op': 'base',
+            'file': file_path,
+            'saved_date': datetime.now().isoformat(),
+            'data': data
+        }))
+
+    def append(self, record: Dict[str, Any]):
+        """Queue one edit record; it must be JSON serializable as-is"""
+        self.edits_since_base += 1
+        self._queue.put((_APPEND, record))
+
+    def close(self, discard: bool = False):
+        """Write out queued records and stop; discard also deletes the file"""
+        self._queue.put((_STOP, None))
+        self._thread.join()
+        if discard:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _run(self):
+        f = None
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                for kind, record in batch:
+                    if kind == _STOP:
+                        return
+                    try:
+                        if kind == _BASE:
+                            if f is not None:
+                                f.close()
+                            f = self._write_base(record)
+                        elif f is not None:
+                            f.write(json.dumps(record) + "\n")
+                    except OSError as e:
+                        # Keep going; the next base may well succeed (e.g. disk space freed)
+                        self.error = e
+                if f is not None:
+                    try:
+                        f.flush()
+                        os.fsync(f.fileno())
+                    except OSError as e:
+                        self.error = e
+        finally:
+            if f is not None:
+                f.close()
+
+    def _write_base(self, record):
+        # The old journal stays in place until the new base is safely on disk
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        return open(self.path, 'a')
+
+
+def read_journal(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Return (base record, edit records) from a journal.
+
+    A line cut short by a crash ends the journal rather than failing it.
+    """
+    records = []
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+    if not records or records[0].get('op') != 'base':
+        raise ValueError(f"{path} is not an autosave journal")
+    return records[0], records[1:]
+
+
+def journal_pid(path: str) -> Optional[int]:
+    """The id of the process that wrote a journal, from its name"""
+    parts = os.path.basename(path).split("-")
+    try:
+        return int(parts[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def process_running(pid: int) -> bool:
+    """Whether a process with this id exists"""
+    if sys.platform == "win32":
+        # os.kill would terminate the process on Windows
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return kernel32.GetLastError() == 5  # ERROR_ACCESS_DENIED: it exists
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # someone else's process
+    return True
+
+
+def find_journals(directory: str = AUTOSAVE_DIR) -> List[str]:
+    """Journals left behind by windows that did not close normally, newest first.
+
+    Journals of processes that are still running, this one included, belong
+    to open windows and are left out.
+    """
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    paths = []
+    for name in names:
+        if not name.endswith(JOURNAL_SUFFIX):
+            continue
+        pid = journal_pid(name)
+        if pid is not None and process_running(pid):
+            continue
+        paths.append(os.path.join(directory, name))
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+def describe_journal(path: str) -> str:
+    """One line for the recovery list: which file and when it was last written"""
+    with open(path, 'r') as f:
+        base = json.loads(f.readline())
+    modified = datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y-%m-%d %H:%M')
+    name = base.get('data', {}).get('project_info', {}).get('name') or "Untitled"
+    return f"{name} ({base.get('file') or 'never saved'}) - last edit {modified}"
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark for assessment file formats
+Compares file size and save/load time of the indent=2 JSON format against
+compact, gzip and zstd compressed files for generated assessments
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from assessment_io import encode_assessment, load_assessment, write_json_atomic, zstandard
+from hazard_catalog import HAZARD_CATALOG, categorize_hazard
+from risk_assessment import (
+    Assessment, Hazard, Project, RiskRow, Task, User, PROBABILITY_LEVELS, SEVERITY_LEVELS, join_hazard_text
+)
+
+FORMATS = [
+    ("JSON (indent=2)", ".json"),
+    ("gzip", ".json.gz"),
+    ("zstd", ".rjz"),
+]
+
+def make_assessment(rows, seed=1):
+    """Build an assessment with `rows` risk rows drawn from the hazard catalog"""
+    rng = random.Random(seed)
+    hazards = [hazard for category in HAZARD_CATALOG.categories for hazard in HAZARD_CATALOG.hazards_for(category)]
+    project = Project(name="Benchmark", description="Generated assessment")
+    risk_rows = []
+    tasks_per_user = 25
+    users = max(1, rows // (tasks_per_user * 10))
+    for u in range(users):
+        user = User(name=f"Operator {u + 1}")
+        for t in range(tasks_per_user):
+            user.add_task(Task(name=f"Task {t + 1}"))
+        project.add_user(user)
+    for i in range(rows):
+        user = project.users[i % users]
+        task = user.tasks[(i // users) % tasks_per_user]
+        name, cause = rng.choice(hazards)
+        task.add_hazard(Hazard(description=join_hazard_text(name, cause)))
+        risk_rows.append(RiskRow(
+            user.name, task.name, categorize_hazard(name, cause), name, cause,
+            rng.choice(SEVERITY_LEVELS), rng.choice(PROBABILITY_LEVELS),
+            rng.choice(["", "Fixed guarding", "Interlocked door", "Training and PPE"]),
+            rng.choice(SEVERITY_LEVELS), rng.choice(PROBABILITY_LEVELS)
+        ))
+    return Assessment(project_info={'name': project.name}, project=project, risk_rows=risk_rows)
+
+def best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000],
+                        help="risk row counts to test (default: 1000 10000 50000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the best is shown")
+    args = parser.parse_args()
+
+    if zstandard is None:
+        print("zstandard is not installed; .rjz files fall back to gzip\n")
+
+    directory = tempfile.mkdtemp(prefix="assessment-benchmark-")
+    try:
+        print(f"{'Rows':>7}  {'Format':<16} {'Size':>10} {'Ratio':>6} {'Save':>8} {'Load':>8}")
+        for rows in args.rows:
+            assessment = make_assessment(rows)
+            baseline = None
+            for label, extension in FORMATS:
+                file_path = os.path.join(directory, f"bench{extension}")
+                # Saving includes the snapshot, as the GUI does before each save
+                save = best_time(lambda: write_json_atomic(file_path, encode_assessment(assessment)), args.repeat)
+                load = best_time(lambda: load_assessment(file_path), args.repeat)
+                size = os.path.getsize(file_path)
+                baseline = baseline or size
+                print(f"{rows:>7}  {label:<16} {size / 1024:>8.0f}KB {size / baseline:>6.2f} "
+                      f"{save * 1000:>6.0f}ms {load * 1000:>6.0f}ms")
+            print()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark for PDF report rendering
+Times report_engine.write_report for generated assessments of increasing
+size, with one control system and one alternative method row per risk row
+as the auto-populate actions create them, and the same report written again
+through the layout cache after one risk row was edited
+"""
+
+import argparse
+import dataclasses
+import io
+import sys
+
+from benchmark_formats import best_time, make_assessment
+from report_engine import LayoutCache, write_report
+from risk_assessment import AlternativeMethodRow, ControlSystemRow
+
+def make_report_assessment(rows, seed=1):
+    assessment = make_assessment(rows, seed)
+    for risk_row in assessment.risk_rows:
+        hazard = " - ".join(risk_row.key)
+        assessment.control_systems.append(ControlSystemRow(
+            safety_function=f"Control for {risk_row.hazard}", hazard=hazard,
+            initial_risk=risk_row.initial_risk, final_risk=risk_row.residual_risk
+        ))
+        assessment.alternative_methods.append(AlternativeMethodRow(
+            task=risk_row.task, hazard=hazard,
+            justification=f"LOTO not feasible for {risk_row.task} due to {risk_row.hazard}."
+        ))
+    return assessment
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[500, 1000, 2000, 5000],
+                        help="risk row counts to test (default: 500 1000 2000 5000)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per measurement; the best is shown")
+    args = parser.parse_args()
+
+    print(f"{'Rows':>7} {'Render':>9} {'Per row':>9} {'Size':>10} {'Edited':>9}")
+    for rows in args.rows:
+        assessment = make_report_assessment(rows)
+        output = io.BytesIO()
+
+        def render(cache=None):
+            output.seek(0)
+            output.truncate()
+            write_report(assessment, output, date="01/01/2026", cache=cache)
+
+        seconds = best_time(render, args.repeat)
+        size = len(output.getvalue())
+
+        cache = LayoutCache()
+        render(cache)
+        row = assessment.risk_rows[rows // 2]
+        assessment.risk_rows[rows // 2] = dataclasses.replace(row, measures=row.measures + " (reviewed)")
+        edited = best_time(lambda: render(cache), 1)
+        print(f"{rows:>7} {seconds:>8.2f}s {seconds / rows * 1000:>7.2f}ms {size / 1024:>8.0f}KB {edited:>8.2f}s")
+
+if __name__ == "__main__":
+    sys.exit(main())
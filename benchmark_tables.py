@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark for bulk table updates
+Times refreshing the risk table and auto-populating the control system and
+alternative method tables without and with the bulk paths: bulk_update for
+the risk table, CellComboBox for the combo cells of the other two.
+Run with QT_QPA_PLATFORM=offscreen on a machine without a display.
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+
+from PyQt5.QtCore import QEvent, Qt
+from PyQt5.QtWidgets import QApplication, QComboBox
+
+import gui
+from gui import CellComboBox
+from benchmark_formats import make_assessment
+from risk_models import bulk_update
+from theme import apply_theme
+
+OPERATIONS = [
+    ("Refresh risk table", "refresh_risk_table"),
+    ("Auto-populate control systems", "auto_populate_control_systems"),
+    ("Auto-populate alternative methods", "auto_populate_alternative_methods"),
+]
+
+def null_update(view):
+    return contextlib.nullcontext(view)
+
+def use_bulk_paths(enabled):
+    gui.bulk_update = bulk_update if enabled else null_update
+    gui.CellComboBox = CellComboBox if enabled else QComboBox
+
+def time_operations(app, rows):
+    """Seconds taken by each operation on a window holding `rows` risk rows"""
+    window = gui.MainWindow()
+    window.show()
+    try:
+        assessment = make_assessment(rows)
+        assessment.project_info = {}
+        window.apply_assessment(assessment)
+        app.processEvents()
+        times = []
+        window.risk_model.set_rows([])  # so the refresh rebuilds every row from the tree
+        app.processEvents()
+        for _label, method in OPERATIONS:
+            start = time.perf_counter()
+            getattr(window, method)()
+            app.processEvents()  # include the repaint and header layout that follow
+            times.append(time.perf_counter() - start)
+        return times
+    finally:
+        window.journal.close(discard=True)
+        window.journal = None
+        window.setAttribute(Qt.WA_DeleteOnClose)
+        window.close()
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 10000],
+                        help="risk row counts to test (default: 1000 5000 10000)")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    apply_theme(app)
+    print(f"{'Rows':>7}  {'Operation':<34} {'Without':>9} {'With':>9} {'Speedup':>8}")
+    for rows in args.rows:
+        use_bulk_paths(False)
+        without = time_operations(app, rows)
+        use_bulk_paths(True)
+        with_bulk = time_operations(app, rows)
+        for (label, _method), before, after in zip(OPERATIONS, without, with_bulk):
+            print(f"{rows:>7}  {label:<34} {before:>8.2f}s {after:>8.2f}s {before / after:>7.1f}x")
+        print()
+
+if __name__ == "__main__":
+    sys.exit(main())
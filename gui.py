@@ -1,11 +1,39 @@
 import sys
-import json
 import os
+import time
+import threading
+import multiprocessing
 from datetime import datetime
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QLabel, QWizard, QWizardPage, QLineEdit, QTextEdit, QFormLayout, QPushButton, QDialog, QTreeWidget, QTreeWidgetItem, QHBoxLayout, QTableWidget, QTableWidgetItem, QComboBox, QHeaderView, QInputDialog, QMessageBox, QFileDialog, QDialogButtonBox, QListWidget, QListWidgetItem, QCheckBox
+    QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QLabel, QWizard, QWizardPage, QLineEdit, QTextEdit, QFormLayout, QPushButton, QDialog, QTreeWidget, QTreeWidgetItem, QHBoxLayout, QTableWidget, QTableWidgetItem, QComboBox, QHeaderView, QInputDialog, QMessageBox, QFileDialog, QDialogButtonBox, QListWidget, QListWidgetItem, QTableView, QTreeView, QAbstractItemView, QProgressBar, QListView
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QEvent, QTimer, QThread, QModelIndex, pyqtSignal
+
+from dataclasses import astuple
+from risk_assessment import (
+    Project, User, Task, Hazard, RiskRow, Assessment, ControlSystemRow, AlternativeMethodRow, SEVERITY_LEVELS, PROBABILITY_LEVELS,
+    CONTROL_CATEGORIES, CONTROL_TYPES, ASSESSMENT_COMPLETE_OPTIONS, matrix_risk_level, split_hazard_text
+)
+from assessment_io import write_json_atomic, encode_assessment, decode_assessment, stream_assessment
+from assessment_store import AssessmentStore, is_store_path
+from autosave import Journal, read_journal, find_journals, describe_journal
+from library_index import LibraryIndex, last_library_folder, remember_library_folder
+from theme import apply_theme
+from hazard_catalog import HAZARD_CATALOG, ALL_CATEGORIES, categorize_hazard
+from risk_models import (
+    RISK_ROW_FIELDS, RiskTableModel, HazardTreeModel, HazardListModel, HazardSelectionModel, ComboBoxDelegate, TREE_COL_HAZARD, COL_INITIAL_SEVERITY, COL_INITIAL_PROBABILITY, COL_MEASURES,
+    COL_RESIDUAL_SEVERITY, COL_RESIDUAL_PROBABILITY, bulk_update
+)
+
+ASSESSMENT_FILE_FILTER = "JSON Files (*.json);;Compressed JSON (*.json.gz *.rjz);;Risk Database (*.rdb);;All Files (*)"
+AUTOSAVE_INTERVAL_MS = 5 * 60 * 1000
+LOAD_SLICE_SECONDS = 0.03  # longest the GUI thread spends on a loading chunk before repainting
+# Combo box columns of the control system and alternative method tables
+HAZARD_COMBO_COLUMN = 1
+HAZARD_COMBO_MIN_CHARS = 30
+CONTROL_TYPE_COLUMN = 6
+CONTROL_COMBO_CHOICES = {4: CONTROL_CATEGORIES, 5: CONTROL_CATEGORIES, CONTROL_TYPE_COLUMN: CONTROL_TYPES}
+ALTERNATIVE_METHOD_COMBO_CHOICES = {2: ASSESSMENT_COMPLETE_OPTIONS}
 
 class StartupDialog(QDialog):
     def __init__(self):
@@ -14,26 +42,37 @@ class StartupDialog(QDialog):
         self.setModal(True)
         self.setMinimumSize(800, 600)
         self.resize(1000, 700)
+        self.setObjectName("startupDialog")
         
         layout = QVBoxLayout()
         
         # Title
         title = QLabel("Welcome to Risk Assessment Tool")
-        title.setStyleSheet("font-size: 32px; font-weight: bold; margin: 40px; color: #333;")
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
         
         # Buttons
         new_btn = QPushButton("Create New Assessment")
-        new_btn.setStyleSheet("font-size: 24px; padding: 20px; margin: 20px; background-color: #4CAF50; color: white; border: none; border-radius: 10px;")
+        new_btn.setObjectName("newButton")
         new_btn.clicked.connect(self.create_new)
         
         load_btn = QPushButton("Load Existing Assessment")
-        load_btn.setStyleSheet("font-size: 24px; padding: 20px; margin: 20px; background-color: #2196F3; color: white; border: none; border-radius: 10px;")
+        load_btn.setObjectName("loadButton")
         load_btn.clicked.connect(self.load_existing)
         
+        library_btn = QPushButton("Browse Assessment Library")
+        library_btn.setObjectName("libraryButton")
+        library_btn.clicked.connect(self.browse_library)
+        
         layout.addWidget(new_btn)
         layout.addWidget(load_btn)
+        layout.addWidget(library_btn)
+        
+        if find_journals():
+            recover_btn = QPushButton("Recover Unsaved Work")
+            recover_btn.setObjectName("recoverButton")
+            recover_btn.clicked.connect(self.recover)
+            layout.addWidget(recover_btn)
         
         self.setLayout(layout)
         
@@ -46,6 +85,14 @@ class StartupDialog(QDialog):
     def load_existing(self):
         self.choice = "load"
         self.accept()
+    
+    def recover(self):
+        self.choice = "recover"
+        self.accept()
+    
+    def browse_library(self):
+        self.choice = "library"
+        self.accept()
 
 class ProjectSetupWizard(QWizard):
     def __init__(self):
@@ -81,11 +128,278 @@ class ProjectSetupWizard(QWizard):
         page.setLayout(layout)
         return page
 
+class SaveWorker(QThread):
+    """Serializes an assessment snapshot and writes it to disk off the GUI thread"""
+    saved = pyqtSignal(str)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, file_path, data, write, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.data = data
+        self.write = write
+        self.error = None  # set when the write failed, for callers that wait() instead of using signals
+
+    def run(self):
+        try:
+            self.write(self.file_path, self.data)
+        except Exception as e:
+            self.error = str(e)
+            self.failed.emit(self.file_path, self.error)
+        else:
+            self.saved.emit(self.file_path)
+
+class LibraryScanWorker(QThread):
+    """Re-reads changed library files (in a process pool) off the GUI thread.
+
+    The thread saves the index when it is done. cancel() returns at once: the
+    thread drops the files not started yet, waits for the ones being read,
+    saves what it has and ends on its own.
+    """
+    entry_ready = pyqtSignal(object)
+    # Cancelled workers still winding down, kept alive until their thread ends
+    finishing = set()
+
+    def __init__(self, index, paths, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.paths = paths
+        self.cancelled = threading.Event()
+
+    def run(self):
+        updates = self.index.update(self.paths, cancel=self.cancelled)
+        try:
+            for entry in updates:
+                if self.cancelled.is_set():
+                    break
+                self.entry_ready.emit(entry)
+        finally:
+            updates.close()
+            try:
+                self.index.save()
+            except OSError:
+                pass  # the library still works, it is just re-read next time
+
+    def cancel(self):
+        """Stop without waiting; the worker outlives its dialog until the thread ends"""
+        self.entry_ready.disconnect()
+        self.finished.disconnect()
+        self.setParent(None)
+        LibraryScanWorker.finishing.add(self)
+        self.finished.connect(self.forget)
+        self.cancelled.set()
+        if self.isFinished():  # finished before it was connected
+            self.forget()
+
+    def forget(self):
+        self.wait()  # finished has been emitted; the thread is only returning
+        LibraryScanWorker.finishing.discard(self)
+
+    @classmethod
+    def wait_for_cancelled(cls):
+        """Let cancelled scans finish saving; call before the application exits"""
+        for worker in list(cls.finishing):
+            worker.wait()
+
+class LibraryDialog(QDialog):
+    """Lists the assessments in a folder from the library index.
+
+    Cached summaries show up straight away; files changed since the last
+    visit are re-read in the background and their rows filled in as they
+    arrive.
+    """
+    COLUMNS = ["Project", "Company", "Machine ID", "File", "Modified", "Hazards", "High", "Medium", "Low"]
+
+    def __init__(self, folder=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Assessment Library")
+        self.setMinimumSize(1200, 700)
+        self.setObjectName("libraryDialog")
+        self.selected_path = None
+        self.index = None
+        self.worker = None
+        self.path_items = {}  # file path -> the row's first item
+        
+        layout = QVBoxLayout()
+        
+        folder_layout = QHBoxLayout()
+        self.folder_label = QLabel()
+        self.folder_label.setObjectName("libraryFolder")
+        choose_btn = QPushButton("Choose Folder...")
+        choose_btn.clicked.connect(self.choose_folder)
+        folder_layout.addWidget(self.folder_label, 1)
+        folder_layout.addWidget(choose_btn)
+        layout.addLayout(folder_layout)
+        
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter by project, company, machine or file name")
+        self.filter_edit.textChanged.connect(self.apply_filter)
+        layout.addWidget(self.filter_edit)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().hide()
+        self.table.doubleClicked.connect(self.open_selected)
+        layout.addWidget(self.table)
+        
+        status_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        self.status_label.setObjectName("libraryStatus")
+        self.scan_progress = QProgressBar()
+        self.scan_progress.setMaximumWidth(300)
+        self.scan_progress.hide()
+        status_layout.addWidget(self.status_label, 1)
+        status_layout.addWidget(self.scan_progress)
+        layout.addLayout(status_layout)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.Open | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.open_selected)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        
+        self.setLayout(layout)
+        self.open_folder(folder or last_library_folder() or os.getcwd())
+    
+    def choose_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Choose Library Folder", self.index.folder if self.index else "")
+        if folder:
+            self.open_folder(folder)
+    
+    def open_folder(self, folder):
+        self.stop_scan()
+        remember_library_folder(folder)
+        self.index = LibraryIndex(folder)
+        changed = self.index.scan()
+        self.folder_label.setText(self.index.folder)
+        
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+        self.path_items = {}
+        for entry in self.index.entries.values():
+            self.show_entry(entry)
+        self.table.setSortingEnabled(True)
+        self.apply_filter()
+        
+        if changed:
+            self.status_label.setText(f"Reading {len(changed)} new or changed files...")
+            self.scan_progress.setRange(0, len(changed))
+            self.scan_progress.setValue(0)
+            self.scan_progress.show()
+            self.worker = LibraryScanWorker(self.index, changed, self)
+            self.worker.entry_ready.connect(self.on_entry_ready)
+            self.worker.finished.connect(self.on_scan_finished)
+            self.worker.start()
+        else:
+            self.show_count()
+    
+    def show_entry(self, entry):
+        """Add or update the row for an entry; sorting must be off"""
+        info = entry.project_info
+        if entry.error:
+            texts = [f"Unreadable: {entry.error}", "", ""]
+        else:
+            texts = [info.get('name', ''), info.get('company', ''), info.get('machine_id', '')]
+        texts += [os.path.relpath(entry.path, self.index.folder), datetime.fromtimestamp(entry.mtime).strftime('%Y-%m-%d %H:%M')]
+        numbers = [entry.hazards] + [entry.residual_risk.get(level, 0) for level in ("High", "Medium", "Low")]
+        
+        first = self.path_items.get(entry.path)
+        if first is None:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            for col in range(len(self.COLUMNS)):
+                self.table.setItem(row, col, QTableWidgetItem())
+            first = self.table.item(row, 0)
+            first.setData(Qt.UserRole, entry.path)
+            self.path_items[entry.path] = first
+        row = first.row()
+        for col, text in enumerate(texts):
+            self.table.item(row, col).setText(text)
+        for col, number in enumerate(numbers, len(texts)):
+            self.table.item(row, col).setData(Qt.DisplayRole, number)
+        first.setToolTip(entry.error or entry.path)
+    
+    def on_entry_ready(self, entry):
+        self.table.setSortingEnabled(False)
+        self.show_entry(entry)
+        self.table.setSortingEnabled(True)
+        self.filter_row(self.path_items[entry.path].row())
+        self.scan_progress.setValue(self.scan_progress.value() + 1)
+    
+    def on_scan_finished(self):
+        self.worker = None
+        self.scan_progress.hide()
+        self.show_count()
+    
+    def stop_scan(self):
+        if self.worker is None:
+            return
+        self.worker.cancel()
+        self.worker = None
+    
+    def show_count(self):
+        self.status_label.setText(f"{len(self.index.entries)} assessments")
+    
+    def apply_filter(self):
+        for row in range(self.table.rowCount()):
+            self.filter_row(row)
+    
+    def filter_row(self, row):
+        text = self.filter_edit.text().strip().lower()
+        hidden = bool(text) and not any(text in self.table.item(row, col).text().lower() for col in range(4))
+        self.table.setRowHidden(row, hidden)
+    
+    def open_selected(self):
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return
+        self.selected_path = self.table.item(rows[0].row(), 0).data(Qt.UserRole)
+        self.accept()
+    
+    def done(self, result):
+        self.stop_scan()
+        super().done(result)
+
+class CellComboBox(QComboBox):
+    """A combo box for a table cell that is cheap to create in bulk.
+
+    QComboBox answers a font change by building its popup list, and the
+    style sheet gives every new cell combo its font. Until the popup is
+    first opened only the widget itself is updated; the popup picks up the
+    font then. This takes a loaded row of combos from milliseconds to a
+    fraction of one.
+    """
+
+    popup_shown = False
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.FontChange and not self.popup_shown:
+            QWidget.changeEvent(self, event)
+            return
+        super().changeEvent(event)
+
+    def showPopup(self):
+        if not self.popup_shown:
+            self.popup_shown = True
+            super().changeEvent(QEvent(QEvent.FontChange))
+        super().showPopup()
+
 class MainWindow(QMainWindow):
     def __init__(self, project_info=None):
         super().__init__()
         self.project_info = project_info or {}
+        self.project = Project(name=self.project_info.get('name', ''), description=self.project_info.get('description', ''))
         self.current_file = None
+        self.save_worker = None
+        self.save_journal_mark = None  # journal_mark() when the running save's snapshot was taken
+        self.pending_saves = {}  # file_path -> (latest data, journal mark) requested while a save was running
+        self.save_failed = False  # the last save did not reach the disk, so the journal holds the only copy
+        self.stores = {}  # file_path -> open AssessmentStore for .rdb files
+        self.report_cache = None  # report_engine.LayoutCache holding the rows of the last PDF report
         self.setWindowTitle("Risk Assessment Tool")
         
         # Make window much larger
@@ -94,6 +408,7 @@ class MainWindow(QMainWindow):
         
         # Create central widget and layout
         central_widget = QWidget()
+        central_widget.setObjectName("centralWidget")  # the theme styles everything inside it
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout(central_widget)
         
@@ -102,32 +417,55 @@ class MainWindow(QMainWindow):
         save_btn = QPushButton("Save Assessment")
         save_as_btn = QPushButton("Save As...")
         load_btn = QPushButton("Load Assessment")
-        
-        # Style the buttons with larger text
-        button_style = "font-size: 24px; padding: 20px; margin: 10px; background-color: #f0f0f0; border: 2px solid #ccc; border-radius: 10px;"
-        save_btn.setStyleSheet(button_style)
-        save_as_btn.setStyleSheet(button_style)
-        load_btn.setStyleSheet(button_style)
+        library_btn = QPushButton("Library...")
         
         save_btn.clicked.connect(self.save_assessment)
         save_as_btn.clicked.connect(self.save_assessment_as)
         load_btn.clicked.connect(self.load_assessment)
+        library_btn.clicked.connect(self.open_from_library)
         
         file_layout.addWidget(save_btn)
         file_layout.addWidget(save_as_btn)
         file_layout.addWidget(load_btn)
+        file_layout.addWidget(library_btn)
         file_layout.addStretch()
         layout.addLayout(file_layout)
         
         # Create tab widget
         self.tab_widget = QTabWidget()
-        self.tab_widget.setStyleSheet("font-size: 24px; QTabBar::tab { font-size: 24px; padding: 20px; margin: 8px; }")
         self.tab_widget.addTab(self.create_identify_hazards_tab(), "Identify Hazards")
         self.tab_widget.addTab(self.create_assess_risk_tab(), "Assess and Reduce Risk")
         self.tab_widget.addTab(self.create_control_system_tab(), "Control System Assessment")
         self.tab_widget.addTab(self.create_alternative_method_tab(), "Alternative Method")
         
         layout.addWidget(self.tab_widget)
+        
+        # Loading large files happens a chunk at a time (see start_loading)
+        self.loader = None
+        self.loading_file = None
+        self.load_timer = QTimer(self)
+        self.load_timer.timeout.connect(self.load_next_chunk)
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 100)
+        self.load_progress.setMaximumWidth(300)
+        self.load_progress.hide()
+        self.statusBar().addPermanentWidget(self.load_progress)
+        
+        # Autosave: edits go to a journal as they happen and are folded into the
+        # main file every AUTOSAVE_INTERVAL_MS
+        self.journal = None
+        self.journal_generation = 0  # counts restarts, so a journal_mark() never matches across them
+        self.journal_paused = False
+        self.journal_dirty_rows = set()  # (table name, row) waiting to be written
+        self.journal_text_dirty = False
+        self.journal_timer = QTimer(self)
+        self.journal_timer.setSingleShot(True)
+        self.journal_timer.timeout.connect(self.flush_journal)
+        self.compact_timer = QTimer(self)
+        self.compact_timer.setInterval(AUTOSAVE_INTERVAL_MS)
+        self.compact_timer.timeout.connect(self.compact_journal)
+        self.connect_journal()
+        self.start_journal()
 
     def create_identify_hazards_tab(self):
         tab = QWidget()
@@ -136,13 +474,14 @@ class MainWindow(QMainWindow):
         # Left pane: User/Task Tree
         left_pane = QVBoxLayout()
         left_label = QLabel("Users/Roles and Tasks:")
-        left_label.setStyleSheet("font-size: 24px; font-weight: bold; margin: 10px;")
         left_pane.addWidget(left_label)
         
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["User/Role", "Task", "Hazard"])
-        self.tree.setEditTriggers(QTreeWidget.DoubleClicked | QTreeWidget.SelectedClicked)
-        self.tree.setStyleSheet("font-size: 24px; QHeaderView::section { font-size: 24px; font-weight: bold; padding: 15px; }")
+        self.hazard_model = HazardTreeModel(self.project, self)
+        # One flat hazard list shared by every "Associated Hazard" combo box
+        self.hazard_list_model = HazardListModel(self.hazard_model, self)
+        self.tree = QTreeView()
+        self.tree.setModel(self.hazard_model)
+        self.tree.setEditTriggers(QTreeView.DoubleClicked | QTreeView.SelectedClicked)
         left_pane.addWidget(self.tree)
         
         # Tree buttons
@@ -151,11 +490,6 @@ class MainWindow(QMainWindow):
         self.add_task_btn = QPushButton("Add Task")
         self.delete_btn = QPushButton("Delete")
         
-        button_style = "font-size: 24px; padding: 20px; margin: 10px; background-color: #f0f0f0; border: 2px solid #ccc; border-radius: 10px;"
-        self.add_user_btn.setStyleSheet(button_style)
-        self.add_task_btn.setStyleSheet(button_style)
-        self.delete_btn.setStyleSheet(button_style)
-        
         tree_btn_layout.addWidget(self.add_user_btn)
         tree_btn_layout.addWidget(self.add_task_btn)
         tree_btn_layout.addWidget(self.delete_btn)
@@ -168,11 +502,10 @@ class MainWindow(QMainWindow):
         # Middle pane: Hazard Categories
         middle_pane = QVBoxLayout()
         middle_label = QLabel("Hazard Categories:")
-        middle_label.setStyleSheet("font-size: 24px; font-weight: bold; margin: 10px;")
         middle_pane.addWidget(middle_label)
         
         self.category_list = QListWidget()
-        self.category_list.setStyleSheet("font-size: 24px; padding: 10px;")
+        self.category_list.setObjectName("categoryList")
         self.populate_hazard_categories()
         middle_pane.addWidget(self.category_list)
         
@@ -182,10 +515,6 @@ class MainWindow(QMainWindow):
         edit_cat_btn = QPushButton("Edit Category")
         delete_cat_btn = QPushButton("Delete Category")
         
-        add_cat_btn.setStyleSheet(button_style)
-        edit_cat_btn.setStyleSheet(button_style)
-        delete_cat_btn.setStyleSheet(button_style)
-        
         cat_btn_layout.addWidget(add_cat_btn)
         cat_btn_layout.addWidget(edit_cat_btn)
         cat_btn_layout.addWidget(delete_cat_btn)
@@ -194,14 +523,10 @@ class MainWindow(QMainWindow):
         # Right pane: Hazards
         right_pane = QVBoxLayout()
         right_label = QLabel("Hazards:")
-        right_label.setStyleSheet("font-size: 24px; font-weight: bold; margin: 10px;")
         right_pane.addWidget(right_label)
         
-        self.hazards_table = QTableWidget()
-        self.hazards_table.setColumnCount(3)
-        self.hazards_table.setHorizontalHeaderLabels(["Hazard", "Cause/Failure", "Selected"])
+        self.hazards_table = QTableView()
         self.hazards_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.hazards_table.setStyleSheet("font-size: 24px; QHeaderView::section { font-size: 24px; font-weight: bold; padding: 15px; }")
         right_pane.addWidget(self.hazards_table)
         
         # Hazards buttons
@@ -213,13 +538,6 @@ class MainWindow(QMainWindow):
         add_all_to_task_btn = QPushButton("Add All Selected to Task")
         clear_selections_btn = QPushButton("Clear Selections")
         
-        add_haz_btn.setStyleSheet(button_style)
-        edit_haz_btn.setStyleSheet(button_style)
-        delete_haz_btn.setStyleSheet(button_style)
-        add_to_task_btn.setStyleSheet(button_style)
-        add_all_to_task_btn.setStyleSheet(button_style)
-        clear_selections_btn.setStyleSheet(button_style)
-        
         haz_btn_layout.addWidget(add_haz_btn)
         haz_btn_layout.addWidget(edit_haz_btn)
         haz_btn_layout.addWidget(delete_haz_btn)
@@ -230,7 +548,7 @@ class MainWindow(QMainWindow):
         
         # Selection summary
         self.selection_summary = QLabel("No hazards selected")
-        self.selection_summary.setStyleSheet("font-size: 20px; font-weight: bold; color: #0066cc; margin: 10px; padding: 10px; background-color: #f0f8ff; border: 1px solid #ccc; border-radius: 5px;")
+        self.selection_summary.setObjectName("selectionSummary")
         right_pane.addWidget(self.selection_summary)
         
         # Connect signals
@@ -244,8 +562,23 @@ class MainWindow(QMainWindow):
         
         # Initialize selection memory
         self.hazard_selections = {}  # Store selections per category
+        self.selection_counts = {}  # Running count of selections per category
+        self.selection_total = 0  # Running total, excluding "All Categories"
         self.current_category = None
         
+        # Check state lives in hazard_selections; the model only reads it
+        self.hazard_table_model = HazardSelectionModel(self.hazard_selections, self)
+        self.hazard_table_model.selectionToggled.connect(
+            lambda hazard_name, selected: self.set_hazard_selected(self.current_category, hazard_name, selected))
+        self.hazard_table_model.hazardRenamed.connect(self.on_hazard_renamed)
+        self.hazards_table.setModel(self.hazard_table_model)
+        
+        # Coalesce summary label updates into one per event loop pass
+        self.summary_timer = QTimer(self)
+        self.summary_timer.setSingleShot(True)
+        self.summary_timer.setInterval(0)
+        self.summary_timer.timeout.connect(self.update_selection_summary)
+        
         # Add panes to main layout
         left_widget = QWidget()
         left_widget.setLayout(left_pane)
@@ -268,24 +601,7 @@ class MainWindow(QMainWindow):
 
     def populate_hazard_categories(self):
         """Populate the hazard categories with predefined industrial categories"""
-        categories = [
-            "All Categories",
-            "Mechanical",
-            "Electrical/Electronic", 
-            "Slips/Trips/Falls",
-            "Ergonomics/Human Factors",
-            "Fire and Explosions",
-            "Heat/Temperature",
-            "Noise/Vibration",
-            "Ingress/Egress",
-            "Material Handling",
-            "Environmental/Industrial Hygiene",
-            "Ventilation/Confined Space",
-            "Chemical",
-            "Fluid/Pressure",
-            "Wastes (Lean)",
-            "Other"
-        ]
+        categories = [ALL_CATEGORIES] + list(HAZARD_CATALOG.categories)
         
         for category in categories:
             item = QListWidgetItem(category)
@@ -293,288 +609,115 @@ class MainWindow(QMainWindow):
 
     def get_hazards_for_category(self, category):
         """Return predefined hazards for each category"""
-        hazards = {
-            "Mechanical": [
-                ("Crushing", "Moving parts, heavy equipment, presses"),
-                ("Cutting/Severing", "Sharp edges, blades, shears, saws"),
-                ("Drawing-in/Trapping/Entanglement", "Rotating parts, conveyors, gears"),
-                ("Pinch Point", "Between moving and stationary parts"),
-                ("Unexpected Start", "Equipment startup, stored energy release"),
-                ("Break Up During Operation", "Flying debris, component failure"),
-                ("Machine Instability", "Overturning, tipping, falling equipment"),
-                ("Impact", "Dropped parts, falling objects, collisions"),
-                ("Abrasion", "Grinding, sanding, surface contact"),
-                ("Puncture", "Sharp objects, pointed tools, fasteners")
-            ],
-            "Electrical/Electronic": [
-                ("Electric Shock", "Exposed wiring, faulty equipment, wet conditions"),
-                ("Arc Flash", "Electrical faults, short circuits, switching operations"),
-                ("Electromagnetic Interference", "Radio frequency, magnetic fields"),
-                ("Static Electricity", "Friction, dry conditions, synthetic materials"),
-                ("Electrical Fire", "Overheating, short circuits, overload"),
-                ("Battery Explosion", "Lithium batteries, overcharging, damage"),
-                ("Control System Failure", "Software bugs, hardware failure, power loss"),
-                ("Electrocution", "High voltage contact, ground faults"),
-                ("Electrical Burns", "Arc flash, contact burns, thermal effects")
-            ],
-            "Slips/Trips/Falls": [
-                ("Slips", "Wet floors, oil, grease, loose materials"),
-                ("Trips", "Uneven surfaces, cables, tools, debris"),
-                ("Falls from Height", "Ladders, platforms, elevated work areas"),
-                ("Falls on Same Level", "Slippery surfaces, obstacles, poor lighting"),
-                ("Falls Through Openings", "Floor openings, unguarded edges"),
-                ("Stairway Falls", "Wet steps, poor lighting, missing handrails"),
-                ("Ladder Falls", "Unstable footing, overreaching, improper use")
-            ],
-            "Ergonomics/Human Factors": [
-                ("Repetitive Motion", "Assembly work, typing, tool operation"),
-                ("Awkward Postures", "Bending, reaching, twisting, kneeling"),
-                ("Heavy Lifting", "Manual material handling, equipment moving"),
-                ("Forceful Exertions", "Pushing, pulling, gripping, pressing"),
-                ("Vibration", "Hand tools, equipment operation, vehicle operation"),
-                ("Eye Strain", "Poor lighting, screen work, detailed tasks"),
-                ("Mental Fatigue", "Long shifts, complex tasks, decision making"),
-                ("Stress", "High workload, time pressure, responsibility")
-            ],
-            "Fire and Explosions": [
-                ("Fire", "Hot work, electrical faults, flammable materials"),
-                ("Explosion", "Dust, gases, pressure vessels, chemical reactions"),
-                ("Flash Fire", "Flammable vapors, ignition sources"),
-                ("Thermal Burns", "Hot surfaces, steam, molten metal"),
-                ("Smoke Inhalation", "Fire, welding fumes, chemical vapors"),
-                ("Structural Collapse", "Fire damage, explosion damage")
-            ],
-            "Heat/Temperature": [
-                ("Heat Stress", "Hot environments, heavy work, protective clothing"),
-                ("Thermal Burns", "Hot surfaces, steam, molten metal, welding"),
-                ("Cold Stress", "Cold environments, refrigeration, outdoor work"),
-                ("Frostbite", "Extreme cold, wet conditions, poor protection"),
-                ("Heat Exhaustion", "High temperatures, physical exertion"),
-                ("Heat Stroke", "Severe heat stress, dehydration")
-            ],
-            "Noise/Vibration": [
-                ("Hearing Loss", "Loud equipment, impact noise, continuous exposure"),
-                ("Hand-Arm Vibration", "Power tools, equipment operation"),
-                ("Whole Body Vibration", "Vehicle operation, machinery operation"),
-                ("Tinnitus", "Loud noise exposure, acoustic trauma"),
-                ("Communication Interference", "Background noise, hearing protection")
-            ],
-            "Ingress/Egress": [
-                ("Entrapment", "Confined spaces, equipment access, emergency exits"),
-                ("Access Difficulties", "Poor lighting, narrow passages, obstacles"),
-                ("Emergency Egress", "Blocked exits, poor signage, panic"),
-                ("Vehicle Access", "Loading docks, traffic, blind spots"),
-                ("Equipment Access", "Maintenance access, operator stations")
-            ],
-            "Material Handling": [
-                ("Manual Handling", "Lifting, carrying, pushing, pulling"),
-                ("Mechanical Handling", "Cranes, forklifts, conveyors, hoists"),
-                ("Storage Hazards", "Stacking, racking, falling materials"),
-                ("Transportation", "Vehicle movement, loading, unloading"),
-                ("Packaging", "Sharp edges, heavy packages, unstable loads")
-            ],
-            "Environmental/Industrial Hygiene": [
-                ("Dust Exposure", "Grinding, sanding, material handling"),
-                ("Fume Exposure", "Welding, painting, chemical processes"),
-                ("Vapor Exposure", "Solvents, cleaning agents, process chemicals"),
-                ("Mist Exposure", "Coolants, lubricants, process fluids"),
-                ("Gas Exposure", "Compressed gases, process gases, exhaust"),
-                ("Biological Hazards", "Mold, bacteria, organic materials")
-            ],
-            "Ventilation/Confined Space": [
-                ("Oxygen Deficiency", "Confined spaces, gas displacement"),
-                ("Toxic Atmosphere", "Chemical vapors, process gases, decomposition"),
-                ("Flammable Atmosphere", "Gas accumulation, vapor buildup"),
-                ("Engulfment", "Loose materials, flowing substances"),
-                ("Entrapment", "Narrow passages, equipment, structural elements")
-            ],
-            "Chemical": [
-                ("Chemical Burns", "Acids, bases, corrosive materials"),
-                ("Chemical Inhalation", "Vapors, gases, dusts, mists"),
-                ("Chemical Ingestion", "Contamination, poor hygiene"),
-                ("Chemical Injection", "High pressure, sharp objects"),
-                ("Allergic Reactions", "Sensitizers, allergens, irritants"),
-                ("Carcinogenic Exposure", "Known carcinogens, long-term exposure")
-            ],
-            "Fluid/Pressure": [
-                ("High Pressure", "Hydraulic systems, pneumatic systems, pressure vessels"),
-                ("Fluid Injection", "High pressure fluids, hydraulic systems"),
-                ("Pressure Vessel Failure", "Overpressure, corrosion, fatigue"),
-                ("Fluid Leaks", "Hydraulic oil, coolant, process fluids"),
-                ("Vacuum Hazards", "Vacuum systems, implosion, collapse")
-            ],
-            "Wastes (Lean)": [
-                ("Waste Accumulation", "Excess inventory, scrap, unused materials"),
-                ("Storage Issues", "Poor organization, space constraints"),
-                ("Disposal Hazards", "Waste handling, disposal processes"),
-                ("Recycling Hazards", "Sorting, processing, material handling")
-            ],
-            "Other": [
-                ("Weather Conditions", "Rain, snow, wind, extreme temperatures"),
-                ("Lighting Issues", "Poor lighting, glare, shadows"),
-                ("Housekeeping", "Poor organization, clutter, debris"),
-                ("Maintenance", "Equipment failure, repair activities"),
-                ("Training", "Inadequate training, skill gaps, inexperience")
-            ]
-        }
-        
-        if category == "All Categories":
-            all_hazards = []
-            for cat_hazards in hazards.values():
-                all_hazards.extend(cat_hazards)
-            return all_hazards
-        else:
-            return hazards.get(category, [])
+        return HAZARD_CATALOG.hazards_for(category)
 
     def on_category_selected(self, current, previous):
         """Handle category selection and populate hazards table with remembered selections"""
         if current is None:
             return
             
-        # Save current selections before switching
-        if self.current_category:
-            self.save_current_selections()
-            
         category = current.text()
         self.current_category = category
-        hazards = self.get_hazards_for_category(category)
         
-        self.hazards_table.setRowCount(0)
-        for hazard_name, cause in hazards:
-            row = self.hazards_table.rowCount()
-            self.hazards_table.insertRow(row)
-            
-            # Hazard name
-            self.hazards_table.setItem(row, 0, QTableWidgetItem(hazard_name))
-            
-            # Cause/Failure (editable)
-            cause_item = QTableWidgetItem(cause)
-            self.hazards_table.setItem(row, 1, cause_item)
-            
-            # Selected checkbox with remembered state
-            checkbox = QCheckBox()
-            checkbox.setStyleSheet("font-size: 24px;")
-            
-            # Restore selection if it exists
-            if category in self.hazard_selections:
-                if hazard_name in self.hazard_selections[category]:
-                    checkbox.setChecked(True)
-            
-            # Connect checkbox to update summary
-            checkbox.stateChanged.connect(self.update_selection_summary)
-            
-            self.hazards_table.setCellWidget(row, 2, checkbox)
+        # One model reset; rows share the catalog tuple and checks come from hazard_selections
+        self.hazard_table_model.set_category(category, self.get_hazards_for_category(category))
         
         # Update summary after populating
-        self.update_selection_summary()
+        self.schedule_selection_summary()
+
+    def on_hazard_renamed(self, old_name, new_name):
+        """Carry a selection over when a hazard in the table is renamed"""
+        if old_name in self.hazard_selections.get(self.current_category, ()):
+            self.set_hazard_selected(self.current_category, old_name, False)
+            self.set_hazard_selected(self.current_category, new_name, True)
+
+    def set_hazard_selected(self, category, hazard_name, selected):
+        """Add or remove one selection, keeping the running counts up to date"""
+        selections = self.hazard_selections.setdefault(category, set())
+        if selected == (hazard_name in selections):
+            return
+        if selected:
+            selections.add(hazard_name)
+            delta = 1
+        else:
+            selections.discard(hazard_name)
+            delta = -1
+        self.selection_counts[category] = len(selections)
+        if category != ALL_CATEGORIES:
+            self.selection_total += delta
+        self.schedule_selection_summary()
+
+    def clear_category_selections(self, category):
+        """Forget every selection in one category"""
+        selections = self.hazard_selections.get(category)
+        if not selections:
+            return
+        if category != ALL_CATEGORIES:
+            self.selection_total -= len(selections)
+        selections.clear()
+        self.selection_counts[category] = 0
+        self.schedule_selection_summary()
+
+    def schedule_selection_summary(self):
+        """Update the summary label once the current burst of toggles is over"""
+        self.summary_timer.start()
 
     def update_selection_summary(self):
         """Update the selection summary display"""
-        total_selected = 0
-        category_breakdown = []
-        
-        for category, selected_hazards in self.hazard_selections.items():
-            if category != "All Categories" and selected_hazards:
-                count = len(selected_hazards)
-                total_selected += count
-                category_breakdown.append(f"{category}: {count}")
-        
-        if total_selected == 0:
+        if self.selection_total == 0:
             self.selection_summary.setText("No hazards selected")
-        else:
-            summary_text = f"Total Selected: {total_selected}"
-            if category_breakdown:
-                summary_text += f" ({', '.join(category_breakdown)})"
-            self.selection_summary.setText(summary_text)
-
-    def save_current_selections(self):
-        """Save current checkbox selections for the current category"""
-        if not self.current_category:
             return
-            
-        if self.current_category not in self.hazard_selections:
-            self.hazard_selections[self.current_category] = set()
-            
-        # Clear previous selections for this category
-        self.hazard_selections[self.current_category].clear()
         
-        # Save current selections
-        for row in range(self.hazards_table.rowCount()):
-            checkbox = self.hazards_table.cellWidget(row, 2)
-            if checkbox and checkbox.isChecked():
-                hazard_name = self.hazards_table.item(row, 0).text()
-                self.hazard_selections[self.current_category].add(hazard_name)
-        
-        # Update summary
-        self.update_selection_summary()
+        category_breakdown = [
+            f"{category}: {count}"
+            for category, count in self.selection_counts.items()
+            if category != ALL_CATEGORIES and count
+        ]
+        summary_text = f"Total Selected: {self.selection_total}"
+        if category_breakdown:
+            summary_text += f" ({', '.join(category_breakdown)})"
+        self.selection_summary.setText(summary_text)
 
     def clear_hazard_selections(self):
         """Clear all checkbox selections in the current category"""
-        for row in range(self.hazards_table.rowCount()):
-            checkbox = self.hazards_table.cellWidget(row, 2)
-            if checkbox:
-                checkbox.setChecked(False)
-        
-        # Clear from memory
-        if self.current_category in self.hazard_selections:
-            self.hazard_selections[self.current_category].clear()
-        
-        # Update summary
-        self.update_selection_summary()
+        self.clear_category_selections(self.current_category)
+        self.hazard_table_model.refresh_checks()
 
-    def add_selected_hazards_to_task(self):
-        """Add selected hazards to the currently selected task with visual feedback"""
-        current_item = self.tree.currentItem()
-        if current_item is None:
+    def selected_task(self):
+        """Return the Task selected in the tree (going up from a hazard), warning if there is none"""
+        node = self.hazard_model.node(self.tree.currentIndex())
+        if node is None:
             QMessageBox.warning(self, "Warning", "Please select a task first.")
-            return
-            
-        # Find the task item (if we're on a hazard, go up to task)
-        task_item = current_item
-        if task_item.parent() is None:  # It's a user
+            return None
+        if isinstance(node, User):
             QMessageBox.warning(self, "Warning", "Please select a task, not a user.")
+            return None
+        if isinstance(node, Hazard):
+            node = self.hazard_model.parent_node(node)
+        return node
+
+    def add_selected_hazards_to_task(self):
+        """Add selected hazards to the currently selected task with visual feedback"""
+        # Find the task (if we're on a hazard, go up to task)
+        task = self.selected_task()
+        if task is None:
             return
             
-        task_name = task_item.text(1)
+        task_name = task.name
         
         # Get selected hazards from current category
-        selected_hazards = []
-        for row in range(self.hazards_table.rowCount()):
-            checkbox = self.hazards_table.cellWidget(row, 2)
-            if checkbox and checkbox.isChecked():
-                hazard_name = self.hazards_table.item(row, 0).text()
-                cause = self.hazards_table.item(row, 1).text()
-                selected_hazards.append((hazard_name, cause))
+        selected_hazards = self.hazard_table_model.checked_hazards()
         
         if not selected_hazards:
             QMessageBox.warning(self, "Warning", "Please select at least one hazard.")
             return
             
-        # Add hazards to the task with visual feedback
-        added_count = 0
-        for hazard_name, cause in selected_hazards:
-            # Check if hazard already exists for this task
-            hazard_exists = False
-            for i in range(task_item.childCount()):
-                existing_hazard = task_item.child(i)
-                if existing_hazard.text(2) == f"{hazard_name} - {cause}":
-                    hazard_exists = True
-                    break
-            
-            if not hazard_exists:
-                hazard_item = QTreeWidgetItem(task_item)
-                hazard_item.setText(2, f"{hazard_name} - {cause}")
-                added_count += 1
+        # Add hazards to the task with visual feedback (hazards the task already has are skipped)
+        descriptions = [f"{hazard_name} - {cause}" for hazard_name, cause in selected_hazards]
+        added_count = len(self.hazard_model.add_new_hazards(task, descriptions))
         
         # Clear selections after adding
-        for row in range(self.hazards_table.rowCount()):
-            checkbox = self.hazards_table.cellWidget(row, 2)
-            if checkbox:
-                checkbox.setChecked(False)
-        
-        # Clear from memory
-        if self.current_category in self.hazard_selections:
-            self.hazard_selections[self.current_category].clear()
+        self.clear_hazard_selections()
                 
         if added_count > 0:
             QMessageBox.information(self, "Success", f"Added {added_count} new hazards to task: {task_name}")
@@ -583,23 +726,17 @@ class MainWindow(QMainWindow):
 
     def add_all_selected_hazards_to_task(self):
         """Add all selected hazards from all categories to the currently selected task"""
-        current_item = self.tree.currentItem()
-        if current_item is None:
-            QMessageBox.warning(self, "Warning", "Please select a task first.")
-            return
-            
-        # Find the task item
-        task_item = current_item
-        if task_item.parent() is None:  # It's a user
-            QMessageBox.warning(self, "Warning", "Please select a task, not a user.")
+        # Find the task
+        task = self.selected_task()
+        if task is None:
             return
             
-        task_name = task_item.text(1)
+        task_name = task.name
         
         # Collect all selected hazards from all categories
         all_selected_hazards = []
         for category, selected_hazards in self.hazard_selections.items():
-            if category != "All Categories":
+            if category != ALL_CATEGORIES:
                 category_hazards = self.get_hazards_for_category(category)
                 for hazard_name, cause in category_hazards:
                     if hazard_name in selected_hazards:
@@ -609,111 +746,93 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Warning", "No hazards selected from any category.")
             return
             
-        # Add all selected hazards to the task
-        added_count = 0
-        for hazard_name, cause in all_selected_hazards:
-            # Check if hazard already exists for this task
-            hazard_exists = False
-            for i in range(task_item.childCount()):
-                existing_hazard = task_item.child(i)
-                if existing_hazard.text(2) == f"{hazard_name} - {cause}":
-                    hazard_exists = True
-                    break
-            
-            if not hazard_exists:
-                hazard_item = QTreeWidgetItem(task_item)
-                hazard_item.setText(2, f"{hazard_name} - {cause}")
-                added_count += 1
+        # Add all selected hazards to the task (hazards the task already has are skipped)
+        descriptions = [f"{hazard_name} - {cause}" for hazard_name, cause in all_selected_hazards]
+        added_count = len(self.hazard_model.add_new_hazards(task, descriptions))
         
         # Clear all selections
         self.hazard_selections.clear()
-        self.clear_hazard_selections()
+        self.selection_counts.clear()
+        self.selection_total = 0
+        self.hazard_table_model.refresh_checks()
+        self.schedule_selection_summary()
                 
         QMessageBox.information(self, "Success", f"Added {added_count} hazards from all categories to task: {task_name}")
 
     def add_user(self):
-        user_item = QTreeWidgetItem(["New User", "", ""])
-        user_item.setFlags(user_item.flags() | Qt.ItemIsEditable)
-        self.tree.addTopLevelItem(user_item)
-        self.tree.setCurrentItem(user_item)
-        self.tree.editItem(user_item, 0)
+        index = self.hazard_model.add_user("New User")
+        self.tree.setCurrentIndex(index)
+        self.tree.edit(index)
 
     def add_task(self):
-        current_item = self.tree.currentItem()
-        if current_item and current_item.parent() is None:  # User item
+        node = self.hazard_model.node(self.tree.currentIndex())
+        if isinstance(node, User):
             # Add task to the current user
-            task_item = QTreeWidgetItem(current_item)
-            task_item.setText(1, "New Task")
-            task_item.setFlags(task_item.flags() | Qt.ItemIsEditable)
-            self.tree.setCurrentItem(task_item)
-            self.tree.editItem(task_item, 1)
-        elif current_item and current_item.parent() and current_item.parent().parent() is None:  # Task item
+            user = node
+        elif isinstance(node, Task):
             # If we're on a task, add another task to the same user
-            user_item = current_item.parent()
-            task_item = QTreeWidgetItem(user_item)
-            task_item.setText(1, "New Task")
-            task_item.setFlags(task_item.flags() | Qt.ItemIsEditable)
-            self.tree.setCurrentItem(task_item)
-            self.tree.editItem(task_item, 1)
-        elif current_item and current_item.parent() and current_item.parent().parent() and current_item.parent().parent().parent() is None:  # Hazard item
+            user = self.hazard_model.parent_node(node)
+        elif isinstance(node, Hazard):
             # If we're on a hazard, add another task to the same user
-            user_item = current_item.parent().parent()
-            task_item = QTreeWidgetItem(user_item)
-            task_item.setText(1, "New Task")
-            task_item.setFlags(task_item.flags() | Qt.ItemIsEditable)
-            self.tree.setCurrentItem(task_item)
-            self.tree.editItem(task_item, 1)
+            user = self.hazard_model.parent_node(self.hazard_model.parent_node(node))
         else:
             # If no user selected, create a new user first
             self.add_user()
+            return
+        index = self.hazard_model.add_task(user, "New Task")
+        self.tree.expand(self.hazard_model.index_of(user))
+        self.tree.setCurrentIndex(index)
+        self.tree.edit(index)
 
     def add_hazard(self):
-        current_item = self.tree.currentItem()
-        if current_item and current_item.parent() and current_item.parent().parent() is None:  # Task item
+        node = self.hazard_model.node(self.tree.currentIndex())
+        if isinstance(node, Task):
             # Add hazard to the current task
-            hazard_item = QTreeWidgetItem(current_item)
-            hazard_item.setText(2, "New Hazard")
-            hazard_item.setFlags(hazard_item.flags() | Qt.ItemIsEditable)
-            self.tree.setCurrentItem(hazard_item)
-            self.tree.editItem(hazard_item, 2)
-        elif current_item and current_item.parent() is None:  # User item
+            task = node
+        elif isinstance(node, User):
             # Create task first, then hazard
             self.add_task()
-        elif current_item and current_item.parent() and current_item.parent().parent() and current_item.parent().parent().parent() is None:  # Hazard item
+            return
+        elif isinstance(node, Hazard):
             # If we're on a hazard, add another hazard to the same task
-            task_item = current_item.parent()
-            hazard_item = QTreeWidgetItem(task_item)
-            hazard_item.setText(2, "New Hazard")
-            hazard_item.setFlags(hazard_item.flags() | Qt.ItemIsEditable)
-            self.tree.setCurrentItem(hazard_item)
-            self.tree.editItem(hazard_item, 2)
+            task = self.hazard_model.parent_node(node)
         else:
             # If no task selected, create a new user and task first
             self.add_user()
+            return
+        hazard = self.hazard_model.add_hazards(task, ["New Hazard"])[0]
+        index = self.hazard_model.index_of(hazard, TREE_COL_HAZARD)
+        self.tree.expand(self.hazard_model.index_of(task))
+        self.tree.setCurrentIndex(index)
+        self.tree.edit(index)
 
     def delete_item(self):
-        current_item = self.tree.currentItem()
-        if current_item:
-            if current_item.parent() is None:  # User item
-                self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(current_item))
-            else:
-                parent = current_item.parent()
-                parent.removeChild(current_item)
+        current_index = self.tree.currentIndex()
+        if current_index.isValid():
+            self.hazard_model.remove(current_index)
 
     def create_assess_risk_tab(self):
         tab = QWidget()
         layout = QVBoxLayout()
         
-        # Risk Assessment Table
-        self.risk_table = QTableWidget()
-        self.risk_table.setColumnCount(13)
-        self.risk_table.setHorizontalHeaderLabels([
-            "Item ID", "User/Role", "Task", "Hazard Category", "Hazard", "Cause/Failure Mode",
-            "Initial Severity", "Initial Probability", "Initial Risk Level",
-            "Risk Reduction Measures", "Residual Severity", "Residual Probability", "Residual Risk Level"
-        ])
+        # Risk Assessment Table (model/view: editors are only created for the cell being edited)
+        self.risk_model = RiskTableModel(self)
+        self.risk_table = QTableView()
+        self.risk_table.setModel(self.risk_model)
+        # Not CurrentChanged: moving through the table must not open an editor (and popup) in every cell
+        self.risk_table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked |
+                                        QAbstractItemView.EditKeyPressed | QAbstractItemView.AnyKeyPressed)
+        self.risk_table.setSelectionBehavior(QAbstractItemView.SelectItems)
+        self.severity_delegate = ComboBoxDelegate(SEVERITY_LEVELS, self.risk_table)
+        self.probability_delegate = ComboBoxDelegate(PROBABILITY_LEVELS, self.risk_table)
+        for col in (COL_INITIAL_SEVERITY, COL_RESIDUAL_SEVERITY):
+            self.risk_table.setItemDelegateForColumn(col, self.severity_delegate)
+        for col in (COL_INITIAL_PROBABILITY, COL_RESIDUAL_PROBABILITY):
+            self.risk_table.setItemDelegateForColumn(col, self.probability_delegate)
         self.risk_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.risk_table.setStyleSheet("font-size: 24px; QHeaderView::section { font-size: 24px; font-weight: bold; padding: 15px; }")
+        # Fixed row heights let the view lay out only the rows that are visible
+        self.risk_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.risk_table.verticalHeader().setDefaultSectionSize(48)
         layout.addWidget(self.risk_table)
 
         # Risk Reduction Methods Section
@@ -721,22 +840,21 @@ class MainWindow(QMainWindow):
         methods_layout = QVBoxLayout()
         
         methods_label = QLabel("What risk reduction method(s) have been or will be applied?")
-        methods_label.setStyleSheet("font-size: 24px; font-weight: bold; margin: 10px;")
         methods_layout.addWidget(methods_label)
         
         methods_text_layout = QHBoxLayout()
         self.risk_reduction_text = QTextEdit()
         self.risk_reduction_text.setMaximumHeight(100)
-        self.risk_reduction_text.setStyleSheet("font-size: 20px; padding: 10px;")
+        self.risk_reduction_text.setObjectName("riskReductionText")
         methods_text_layout.addWidget(self.risk_reduction_text)
         
         methods_btn = QPushButton("Edit Risk Reduction Methods...")
-        methods_btn.setStyleSheet("font-size: 20px; padding: 15px; margin: 10px; background-color: #f0f0f0; border: 2px solid #ccc; border-radius: 10px;")
+        methods_btn.setObjectName("smallActionButton")
         methods_btn.clicked.connect(self.show_risk_reduction_methods)
         methods_text_layout.addWidget(methods_btn)
         
         transfer_btn = QPushButton("Transfer to Selected Row")
-        transfer_btn.setStyleSheet("font-size: 20px; padding: 15px; margin: 10px; background-color: #4CAF50; color: white; border: 2px solid #45a049; border-radius: 10px;")
+        transfer_btn.setObjectName("transferButton")
         transfer_btn.clicked.connect(self.transfer_risk_reduction_methods)
         methods_text_layout.addWidget(transfer_btn)
         
@@ -752,7 +870,6 @@ class MainWindow(QMainWindow):
         matrix_layout = QVBoxLayout()
         
         matrix_label = QLabel("Risk Scoring System:")
-        matrix_label.setStyleSheet("font-size: 24px; font-weight: bold; margin: 10px;")
         matrix_layout.addWidget(matrix_label)
         
         # Create risk matrix display
@@ -762,7 +879,7 @@ class MainWindow(QMainWindow):
         matrix_table.setHorizontalHeaderLabels(["", "Very Likely", "Likely", "Unlikely", "Remote"])
         matrix_table.setVerticalHeaderLabels(["Catastrophic", "Serious", "Moderate", "Minor"])
         matrix_table.setMaximumHeight(200)
-        matrix_table.setStyleSheet("font-size: 20px; QHeaderView::section { font-size: 20px; font-weight: bold; padding: 10px; }")
+        matrix_table.setObjectName("matrixTable")
         
         # Color the matrix cells
         matrix_colors = [
@@ -798,7 +915,7 @@ class MainWindow(QMainWindow):
         controls_layout = QVBoxLayout()
         
         view_risk_btn = QPushButton("View Risk Scoring System")
-        view_risk_btn.setStyleSheet("font-size: 20px; padding: 15px; margin: 10px; background-color: #f0f0f0; border: 2px solid #ccc; border-radius: 10px;")
+        view_risk_btn.setObjectName("smallActionButton")
         controls_layout.addWidget(view_risk_btn)
         
         # Navigation buttons
@@ -808,11 +925,8 @@ class MainWindow(QMainWindow):
         next_col_btn = QPushButton("→")
         next_row_btn = QPushButton("↓")
         
-        nav_style = "font-size: 20px; padding: 15px; margin: 5px; background-color: #f0f0f0; border: 2px solid #ccc; border-radius: 10px;"
-        prev_col_btn.setStyleSheet(nav_style)
-        prev_row_btn.setStyleSheet(nav_style)
-        next_col_btn.setStyleSheet(nav_style)
-        next_row_btn.setStyleSheet(nav_style)
+        for nav_btn in (prev_col_btn, prev_row_btn, next_col_btn, next_row_btn):
+            nav_btn.setObjectName("navButton")
         
         nav_layout.addWidget(prev_col_btn)
         nav_layout.addWidget(prev_row_btn)
@@ -821,7 +935,7 @@ class MainWindow(QMainWindow):
         controls_layout.addLayout(nav_layout)
         
         help_btn = QPushButton("Help")
-        help_btn.setStyleSheet("font-size: 20px; padding: 15px; margin: 10px; background-color: #f0f0f0; border: 2px solid #ccc; border-radius: 10px;")
+        help_btn.setObjectName("smallActionButton")
         controls_layout.addWidget(help_btn)
         
         controls_group.setLayout(controls_layout)
@@ -830,7 +944,6 @@ class MainWindow(QMainWindow):
         layout.addLayout(bottom_layout)
 
         refresh_btn = QPushButton("Refresh from Hazard Tree")
-        refresh_btn.setStyleSheet("font-size: 24px; padding: 20px; margin: 10px; background-color: #f0f0f0; border: 2px solid #ccc; border-radius: 10px;")
         refresh_btn.clicked.connect(self.refresh_risk_table)
         layout.addWidget(refresh_btn)
 
@@ -846,7 +959,7 @@ class MainWindow(QMainWindow):
 
     def transfer_risk_reduction_methods(self):
         """Transfer selected risk reduction methods to the currently selected row"""
-        current_row = self.risk_table.currentRow()
+        current_row = self.risk_table.currentIndex().row()
         if current_row < 0:
             QMessageBox.warning(self, "Warning", "Please select a row in the risk assessment table first.")
             return
@@ -857,7 +970,7 @@ class MainWindow(QMainWindow):
             return
         
         # Transfer the methods to the "Risk Reduction Measures" column (column 9)
-        self.risk_table.setItem(current_row, 9, QTableWidgetItem(methods_text))
+        self.risk_model.setData(self.risk_model.index(current_row, COL_MEASURES), methods_text)
         
         QMessageBox.information(self, "Success", f"Risk reduction methods transferred to row {current_row + 1}")
         
@@ -865,191 +978,30 @@ class MainWindow(QMainWindow):
         self.risk_reduction_text.clear()
 
     def refresh_risk_table(self):
-        self.risk_table.setRowCount(0)
-        item_id = 1
-        
-        for i in range(self.tree.topLevelItemCount()):
-            user_item = self.tree.topLevelItem(i)
-            user_name = user_item.text(0)
-            for j in range(user_item.childCount()):
-                task_item = user_item.child(j)
-                task_name = task_item.text(1)
-                for k in range(task_item.childCount()):
-                    hazard_item = task_item.child(k)
-                    hazard_text = hazard_item.text(2)
-                    
-                    # Parse hazard text to extract category and cause
-                    if " - " in hazard_text:
-                        hazard_name, cause = hazard_text.split(" - ", 1)
-                        # Try to determine category from hazard name
-                        hazard_category = self.determine_hazard_category(hazard_name)
-                    else:
-                        hazard_name = hazard_text
-                        cause = ""
-                        hazard_category = "Other"
-                    
-                    row = self.risk_table.rowCount()
-                    self.risk_table.insertRow(row)
-                    
-                    # Item ID
-                    self.risk_table.setItem(row, 0, QTableWidgetItem(f"{item_id}"))
-                    
-                    # User/Role
-                    self.risk_table.setItem(row, 1, QTableWidgetItem(user_name))
-                    
-                    # Task
-                    self.risk_table.setItem(row, 2, QTableWidgetItem(task_name))
-                    
-                    # Hazard Category
-                    self.risk_table.setItem(row, 3, QTableWidgetItem(hazard_category))
-                    
-                    # Hazard
-                    self.risk_table.setItem(row, 4, QTableWidgetItem(hazard_name))
-                    
-                    # Cause/Failure Mode
-                    self.risk_table.setItem(row, 5, QTableWidgetItem(cause))
-                    
-                    # Initial Severity (combo box)
-                    init_sev_cb = QComboBox()
-                    init_sev_cb.addItems(["Catastrophic", "Serious", "Moderate", "Minor"])
-                    init_sev_cb.setStyleSheet("font-size: 24px; padding: 8px;")
-                    init_sev_cb.currentIndexChanged.connect(lambda _, r=row: self.update_initial_risk_level(r))
-                    self.risk_table.setCellWidget(row, 6, init_sev_cb)
-                    
-                    # Initial Probability (combo box)
-                    init_prob_cb = QComboBox()
-                    init_prob_cb.addItems(["Very Likely", "Likely", "Unlikely", "Remote"])
-                    init_prob_cb.setStyleSheet("font-size: 24px; padding: 8px;")
-                    init_prob_cb.currentIndexChanged.connect(lambda _, r=row: self.update_initial_risk_level(r))
-                    self.risk_table.setCellWidget(row, 7, init_prob_cb)
-                    
-                    # Initial Risk Level (calculated)
-                    self.risk_table.setItem(row, 8, QTableWidgetItem(""))
-                    
-                    # Risk Reduction Measures (editable)
-                    self.risk_table.setItem(row, 9, QTableWidgetItem(""))
-                    
-                    # Residual Severity (combo box)
-                    res_sev_cb = QComboBox()
-                    res_sev_cb.addItems(["Catastrophic", "Serious", "Moderate", "Minor"])
-                    res_sev_cb.setStyleSheet("font-size: 24px; padding: 8px;")
-                    res_sev_cb.currentIndexChanged.connect(lambda _, r=row: self.update_residual_risk_level(r))
-                    self.risk_table.setCellWidget(row, 10, res_sev_cb)
-                    
-                    # Residual Probability (combo box)
-                    res_prob_cb = QComboBox()
-                    res_prob_cb.addItems(["Very Likely", "Likely", "Unlikely", "Remote"])
-                    res_prob_cb.setStyleSheet("font-size: 24px; padding: 8px;")
-                    res_prob_cb.currentIndexChanged.connect(lambda _, r=row: self.update_residual_risk_level(r))
-                    self.risk_table.setCellWidget(row, 11, res_prob_cb)
-                    
-                    # Residual Risk Level (calculated)
-                    self.risk_table.setItem(row, 12, QTableWidgetItem(""))
-                    
-                    # Set default risk levels
-                    self.update_initial_risk_level(row)
-                    self.update_residual_risk_level(row)
-                    
-                    item_id += 1
-
-    def determine_hazard_category(self, hazard_name):
-        """Determine hazard category based on hazard name"""
-        hazard_name_lower = hazard_name.lower()
-        
-        if any(word in hazard_name_lower for word in ["crushing", "cutting", "drawing", "pinch", "impact", "abrasion", "puncture"]):
-            return "Mechanical"
-        elif any(word in hazard_name_lower for word in ["electric", "arc", "static", "battery", "control"]):
-            return "Electrical/Electronic"
-        elif any(word in hazard_name_lower for word in ["slip", "trip", "fall"]):
-            return "Slips/Trips/Falls"
-        elif any(word in hazard_name_lower for word in ["repetitive", "awkward", "lifting", "vibration", "strain"]):
-            return "Ergonomics/Human Factors"
-        elif any(word in hazard_name_lower for word in ["fire", "explosion", "thermal", "smoke"]):
-            return "Fire and Explosions"
-        elif any(word in hazard_name_lower for word in ["heat", "cold", "temperature", "frostbite"]):
-            return "Heat/Temperature"
-        elif any(word in hazard_name_lower for word in ["noise", "hearing", "tinnitus"]):
-            return "Noise/Vibration"
-        elif any(word in hazard_name_lower for word in ["ingress", "egress", "entrapment", "access"]):
-            return "Ingress/Egress"
-        elif any(word in hazard_name_lower for word in ["handling", "storage", "transport", "packaging"]):
-            return "Material Handling"
-        elif any(word in hazard_name_lower for word in ["dust", "fume", "vapor", "gas", "biological"]):
-            return "Environmental/Industrial Hygiene"
-        elif any(word in hazard_name_lower for word in ["ventilation", "confined", "oxygen", "toxic", "flammable"]):
-            return "Ventilation/Confined Space"
-        elif any(word in hazard_name_lower for word in ["chemical", "acid", "base", "corrosive", "allergic"]):
-            return "Chemical"
-        elif any(word in hazard_name_lower for word in ["pressure", "fluid", "hydraulic", "pneumatic", "vacuum"]):
-            return "Fluid/Pressure"
-        elif any(word in hazard_name_lower for word in ["waste", "disposal", "recycling"]):
-            return "Wastes (Lean)"
-        else:
-            return "Other"
-
-    def update_initial_risk_level(self, row):
-        severity_cb = self.risk_table.cellWidget(row, 6)
-        probability_cb = self.risk_table.cellWidget(row, 7)
-        if not severity_cb or not probability_cb:
-            return
+        """Reconcile the risk table with the hazard tree, keeping values already entered"""
+        self.record_edit({'op': 'refresh_risk_table'})
+        keys = [(user.name, task.name, hazard.description) for user, task, hazard in self.project.iter_hazards()]
         
-        severity = severity_cb.currentText()
-        probability = probability_cb.currentText()
-        risk = self.calculate_risk_level(severity, probability)
-        
-        risk_item = QTableWidgetItem(risk)
-        # Color code the risk level
-        if risk == "High":
-            risk_item.setBackground(Qt.red)
-            risk_item.setForeground(Qt.white)
-        elif risk == "Medium":
-            risk_item.setBackground(Qt.yellow)
-        elif risk == "Low":
-            risk_item.setBackground(Qt.green)
-            risk_item.setForeground(Qt.white)
-        
-        self.risk_table.setItem(row, 8, risk_item)
-
-    def update_residual_risk_level(self, row):
-        res_sev_cb = self.risk_table.cellWidget(row, 10)
-        res_prob_cb = self.risk_table.cellWidget(row, 11)
-        if not res_sev_cb or not res_prob_cb:
-            return
-        
-        severity = res_sev_cb.currentText()
-        probability = res_prob_cb.currentText()
-        risk = self.calculate_risk_level(severity, probability)
+        with bulk_update(self.risk_table):
+            self.risk_model.reconcile(keys, self.create_risk_row)
+
+    def create_risk_row(self, key):
+        """Create a new risk row for a (user, task, hazard text) tree entry"""
+        user_name, task_name, hazard_text = key
         
-        risk_item = QTableWidgetItem(risk)
-        # Color code the risk level
-        if risk == "High":
-            risk_item.setBackground(Qt.red)
-            risk_item.setForeground(Qt.white)
-        elif risk == "Medium":
-            risk_item.setBackground(Qt.yellow)
-        elif risk == "Low":
-            risk_item.setBackground(Qt.green)
-            risk_item.setForeground(Qt.white)
+        # Parse hazard text to extract category and cause
+        hazard_name, cause = split_hazard_text(hazard_text)
+        hazard_category = self.determine_hazard_category(hazard_name, cause)
         
-        self.risk_table.setItem(row, 12, risk_item)
+        return RiskRow(user_name, task_name, hazard_category, hazard_name, cause)
+
+    def determine_hazard_category(self, hazard_name, cause=""):
+        """Determine hazard category based on hazard name"""
+        return categorize_hazard(hazard_name, cause)
 
     def calculate_risk_level(self, severity, probability):
         """Calculate risk level based on severity and probability using the matrix"""
-        severity_map = {"Catastrophic": 0, "Serious": 1, "Moderate": 2, "Minor": 3}
-        probability_map = {"Very Likely": 0, "Likely": 1, "Unlikely": 2, "Remote": 3}
-        
-        sev_idx = severity_map.get(severity, 1)
-        prob_idx = probability_map.get(probability, 1)
-        
-        # Risk matrix
-        matrix = [
-            ["High", "High", "High", "Medium"],
-            ["High", "High", "Medium", "Low"],
-            ["High", "Medium", "Low", "Low"],
-            ["Medium", "Low", "Low", "Low"]
-        ]
-        
-        return matrix[sev_idx][prob_idx]
+        return matrix_risk_level(severity, probability)
 
     def save_assessment(self):
         """Save the current assessment to the current file"""
@@ -1061,177 +1013,540 @@ class MainWindow(QMainWindow):
     def save_assessment_as(self):
         """Save the current assessment to a new file"""
         file_path, _ = QFileDialog.getSaveFileName(
-            self, "Save Assessment", "", "JSON Files (*.json);;All Files (*)"
+            self, "Save Assessment", "", ASSESSMENT_FILE_FILTER
         )
         if file_path:
             self.current_file = file_path
             self.save_assessment_to_file(file_path)
 
+    def current_assessment(self):
+        """The assessment shown in the window; risk rows and the project are shared, not copied"""
+        return Assessment(
+            project_info=dict(self.project_info),
+            project=self.project,
+            risk_rows=self.risk_model.rows(),
+            control_systems=self.get_control_system_data(),
+            alternative_methods=self.get_alternative_method_data(),
+            risk_reduction_text=self.risk_reduction_text.toPlainText() if hasattr(self, 'risk_reduction_text') else ""
+        )
+
+    def get_assessment_data(self):
+        """Snapshot the whole assessment as plain data in the file format"""
+        return encode_assessment(self.current_assessment())
+
     def save_assessment_to_file(self, file_path):
-        """Save assessment data to a JSON file"""
+        """Save assessment data to a JSON file in the background"""
+        if self.loader is not None:
+            QMessageBox.warning(self, "Still Loading", "Wait for the assessment to finish loading before saving it.")
+            return
         try:
-            data = {
-                'project_info': self.project_info,
-                'hazard_data': self.get_hazard_data(),
-                'risk_assessment_data': self.get_risk_assessment_data(),
-                'control_system_data': self.get_control_system_data(),
-                'alternative_method_data': self.get_alternative_method_data(),
-                'risk_reduction_text': self.risk_reduction_text.toPlainText() if hasattr(self, 'risk_reduction_text') else ""
-            }
-            
-            with open(file_path, 'w') as f:
-                json.dump(data, f, indent=2)
-            
-            QMessageBox.information(self, "Success", f"Assessment saved to {file_path}")
+            # Snapshot on the GUI thread; serializing and writing happen on the worker
+            self.flush_journal()
+            data = self.get_assessment_data()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save assessment: {str(e)}")
+            return
+        # The journal keeps every edit until the save is on disk; see on_save_worker_finished
+        mark = self.journal_mark()
+        
+        if self.save_worker is not None:
+            # Only the latest snapshot per file matters once the running save finishes
+            self.pending_saves.pop(file_path, None)
+            self.pending_saves[file_path] = (data, mark)
+            return
+        self.start_save_worker(file_path, data, mark)
+
+    def start_save_worker(self, file_path, data, mark):
+        if is_store_path(file_path):
+            # Open on the GUI thread so the worker only ever reads self.stores
+            self.assessment_store(file_path)
+        self.statusBar().showMessage(f"Saving assessment to {file_path}...")
+        self.save_journal_mark = mark
+        self.save_worker = SaveWorker(file_path, data, self.write_assessment, self)
+        self.save_worker.saved.connect(self.on_assessment_saved)
+        self.save_worker.failed.connect(self.on_assessment_save_failed)
+        self.save_worker.finished.connect(self.on_save_worker_finished)
+        self.save_worker.start()
+
+    def on_assessment_saved(self, file_path):
+        self.statusBar().showMessage(f"Assessment saved to {file_path}", 5000)
+
+    def on_assessment_save_failed(self, file_path, error):
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Error", f"Failed to save assessment: {error}")
+
+    def on_save_worker_finished(self):
+        worker = self.save_worker
+        worker.deleteLater()
+        self.save_worker = None
+        self.save_failed = worker.error is not None
+        if not self.save_failed and self.save_journal_mark == self.journal_mark() \
+                and not self.journal_dirty_rows and not self.journal_text_dirty:
+            # Nothing was edited since the snapshot, so the saved file holds every edit
+            self.restart_journal(worker.file_path, worker.data)
+        if self.pending_saves:
+            file_path = next(iter(self.pending_saves))
+            self.start_save_worker(file_path, *self.pending_saves.pop(file_path))
+
+    def assessment_store(self, file_path):
+        """The open .rdb store for file_path, kept open so saves stay incremental"""
+        store = self.stores.get(file_path)
+        if store is None:
+            store = self.stores[file_path] = AssessmentStore(file_path)
+        return store
+
+    def write_assessment(self, file_path, data):
+        """Write a snapshot from get_assessment_data; runs on the save worker"""
+        if is_store_path(file_path):
+            self.assessment_store(file_path).save_data(data)
+        else:
+            write_json_atomic(file_path, data)
+
+    def closeEvent(self, event):
+        self.stop_loading()
+        # Let a running save finish before the window goes away
+        if self.save_worker is not None:
+            self.save_worker.wait()
+            self.save_failed = self.save_worker.error is not None
+            for file_path, (data, _mark) in self.pending_saves.items():
+                try:
+                    self.write_assessment(file_path, data)
+                    self.save_failed = False
+                except Exception as e:
+                    self.save_failed = True
+                    QMessageBox.critical(self, "Error", f"Failed to save assessment: {str(e)}")
+            self.pending_saves.clear()
+        for store in self.stores.values():
+            store.close()
+        self.stores.clear()
+        self.compact_timer.stop()
+        if self.journal is not None:
+            # After a failed save the journal is the only copy of the edits; keep it for recovery
+            self.flush_journal()
+            self.journal.close(discard=not self.save_failed)
+            self.journal = None
+        super().closeEvent(event)
+
+    # Autosave journal
+
+    def start_journal(self):
+        try:
+            self.journal = Journal()
+        except OSError as e:
+            self.statusBar().showMessage(f"Autosave is off: {e}")
+            return
+        self.restart_journal(self.current_file, self.get_assessment_data())
+        self.compact_timer.start()
+
+    def restart_journal(self, file_path, data):
+        """Start the journal again from a snapshot that already holds every edit"""
+        self.journal_generation += 1
+        self.journal_timer.stop()
+        self.journal_dirty_rows.clear()
+        self.journal_text_dirty = False
+        if self.journal is not None:
+            self.journal.restart(file_path, data)
+
+    def journal_mark(self):
+        """Identifies the journal's contents; equal marks mean no edit was journaled in between"""
+        return self.journal_generation, self.journal.edits_since_base if self.journal is not None else 0
+
+    def compact_journal(self):
+        """Fold the journal into the main file (or a fresh base when there is none)"""
+        if self.journal is None or self.loader is not None:
+            return
+        if self.journal.edits_since_base == 0 and not self.journal_timer.isActive():
+            return
+        if self.current_file:
+            self.save_assessment_to_file(self.current_file)
+        else:
+            self.restart_journal(None, self.get_assessment_data())
+
+    def record_edit(self, record):
+        if self.journal is not None and not self.journal_paused:
+            self.journal.append(record)
+
+    def journal_tables(self):
+        return {'control_systems': self.control_table, 'alternative_methods': self.alt_method_table}
+
+    def connect_journal(self):
+        tree = self.hazard_model
+        tree.rowsInserted.connect(self.journal_tree_inserted)
+        tree.rowsAboutToBeRemoved.connect(self.journal_tree_removed)
+        tree.dataChanged.connect(self.journal_tree_changed)
+        self.risk_model.dataChanged.connect(self.journal_risk_changed)
+        for name, table in self.journal_tables().items():
+            model = table.model()
+            # Row edits are written once the current event is done, so a new row
+            # is journaled with the combo boxes set up after insertRow
+            model.rowsAboutToBeInserted.connect(self.flush_journal)
+            model.rowsInserted.connect(lambda parent, first, last, name=name: self.journal_table_inserted(name, first, last))
+            model.rowsAboutToBeRemoved.connect(lambda parent, first, last, name=name: self.journal_table_removed(name, first, last))
+            model.dataChanged.connect(lambda top_left, bottom_right, roles=None, name=name: self.mark_table_rows(name, top_left.row(), bottom_right.row()))
+        self.risk_reduction_text.textChanged.connect(self.journal_text_changed)
+
+    def tree_path(self, index):
+        path = []
+        while index.isValid():
+            path.append(index.row())
+            index = index.parent()
+        return path[::-1]
+
+    def tree_index(self, path, column=0):
+        index = QModelIndex()
+        for depth, row in enumerate(path):
+            index = self.hazard_model.index(row, column if depth == len(path) - 1 else 0, index)
+        return index
+
+    def tree_node_text(self, node):
+        return node.description if isinstance(node, Hazard) else node.name
+
+    def journal_tree_inserted(self, parent, first, last):
+        model = self.hazard_model
+        names = [self.tree_node_text(model.node(model.index(row, 0, parent))) for row in range(first, last + 1)]
+        self.record_edit({'op': 'tree_insert', 'path': self.tree_path(parent), 'names': names})
+
+    def journal_tree_removed(self, parent, first, last):
+        self.record_edit({'op': 'tree_remove', 'path': self.tree_path(parent) + [first], 'count': last - first + 1})
+
+    def journal_tree_changed(self, top_left, bottom_right, roles=None):
+        node = self.hazard_model.node(top_left)
+        self.record_edit({
+            'op': 'tree_set', 'path': self.tree_path(top_left), 'column': top_left.column(),
+            'value': self.tree_node_text(node)
+        })
+
+    def journal_risk_changed(self, top_left, bottom_right, roles=None):
+        for col in range(top_left.column(), bottom_right.column() + 1):
+            field = RISK_ROW_FIELDS.get(col)
+            if field is None:
+                continue  # item numbers and calculated risk levels
+            for row in range(top_left.row(), bottom_right.row() + 1):
+                value = getattr(self.risk_model.row_at(row), field)
+                self.record_edit({'op': 'risk', 'row': row, 'column': col, 'value': value})
+
+    def journal_table_inserted(self, name, first, last):
+        self.record_edit({'op': 'table_insert', 'table': name, 'row': first, 'count': last - first + 1})
+        self.mark_table_rows(name, first, last)
+
+    def journal_table_removed(self, name, first, last):
+        self.flush_journal()
+        self.record_edit({'op': 'table_remove', 'table': name, 'row': first, 'count': last - first + 1})
+
+    def mark_table_rows(self, name, first, last):
+        if self.journal is None or self.journal_paused:
+            return
+        self.journal_dirty_rows.update((name, row) for row in range(first, last + 1))
+        self.journal_timer.start(0)
+
+    def journal_text_changed(self):
+        if self.journal is None or self.journal_paused:
+            return
+        self.journal_text_dirty = True
+        self.journal_timer.start(0)
+
+    def cell_combo(self, table):
+        """A combo box for a cell of table.
+
+        It is created inside the viewport so it is polished once; see theme.py.
+        """
+        return CellComboBox(table.viewport())
+
+    def set_cell_combo(self, table, row, col, combo):
+        """Put a combo box in a table cell and journal the row when it changes"""
+        table.setCellWidget(row, col, combo)
+        combo.currentTextChanged.connect(lambda _text, table=table, col=col, combo=combo: self.journal_combo_changed(table, col, combo))
+        self.mark_table_rows(self.journal_table_name(table), row, row)
+
+    def journal_table_name(self, table):
+        return 'control_systems' if table is self.control_table else 'alternative_methods'
+
+    def journal_combo_changed(self, table, col, combo):
+        # Rows move as others are inserted or removed, so look the combo up
+        for row in range(table.rowCount()):
+            if table.cellWidget(row, col) is combo:
+                self.mark_table_rows(self.journal_table_name(table), row, row)
+                return
+
+    def flush_journal(self):
+        self.journal_timer.stop()
+        tables = self.journal_tables()
+        for name, row in sorted(self.journal_dirty_rows):
+            table = tables[name]
+            if row < table.rowCount():
+                values = [self.table_cell_text(table, row, col) for col in range(table.columnCount())]
+                self.record_edit({'op': 'table_row', 'table': name, 'row': row, 'values': values})
+        self.journal_dirty_rows.clear()
+        if self.journal_text_dirty:
+            self.journal_text_dirty = False
+            self.record_edit({'op': 'text', 'value': self.risk_reduction_text.toPlainText()})
+
+    def recover_from_journal(self, journal_path):
+        """Rebuild the assessment from a journal left behind by a crash"""
+        try:
+            base, edits = read_journal(journal_path)
+            assessment = decode_assessment(base['data'])
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to recover assessment: {str(e)}")
+            return False
+        
+        self.current_file = base.get('file')
+        self.journal_paused = True
+        try:
+            self.show_assessment(assessment)
+            for record in edits:
+                self.replay_edit(record)
+        finally:
+            self.journal_paused = False
+        self.restart_journal(self.current_file, self.get_assessment_data())
+        try:
+            os.unlink(journal_path)
+        except OSError:
+            pass
+        QMessageBox.information(self, "Recovered", f"Recovered {len(edits)} unsaved edits")
+        return True
+
+    def replay_edit(self, record):
+        op = record['op']
+        if op == 'tree_insert':
+            model = self.hazard_model
+            parent = model.node(self.tree_index(record['path'])) if record['path'] else None
+            if parent is None:
+                for name in record['names']:
+                    model.add_user(name)
+            elif isinstance(parent, User):
+                for name in record['names']:
+                    model.add_task(parent, name)
+            else:
+                model.add_hazards(parent, record['names'])
+        elif op == 'tree_remove':
+            for _ in range(record['count']):
+                self.hazard_model.remove(self.tree_index(record['path']))
+        elif op == 'tree_set':
+            self.hazard_model.setData(self.tree_index(record['path'], record['column']), record['value'])
+        elif op == 'refresh_risk_table':
+            self.refresh_risk_table()
+        elif op == 'risk':
+            self.risk_model.setData(self.risk_model.index(record['row'], record['column']), record['value'])
+        elif op in ('table_insert', 'table_remove', 'table_row'):
+            table = self.journal_tables()[record['table']]
+            row = record['row']
+            if op == 'table_insert':
+                for _ in range(record['count']):
+                    table.insertRow(row)
+            elif op == 'table_remove':
+                for _ in range(record['count']):
+                    table.removeRow(row)
+            else:
+                self.set_saved_row(table, row, record['values'])
+        elif op == 'text':
+            self.risk_reduction_text.setPlainText(record['value'])
 
     def load_assessment(self):
         """Load an assessment from a file"""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Load Assessment", "", "JSON Files (*.json);;All Files (*)"
+            self, "Load Assessment", "", ASSESSMENT_FILE_FILTER
         )
         if file_path:
             self.current_file = file_path
             self.load_assessment_from_file(file_path)
 
+    def open_from_library(self):
+        """Pick an assessment from the library browser and load it"""
+        dialog = LibraryDialog(parent=self)
+        if dialog.exec_() == QDialog.Accepted and dialog.selected_path:
+            self.current_file = dialog.selected_path
+            self.load_assessment_from_file(dialog.selected_path)
+
     def load_assessment_from_file(self, file_path):
-        """Load assessment data from a JSON file"""
+        """Load assessment data from a file of any supported version"""
+        self.stop_loading()
+        if not is_store_path(file_path):
+            self.start_loading(file_path)
+            return
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            self.project_info = data.get('project_info', {})
-            self.load_hazard_data(data.get('hazard_data', []))
-            self.load_risk_assessment_data(data.get('risk_assessment_data', []))
-            self.load_control_system_data(data.get('control_system_data', []))
-            self.load_alternative_method_data(data.get('alternative_method_data', []))
-            
-            if hasattr(self, 'risk_reduction_text') and 'risk_reduction_text' in data:
-                self.risk_reduction_text.setPlainText(data['risk_reduction_text'])
-            
-            QMessageBox.information(self, "Success", f"Assessment loaded from {file_path}")
+            assessment = self.assessment_store(file_path).load()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load assessment: {str(e)}")
+            return
+        
+        self.apply_assessment(assessment)
+        self.finish_loading(file_path)
+
+    def start_loading(self, file_path):
+        """Read a JSON file a chunk at a time from the event loop.
+
+        The tree and the first rows show up while the rest of the file is
+        still being parsed, and the window keeps responding throughout.
+        """
+        self.loader = stream_assessment(file_path)
+        self.loading_file = file_path
+        self.journal_paused = True
+        self.show_assessment(Assessment())
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+        self.statusBar().showMessage(f"Loading {file_path}...")
+        self.load_timer.start()
+
+    def load_next_chunk(self):
+        # Apply chunks for one time slice, then let the event loop run
+        deadline = time.perf_counter() + LOAD_SLICE_SECONDS
+        try:
+            while time.perf_counter() < deadline:
+                kind, payload, progress = next(self.loader)
+                self.apply_loaded_chunk(kind, payload)
+                self.load_progress.setValue(int(progress * 100))
+        except StopIteration:
+            file_path = self.loading_file
+            self.stop_loading()
+            self.finish_loading(file_path)
         except Exception as e:
+            self.stop_loading()
+            self.current_file = None  # don't let Save overwrite the file with a partial load
+            # The journal's base is still the previous assessment; edits from here on apply to what is shown
+            self.restart_journal(None, self.get_assessment_data())
             QMessageBox.critical(self, "Error", f"Failed to load assessment: {str(e)}")
 
-    def get_hazard_data(self):
-        """Extract hazard data from the tree widget"""
-        data = []
-        for i in range(self.tree.topLevelItemCount()):
-            user_item = self.tree.topLevelItem(i)
-            user_data = {
-                'user': user_item.text(0),
-                'tasks': []
-            }
-            for j in range(user_item.childCount()):
-                task_item = user_item.child(j)
-                task_data = {
-                    'task': task_item.text(1),
-                    'hazards': []
-                }
-                for k in range(task_item.childCount()):
-                    hazard_item = task_item.child(k)
-                    task_data['hazards'].append(hazard_item.text(2))
-                user_data['tasks'].append(task_data)
-            data.append(user_data)
-        return data
-
-    def load_hazard_data(self, data):
-        """Load hazard data into the tree widget"""
-        self.tree.clear()
-        for user_data in data:
-            user_item = QTreeWidgetItem(self.tree)
-            user_item.setText(0, user_data['user'])
-            for task_data in user_data['tasks']:
-                task_item = QTreeWidgetItem(user_item)
-                task_item.setText(1, task_data['task'])
-                for hazard in task_data['hazards']:
-                    hazard_item = QTreeWidgetItem(task_item)
-                    hazard_item.setText(2, hazard)
-
-    def get_risk_assessment_data(self):
-        """Extract risk assessment data from the table"""
-        data = []
-        for row in range(self.risk_table.rowCount()):
-            row_data = {}
-            for col in range(self.risk_table.columnCount()):
-                item = self.risk_table.item(row, col)
-                if item:
-                    row_data[f'col_{col}'] = item.text()
-                else:
-                    widget = self.risk_table.cellWidget(row, col)
-                    if widget and hasattr(widget, 'currentText'):
-                        row_data[f'col_{col}'] = widget.currentText()
-                    else:
-                        row_data[f'col_{col}'] = ""
-            data.append(row_data)
-        return data
-
-    def load_risk_assessment_data(self, data):
-        """Load risk assessment data into the table"""
-        self.risk_table.setRowCount(0)
-        for row_data in data:
-            row = self.risk_table.rowCount()
-            self.risk_table.insertRow(row)
-            for col in range(self.risk_table.columnCount()):
-                value = row_data.get(f'col_{col}', "")
-                self.risk_table.setItem(row, col, QTableWidgetItem(value))
+    def apply_loaded_chunk(self, kind, payload):
+        if kind == 'header':
+            self.project_info = payload.project_info
+            self.project = payload.project
+            self.hazard_model.set_project(payload.project)
+            self.risk_reduction_text.setPlainText(payload.risk_reduction_text)
+        elif kind == 'risk_rows':
+            self.risk_model.append_rows(payload)
+        elif kind == 'control_systems':
+            self.append_control_system_rows(payload)
+        elif kind == 'alternative_methods':
+            self.append_alternative_method_rows(payload)
+
+    def stop_loading(self):
+        if self.loader is None:
+            return
+        self.load_timer.stop()
+        self.loader.close()
+        self.loader = None
+        self.loading_file = None
+        self.journal_paused = False
+        self.load_progress.hide()
+        self.statusBar().clearMessage()
+
+    def finish_loading(self, file_path):
+        self.restart_journal(file_path, self.get_assessment_data())
+        QMessageBox.information(self, "Success", f"Assessment loaded from {file_path}")
+
+    def apply_assessment(self, assessment):
+        """Show a loaded assessment in the window"""
+        self.journal_paused = True
+        try:
+            self.show_assessment(assessment)
+        finally:
+            self.journal_paused = False
+
+    def show_assessment(self, assessment):
+        self.project_info = assessment.project_info
+        self.project = assessment.project
+        self.hazard_model.set_project(assessment.project)
+        self.risk_model.set_rows(assessment.risk_rows)
+        self.load_control_system_data(assessment.control_systems)
+        self.load_alternative_method_data(assessment.alternative_methods)
+        if hasattr(self, 'risk_reduction_text'):
+            self.risk_reduction_text.setPlainText(assessment.risk_reduction_text)
+
+    def table_cell_text(self, table, row, col):
+        """Text of a table cell, whether it holds an item or a combo box"""
+        item = table.item(row, col)
+        if item:
+            return item.text()
+        widget = table.cellWidget(row, col)
+        if widget and hasattr(widget, 'currentText'):
+            return widget.currentText()
+        return ""
 
     def get_control_system_data(self):
-        """Extract control system data from the table"""
-        data = []
-        for row in range(self.control_table.rowCount()):
-            row_data = {}
-            for col in range(self.control_table.columnCount()):
-                item = self.control_table.item(row, col)
-                if item:
-                    row_data[f'col_{col}'] = item.text()
-                else:
-                    widget = self.control_table.cellWidget(row, col)
-                    if widget and hasattr(widget, 'currentText'):
-                        row_data[f'col_{col}'] = widget.currentText()
-                    else:
-                        row_data[f'col_{col}'] = ""
-            data.append(row_data)
-        return data
-
-    def load_control_system_data(self, data):
-        """Load control system data into the table"""
+        """Extract control system rows from the table"""
+        table = self.control_table
+        return [
+            ControlSystemRow(*(self.table_cell_text(table, row, col) for col in range(table.columnCount())))
+            for row in range(table.rowCount())
+        ]
+
+    def load_control_system_data(self, rows):
+        """Load control system rows into the table"""
         self.control_table.setRowCount(0)
-        for row_data in data:
-            row = self.control_table.rowCount()
-            self.control_table.insertRow(row)
-            for col in range(self.control_table.columnCount()):
-                value = row_data.get(f'col_{col}', "")
-                self.control_table.setItem(row, col, QTableWidgetItem(value))
+        self.append_control_system_rows(rows)
+
+    def append_control_system_rows(self, rows):
+        self.append_saved_rows(self.control_table, rows)
 
     def get_alternative_method_data(self):
-        """Extract alternative method data from the table"""
-        data = []
-        for row in range(self.alt_method_table.rowCount()):
-            row_data = {}
-            for col in range(self.alt_method_table.columnCount()):
-                item = self.alt_method_table.item(row, col)
-                if item:
-                    row_data[f'col_{col}'] = item.text()
-                else:
-                    widget = self.alt_method_table.cellWidget(row, col)
-                    if widget and hasattr(widget, 'currentText'):
-                        row_data[f'col_{col}'] = widget.currentText()
-                    else:
-                        row_data[f'col_{col}'] = ""
-            data.append(row_data)
-        return data
-
-    def load_alternative_method_data(self, data):
-        """Load alternative method data into the table"""
+        """Extract alternative method rows from the table"""
+        table = self.alt_method_table
+        return [
+            AlternativeMethodRow(*(self.table_cell_text(table, row, col) for col in range(table.columnCount())))
+            for row in range(table.rowCount())
+        ]
+
+    def load_alternative_method_data(self, rows):
+        """Load alternative method rows into the table"""
         self.alt_method_table.setRowCount(0)
-        for row_data in data:
-            row = self.alt_method_table.rowCount()
-            self.alt_method_table.insertRow(row)
-            for col in range(self.alt_method_table.columnCount()):
-                value = row_data.get(f'col_{col}', "")
-                self.alt_method_table.setItem(row, col, QTableWidgetItem(value))
+        self.append_alternative_method_rows(rows)
+
+    def append_alternative_method_rows(self, rows):
+        self.append_saved_rows(self.alt_method_table, rows)
+
+    def append_saved_rows(self, table, rows):
+        """Append saved rows to the control system or alternative method table.
+
+        Every cell is built in its final, editable form in one pass. The cost
+        is in the cell combos (see CellComboBox), not in repaints or header
+        layout, so the table is not put through bulk_update.
+        """
+        first = table.rowCount()
+        table.setRowCount(first + len(rows))
+        for row, saved in enumerate(rows, first):
+            self.set_saved_row(table, row, astuple(saved))
+
+    def set_saved_row(self, table, row, values):
+        """Fill a table row from saved text, rebuilding its combo boxes"""
+        for col, value in enumerate(values):
+            combo = self.saved_value_combo(table, row, col, value)
+            if combo is None:
+                table.removeCellWidget(row, col)
+                table.setItem(row, col, QTableWidgetItem(value))
+            else:
+                table.takeItem(row, col)
+                self.set_cell_combo(table, row, col, combo)
+
+    def saved_value_combo(self, table, row, col, value):
+        """A combo box for a saved cell, or None if the cell is plain text.
+
+        A value the combo cannot show, such as a hazard that is no longer in
+        the tree, stays as text so that loading never loses it.
+        """
+        if col == HAZARD_COMBO_COLUMN:
+            index = self.hazard_list_model.row_of(value)
+            if index < 0:
+                return None
+            combo = self.cell_combo(table)
+            self.populate_hazard_combo(combo)
+            combo.setCurrentIndex(index)
+        else:
+            is_control = table is self.control_table
+            choices = (CONTROL_COMBO_CHOICES if is_control else ALTERNATIVE_METHOD_COMBO_CHOICES).get(col)
+            if choices is None:
+                return None
+            custom_type = is_control and col == CONTROL_TYPE_COLUMN
+            if value not in choices:
+                if not (custom_type and value):
+                    return None
+                choices = choices + [value]  # a custom control type
+            combo = self.cell_combo(table)
+            combo.addItems(choices)
+            combo.setCurrentText(value)
+            if custom_type:
+                combo.currentTextChanged.connect(lambda text, r=row: self.handle_custom_control_type(text, r))
+        return combo
 
     def add_custom_hazard(self):
         """Add a custom hazard to the current category"""
@@ -1241,7 +1556,7 @@ class MainWindow(QMainWindow):
             return
             
         category_name = current_category.text()
-        if category_name == "All Categories":
+        if category_name == ALL_CATEGORIES:
             QMessageBox.warning(self, "Warning", "Please select a specific category, not 'All Categories'.")
             return
             
@@ -1251,44 +1566,37 @@ class MainWindow(QMainWindow):
             cause, ok2 = QInputDialog.getText(self, "Add Custom Hazard", "Enter cause/failure mode:")
             if ok2:
                 # Add to the hazards table
-                row = self.hazards_table.rowCount()
-                self.hazards_table.insertRow(row)
-                self.hazards_table.setItem(row, 0, QTableWidgetItem(hazard_name))
-                self.hazards_table.setItem(row, 1, QTableWidgetItem(cause))
-                
-                checkbox = QCheckBox()
-                checkbox.setStyleSheet("font-size: 24px;")
-                self.hazards_table.setCellWidget(row, 2, checkbox)
+                self.hazard_table_model.add_hazard(hazard_name, cause)
 
     def edit_custom_hazard(self):
         """Edit the selected hazard in the hazards table"""
-        current_row = self.hazards_table.currentRow()
+        current_row = self.hazards_table.currentIndex().row()
         if current_row < 0:
             QMessageBox.warning(self, "Warning", "Please select a hazard to edit.")
             return
             
-        hazard_name = self.hazards_table.item(current_row, 0).text()
-        cause = self.hazards_table.item(current_row, 1).text()
+        hazard_name, cause = self.hazard_table_model.hazard(current_row)
         
         new_hazard_name, ok = QInputDialog.getText(self, "Edit Hazard", "Enter hazard name:", text=hazard_name)
         if ok:
             new_cause, ok2 = QInputDialog.getText(self, "Edit Hazard", "Enter cause/failure mode:", text=cause)
             if ok2:
-                self.hazards_table.setItem(current_row, 0, QTableWidgetItem(new_hazard_name))
-                self.hazards_table.setItem(current_row, 1, QTableWidgetItem(new_cause))
+                # Renaming carries the selection over through hazardRenamed
+                self.hazard_table_model.set_hazard(current_row, new_hazard_name, new_cause)
 
     def delete_custom_hazard(self):
         """Delete the selected hazard from the hazards table"""
-        current_row = self.hazards_table.currentRow()
+        current_row = self.hazards_table.currentIndex().row()
         if current_row < 0:
             QMessageBox.warning(self, "Warning", "Please select a hazard to delete.")
             return
             
-        hazard_name = self.hazards_table.item(current_row, 0).text()
+        hazard_name = self.hazard_table_model.hazard(current_row)[0]
         reply = QMessageBox.question(self, "Confirm Delete", f"Are you sure you want to delete '{hazard_name}'?",
                                    QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
-            self.hazards_table.removeRow(current_row)
+            self.hazard_table_model.remove_hazard(current_row)
+            self.set_hazard_selected(self.current_category, hazard_name, False)
 
     def create_control_system_tab(self):
         tab = QWidget()
@@ -1301,13 +1609,11 @@ class MainWindow(QMainWindow):
             "Required Category", "Actual Category", "Control Type", "Verification"
         ])
         self.control_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.control_table.setStyleSheet("font-size: 24px; QHeaderView::section { font-size: 24px; font-weight: bold; padding: 15px; }")
         layout.addWidget(self.control_table)
         
         # Category Calculator Section
         calc_layout = QHBoxLayout()
         calc_label = QLabel("Category Calculator:")
-        calc_label.setStyleSheet("font-size: 24px; font-weight: bold; margin: 15px;")
         self.category_calc_cb = QComboBox()
         self.category_calc_cb.addItems([
             "Select Risk Level for Category Guidance",
@@ -1315,7 +1621,7 @@ class MainWindow(QMainWindow):
             "Medium Risk → Category 2-3", 
             "High Risk → Category 3-4"
         ])
-        self.category_calc_cb.setStyleSheet("font-size: 24px; padding: 15px; margin: 10px; border: 2px solid #ccc; border-radius: 8px;")
+        self.category_calc_cb.setObjectName("categoryCalculator")
         calc_layout.addWidget(calc_label)
         calc_layout.addWidget(self.category_calc_cb)
         layout.addLayout(calc_layout)
@@ -1327,14 +1633,6 @@ class MainWindow(QMainWindow):
         refresh_hazards_btn = QPushButton("Refresh Hazards")
         auto_populate_btn = QPushButton("Auto-Populate from Risk Assessment")
         
-        # Style buttons with larger text
-        button_style = "font-size: 24px; padding: 20px; margin: 10px; background-color: #f0f0f0; border: 2px solid #ccc; border-radius: 10px;"
-        add_control_btn.setStyleSheet(button_style)
-        edit_control_btn.setStyleSheet(button_style)
-        delete_control_btn.setStyleSheet(button_style)
-        refresh_hazards_btn.setStyleSheet(button_style)
-        auto_populate_btn.setStyleSheet(button_style)
-        
         btn_layout.addWidget(add_control_btn)
         btn_layout.addWidget(edit_control_btn)
         btn_layout.addWidget(delete_control_btn)
@@ -1352,71 +1650,29 @@ class MainWindow(QMainWindow):
         return tab
 
     def auto_populate_control_systems(self):
-        # Clear existing control systems
-        self.control_table.setRowCount(0)
-        
-        # Get all hazards from the risk assessment table
-        for row in range(self.risk_table.rowCount()):
-            user_role = self.risk_table.item(row, 1).text() if self.risk_table.item(row, 1) else ""
-            task = self.risk_table.item(row, 2).text() if self.risk_table.item(row, 2) else ""
-            hazard = self.risk_table.item(row, 4).text() if self.risk_table.item(row, 4) else ""
-            initial_risk = self.risk_table.item(row, 8).text() if self.risk_table.item(row, 8) else ""
-            final_risk = self.risk_table.item(row, 12).text() if self.risk_table.item(row, 12) else ""
-            
-            if user_role and task and hazard:
-                # Create a new control system row
-                control_row = self.control_table.rowCount()
-                self.control_table.insertRow(control_row)
-                
-                # Safety Function (default based on hazard)
-                safety_function = f"Control for {hazard}"
-                self.control_table.setItem(control_row, 0, QTableWidgetItem(safety_function))
-                
-                # Associated Hazard (combo box with the specific hazard selected)
-                hazard_cb = QComboBox()
-                self.populate_hazard_combo(hazard_cb)
-                # Find and select the matching hazard
-                hazard_text = f"{user_role} - {task} - {hazard}"
-                index = hazard_cb.findText(hazard_text)
-                if index >= 0:
-                    hazard_cb.setCurrentIndex(index)
-                self.control_table.setCellWidget(control_row, 1, hazard_cb)
-                
-                # Initial Risk Level
-                self.control_table.setItem(control_row, 2, QTableWidgetItem(initial_risk))
-                
-                # Final Risk Level
-                self.control_table.setItem(control_row, 3, QTableWidgetItem(final_risk))
-                
-                # Required Category (default based on final risk)
-                req_cat_cb = QComboBox()
-                req_cat_cb.addItems(["Category 1", "Category 2", "Category 3", "Category 4"])
-                req_cat_cb.setStyleSheet("font-size: 24px; padding: 8px;")
+        """Replace the control systems with one row per hazard in the risk assessment"""
+        rows = []
+        for risk_row in self.risk_model.rows():
+            if risk_row.user and risk_row.task and risk_row.hazard:
+                final_risk = risk_row.residual_risk
+                # Required category defaults from the final risk; actual defaults to the same
                 if final_risk == "High":
-                    req_cat_cb.setCurrentIndex(3)  # Category 4
+                    category = "Category 4"
                 elif final_risk == "Medium":
-                    req_cat_cb.setCurrentIndex(2)  # Category 3
+                    category = "Category 3"
                 else:
-                    req_cat_cb.setCurrentIndex(0)  # Category 1
-                self.control_table.setCellWidget(control_row, 4, req_cat_cb)
-                
-                # Actual Category (default to same as required)
-                act_cat_cb = QComboBox()
-                act_cat_cb.addItems(["Category 1", "Category 2", "Category 3", "Category 4"])
-                act_cat_cb.setStyleSheet("font-size: 24px; padding: 8px;")
-                act_cat_cb.setCurrentIndex(req_cat_cb.currentIndex())
-                self.control_table.setCellWidget(control_row, 5, act_cat_cb)
-                
-                # Control Type (default to "Interlock")
-                type_cb = QComboBox()
-                type_cb.addItems(["Interlock", "Light Curtain", "Emergency Stop", "Pressure Sensitive Mat", "Two-Hand Control", "Custom"])
-                type_cb.setStyleSheet("font-size: 24px; padding: 8px;")
-                type_cb.setCurrentIndex(0)  # Default to "Interlock"
-                type_cb.currentTextChanged.connect(lambda text, r=control_row: self.handle_custom_control_type(text, r))
-                self.control_table.setCellWidget(control_row, 6, type_cb)
-                
-                # Verification (empty)
-                self.control_table.setItem(control_row, 7, QTableWidgetItem(""))
+                    category = "Category 1"
+                rows.append(ControlSystemRow(
+                    safety_function=f"Control for {risk_row.hazard}",
+                    hazard=" - ".join(risk_row.key),
+                    initial_risk=risk_row.initial_risk,
+                    final_risk=final_risk,
+                    required_category=category,
+                    actual_category=category,
+                    control_type="Interlock",
+                    verification=""
+                ))
+        self.load_control_system_data(rows)
 
     def add_control_system(self):
         row = self.control_table.rowCount()
@@ -1426,10 +1682,9 @@ class MainWindow(QMainWindow):
         self.control_table.setItem(row, 0, QTableWidgetItem(""))
         
         # Associated Hazard (combo box)
-        hazard_cb = QComboBox()
+        hazard_cb = self.cell_combo(self.control_table)
         self.populate_hazard_combo(hazard_cb)
-        hazard_cb.setStyleSheet("font-size: 24px; padding: 8px;")
-        self.control_table.setCellWidget(row, 1, hazard_cb)
+        self.set_cell_combo(self.control_table, row, 1, hazard_cb)
         
         # Initial Risk Level (empty)
         self.control_table.setItem(row, 2, QTableWidgetItem(""))
@@ -1438,23 +1693,20 @@ class MainWindow(QMainWindow):
         self.control_table.setItem(row, 3, QTableWidgetItem(""))
         
         # Required Category (combo box)
-        req_cat_cb = QComboBox()
-        req_cat_cb.addItems(["Category 1", "Category 2", "Category 3", "Category 4"])
-        req_cat_cb.setStyleSheet("font-size: 24px; padding: 8px;")
-        self.control_table.setCellWidget(row, 4, req_cat_cb)
+        req_cat_cb = self.cell_combo(self.control_table)
+        req_cat_cb.addItems(CONTROL_CATEGORIES)
+        self.set_cell_combo(self.control_table, row, 4, req_cat_cb)
         
         # Actual Category (combo box)
-        act_cat_cb = QComboBox()
-        act_cat_cb.addItems(["Category 1", "Category 2", "Category 3", "Category 4"])
-        act_cat_cb.setStyleSheet("font-size: 24px; padding: 8px;")
-        self.control_table.setCellWidget(row, 5, act_cat_cb)
+        act_cat_cb = self.cell_combo(self.control_table)
+        act_cat_cb.addItems(CONTROL_CATEGORIES)
+        self.set_cell_combo(self.control_table, row, 5, act_cat_cb)
         
         # Control Type (combo box with Custom option)
-        type_cb = QComboBox()
-        type_cb.addItems(["Interlock", "Light Curtain", "Emergency Stop", "Pressure Sensitive Mat", "Two-Hand Control", "Custom"])
-        type_cb.setStyleSheet("font-size: 24px; padding: 8px;")
+        type_cb = self.cell_combo(self.control_table)
+        type_cb.addItems(CONTROL_TYPES)
         type_cb.currentTextChanged.connect(lambda text, r=row: self.handle_custom_control_type(text, r))
-        self.control_table.setCellWidget(row, 6, type_cb)
+        self.set_cell_combo(self.control_table, row, 6, type_cb)
         
         # Verification (editable text)
         self.control_table.setItem(row, 7, QTableWidgetItem(""))
@@ -1465,12 +1717,11 @@ class MainWindow(QMainWindow):
             custom_text, ok = QInputDialog.getText(self, "Custom Control Type", "Enter custom control type:")
             if ok and custom_text:
                 # Update the combo box with the new custom option
-                new_cb = QComboBox()
-                new_cb.addItems(["Interlock", "Light Curtain", "Emergency Stop", "Pressure Sensitive Mat", "Two-Hand Control", "Custom", custom_text])
-                new_cb.setStyleSheet("font-size: 24px; padding: 8px;")
+                new_cb = self.cell_combo(self.control_table)
+                new_cb.addItems(CONTROL_TYPES + [custom_text])
                 new_cb.setCurrentText(custom_text)
                 new_cb.currentTextChanged.connect(lambda text, r=row: self.handle_custom_control_type(text, r))
-                self.control_table.setCellWidget(row, 6, new_cb)
+                self.set_cell_combo(self.control_table, row, 6, new_cb)
 
     def edit_control_system(self):
         # Implementation for editing control system
@@ -1485,18 +1736,14 @@ class MainWindow(QMainWindow):
         pass
 
     def populate_hazard_combo(self, combo_box):
-        """Populate a combo box with all hazards from the tree"""
-        combo_box.clear()
-        for i in range(self.tree.topLevelItemCount()):
-            user_item = self.tree.topLevelItem(i)
-            user_name = user_item.text(0)
-            for j in range(user_item.childCount()):
-                task_item = user_item.child(j)
-                task_name = task_item.text(1)
-                for k in range(task_item.childCount()):
-                    hazard_item = task_item.child(k)
-                    hazard_name = hazard_item.text(2)
-                    combo_box.addItem(f"{user_name} - {task_name} - {hazard_name}")
+        """Attach the shared hazard list model to a combo box"""
+        # Without these every combo box measures every label in the list for its
+        # size hint and popup layout, which makes building a table quadratic
+        combo_box.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        combo_box.setMinimumContentsLength(HAZARD_COMBO_MIN_CHARS)
+        combo_box.view().setUniformItemSizes(True)
+        combo_box.view().setLayoutMode(QListView.Batched)
+        combo_box.setModel(self.hazard_list_model)
 
     def create_alternative_method_tab(self):
         tab = QWidget()
@@ -1510,7 +1757,6 @@ class MainWindow(QMainWindow):
             "Engineering Controls", "Training Requirements", "Verification Steps", "Approvals"
         ])
         self.alt_method_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.alt_method_table.setStyleSheet("font-size: 24px; QHeaderView::section { font-size: 24px; font-weight: bold; padding: 15px; }")
         layout.addWidget(self.alt_method_table)
         
         # Buttons
@@ -1523,16 +1769,6 @@ class MainWindow(QMainWindow):
         validate_btn = QPushButton("Validate A/M Compliance")
         generate_report_btn = QPushButton("Generate PDF Report")
         
-        # Style buttons with larger text
-        button_style = "font-size: 24px; padding: 20px; margin: 10px; background-color: #f0f0f0; border: 2px solid #ccc; border-radius: 10px;"
-        add_alt_method_btn.setStyleSheet(button_style)
-        edit_alt_method_btn.setStyleSheet(button_style)
-        delete_alt_method_btn.setStyleSheet(button_style)
-        refresh_hazards_btn.setStyleSheet(button_style)
-        auto_populate_alt_btn.setStyleSheet(button_style)
-        validate_btn.setStyleSheet(button_style)
-        generate_report_btn.setStyleSheet(button_style)
-        
         btn_layout.addWidget(add_alt_method_btn)
         btn_layout.addWidget(edit_alt_method_btn)
         btn_layout.addWidget(delete_alt_method_btn)
@@ -1561,16 +1797,14 @@ class MainWindow(QMainWindow):
         self.alt_method_table.setItem(row, 0, QTableWidgetItem(""))
         
         # Associated Hazard (combo box)
-        hazard_cb = QComboBox()
+        hazard_cb = self.cell_combo(self.alt_method_table)
         self.populate_hazard_combo(hazard_cb)
-        hazard_cb.setStyleSheet("font-size: 24px; padding: 8px;")
-        self.alt_method_table.setCellWidget(row, 1, hazard_cb)
+        self.set_cell_combo(self.alt_method_table, row, 1, hazard_cb)
         
         # Risk Assessment Complete (combo box)
-        risk_assessment_cb = QComboBox()
-        risk_assessment_cb.addItems(["Yes", "No", "In Progress"])
-        risk_assessment_cb.setStyleSheet("font-size: 24px; padding: 8px;")
-        self.alt_method_table.setCellWidget(row, 2, risk_assessment_cb)
+        risk_assessment_cb = self.cell_combo(self.alt_method_table)
+        risk_assessment_cb.addItems(ASSESSMENT_COMPLETE_OPTIONS)
+        self.set_cell_combo(self.alt_method_table, row, 2, risk_assessment_cb)
         
         # Justification (editable text)
         self.alt_method_table.setItem(row, 3, QTableWidgetItem(""))
@@ -1694,74 +1928,32 @@ class MainWindow(QMainWindow):
         msg.setWindowTitle("Alternative Method Validation")
         msg.setText(report)
         msg.setStandardButtons(QMessageBox.Ok)
-        msg.setStyleSheet("font-size: 16px;")
+        msg.setObjectName("validationReport")
         msg.exec_()
 
     def auto_populate_alternative_methods(self):
-        # Clear existing alternative methods
-        self.alt_method_table.setRowCount(0)
-        
-        # Get all hazards from the risk assessment table
-        for row in range(self.risk_table.rowCount()):
-            user_role = self.risk_table.item(row, 1).text() if self.risk_table.item(row, 1) else ""
-            task = self.risk_table.item(row, 2).text() if self.risk_table.item(row, 2) else ""
-            hazard = self.risk_table.item(row, 4).text() if self.risk_table.item(row, 4) else ""
-            initial_risk = self.risk_table.item(row, 8).text() if self.risk_table.item(row, 8) else ""
-            final_risk = self.risk_table.item(row, 12).text() if self.risk_table.item(row, 12) else ""
-            
-            if user_role and task and hazard:
-                # Create a new alternative method row
-                alt_row = self.alt_method_table.rowCount()
-                self.alt_method_table.insertRow(alt_row)
-                
-                # Task
-                self.alt_method_table.setItem(alt_row, 0, QTableWidgetItem(task))
-                
-                # Associated Hazard (combo box)
-                hazard_cb = QComboBox()
-                self.populate_hazard_combo(hazard_cb)
-                hazard_text = f"{user_role} - {task} - {hazard}"
-                index = hazard_cb.findText(hazard_text)
-                if index >= 0:
-                    hazard_cb.setCurrentIndex(index)
-                self.alt_method_table.setCellWidget(alt_row, 1, hazard_cb)
-                
-                # Risk Assessment Complete (default to "Yes")
-                risk_assessment_cb = QComboBox()
-                risk_assessment_cb.addItems(["Yes", "No", "In Progress"])
-                risk_assessment_cb.setStyleSheet("font-size: 24px; padding: 8px;")
-                risk_assessment_cb.setCurrentIndex(0)  # Yes
-                self.alt_method_table.setCellWidget(alt_row, 2, risk_assessment_cb)
-                
-                # Justification (default text)
-                justification = f"LOTO not feasible for {task} due to {hazard}. Alternative method provides equivalent protection."
-                self.alt_method_table.setItem(alt_row, 3, QTableWidgetItem(justification))
-                
-                # Procedure (empty)
-                self.alt_method_table.setItem(alt_row, 4, QTableWidgetItem(""))
-                
-                # Engineering Controls (empty)
-                self.alt_method_table.setItem(alt_row, 5, QTableWidgetItem(""))
-                
-                # Training Requirements (empty)
-                self.alt_method_table.setItem(alt_row, 6, QTableWidgetItem(""))
-                
-                # Verification Steps (empty)
-                self.alt_method_table.setItem(alt_row, 7, QTableWidgetItem(""))
-                
-                # Approvals (empty)
-                self.alt_method_table.setItem(alt_row, 8, QTableWidgetItem(""))
+        """Replace the alternative methods with one row per hazard in the risk assessment"""
+        rows = []
+        for risk_row in self.risk_model.rows():
+            if risk_row.user and risk_row.task and risk_row.hazard:
+                rows.append(AlternativeMethodRow(
+                    task=risk_row.task,
+                    hazard=" - ".join(risk_row.key),
+                    risk_assessment_complete="Yes",
+                    justification=f"LOTO not feasible for {risk_row.task} due to {risk_row.hazard}. Alternative method provides equivalent protection.",
+                    procedure="",
+                    engineering_controls="",
+                    training_requirements="",
+                    verification_steps="",
+                    approvals=""
+                ))
+        self.load_alternative_method_data(rows)
 
     def generate_pdf_report(self):
         """Generate a comprehensive PDF report of the entire assessment"""
         try:
-            from reportlab.lib.pagesizes import letter, A4, landscape
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.lib import colors
-            from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-            from datetime import datetime
+            # reportlab is only needed here, so a missing install must not stop the GUI starting
+            from report_engine import LayoutCache, write_report
             
             # Get file path for saving
             file_path, _ = QFileDialog.getSaveFileName(
@@ -1773,350 +1965,9 @@ class MainWindow(QMainWindow):
             if not file_path.endswith('.pdf'):
                 file_path += '.pdf'
             
-            # Create PDF document in landscape orientation
-            doc = SimpleDocTemplate(file_path, pagesize=landscape(letter), 
-                                  rightMargin=0.3*inch, leftMargin=0.3*inch, 
-                                  topMargin=0.3*inch, bottomMargin=0.3*inch)
-            story = []
-            
-            # Get styles
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=20,
-                alignment=TA_CENTER,
-                fontName='Helvetica-Bold'
-            )
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=12,
-                spaceAfter=10,
-                spaceBefore=15,
-                fontName='Helvetica-Bold'
-            )
-            normal_style = ParagraphStyle(
-                'CustomNormal',
-                parent=styles['Normal'],
-                fontSize=9,
-                spaceAfter=4,
-                fontName='Helvetica'
-            )
-            cell_style = ParagraphStyle(
-                'CellStyle',
-                parent=styles['Normal'],
-                fontSize=8,
-                spaceAfter=2,
-                spaceBefore=2,
-                fontName='Helvetica',
-                alignment=TA_LEFT,
-                wordWrap='CJK'  # Enable word wrapping
-            )
-            header_style = ParagraphStyle(
-                'HeaderStyle',
-                parent=styles['Normal'],
-                fontSize=8,
-                spaceAfter=2,
-                spaceBefore=2,
-                fontName='Helvetica-Bold',
-                alignment=TA_CENTER,
-                wordWrap='CJK'
-            )
-            
-            # Title
-            title = Paragraph("Risk Assessment Report", title_style)
-            story.append(title)
-            story.append(Spacer(1, 15))
-            
-            # Report Metadata Section
-            story.append(Paragraph("Report Information", heading_style))
-            
-            # Get current date
-            current_date = datetime.now().strftime("%m/%d/%Y")
-            
-            # Create metadata table
-            metadata_data = [
-                ["Application:", self.project_info.get('name', 'N/A') if hasattr(self, 'project_info') and self.project_info else 'N/A'],
-                ["Description:", self.project_info.get('description', 'N/A') if hasattr(self, 'project_info') and self.project_info else 'N/A'],
-                ["Product Identifier:", self.project_info.get('machine_id', 'N/A') if hasattr(self, 'project_info') and self.project_info else 'N/A'],
-                ["Assessment Type:", "Detailed"],
-                ["Limits:", "Risk assessment analysis"],
-                ["Sources:", "Personnel experiences, ANSI B11 standards, machine documentation"],
-                ["Risk Scoring System:", "ANSI B11.0 (TR3) Two Factor"],
-                ["Guide Sentence:", "When doing [task], the [user] could be injured by the [hazard] due to the [failure mode]."],
-                ["Analyst Name(s):", "Risk Assessment Team"],
-                ["Company:", self.project_info.get('company', 'N/A') if hasattr(self, 'project_info') and self.project_info else 'N/A'],
-                ["Facility Location:", self.project_info.get('facility', 'N/A') if hasattr(self, 'project_info') and self.project_info else 'N/A'],
-                ["Date:", current_date]
-            ]
-            
-            metadata_table = Table(metadata_data, colWidths=[2*inch, 6*inch])
-            metadata_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.grey),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('BACKGROUND', (1, 0), (1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('WORDWRAP', (0, 0), (-1, -1), True)
-            ]))
-            story.append(metadata_table)
-            story.append(Spacer(1, 15))
-            
-            # Risk Assessment Table (Main Content)
-            story.append(Paragraph("Risk Assessment Details", heading_style))
-            
-            if self.risk_table.rowCount() > 0:
-                # Create comprehensive risk assessment table with Paragraph objects for text wrapping
-                risk_data = []
-                
-                # Header row with Paragraph objects
-                header_row = [
-                    Paragraph("Item Id", header_style),
-                    Paragraph("User / Task", header_style),
-                    Paragraph("Hazard / Failure Mode", header_style),
-                    Paragraph("Initial Assessment - Severity", header_style),
-                    Paragraph("Initial Assessment - Probability", header_style),
-                    Paragraph("Initial Assessment - Risk Level", header_style),
-                    Paragraph("Risk Reduction Methods / Control System", header_style),
-                    Paragraph("Final Assessment - Severity", header_style),
-                    Paragraph("Final Assessment - Probability", header_style),
-                    Paragraph("Final Assessment - Risk Level", header_style),
-                    Paragraph("Status / Responsible / Comments / Reference", header_style)
-                ]
-                risk_data.append(header_row)
-                
-                for row in range(self.risk_table.rowCount()):
-                    # Use the same approach as get_risk_assessment_data for consistency
-                    row_data = {}
-                    for col in range(self.risk_table.columnCount()):
-                        item = self.risk_table.item(row, col)
-                        if item:
-                            row_data[f'col_{col}'] = item.text()
-                        else:
-                            widget = self.risk_table.cellWidget(row, col)
-                            if widget and hasattr(widget, 'currentText'):
-                                row_data[f'col_{col}'] = widget.currentText()
-                            else:
-                                row_data[f'col_{col}'] = ""
-                    
-                    # Extract values using the same logic as the save/load functions
-                    item_id = row_data.get('col_0', "")
-                    user_role = row_data.get('col_1', "")
-                    task = row_data.get('col_2', "")
-                    hazard_category = row_data.get('col_3', "")
-                    hazard = row_data.get('col_4', "")
-                    cause = row_data.get('col_5', "")
-                    init_sev = row_data.get('col_6', "")
-                    init_prob = row_data.get('col_7', "")
-                    init_risk = row_data.get('col_8', "")
-                    measures = row_data.get('col_9', "")
-                    final_sev = row_data.get('col_10', "")
-                    final_prob = row_data.get('col_11', "")
-                    final_risk = row_data.get('col_12', "")
-                    
-                    # Format the data
-                    user_task = f"{user_role} {task}" if user_role and task else f"{user_role}{task}"
-                    hazard_failure = f"{hazard_category}: {hazard} {cause}".strip()
-                    
-                    # Status (placeholder - could be enhanced with actual status tracking)
-                    status = "In Progress"
-                    
-                    # Create row with Paragraph objects for proper text wrapping
-                    data_row = [
-                        Paragraph(item_id, cell_style),
-                        Paragraph(user_task, cell_style),
-                        Paragraph(hazard_failure, cell_style),
-                        Paragraph(init_sev, cell_style),
-                        Paragraph(init_prob, cell_style),
-                        Paragraph(init_risk, cell_style),
-                        Paragraph(measures, cell_style),
-                        Paragraph(final_sev, cell_style),
-                        Paragraph(final_prob, cell_style),
-                        Paragraph(final_risk, cell_style),
-                        Paragraph(status, cell_style)
-                    ]
-                    risk_data.append(data_row)
-                
-                # Create table with fixed column widths for landscape orientation
-                col_widths = [0.4*inch, 1.0*inch, 1.6*inch, 0.6*inch, 0.6*inch, 0.6*inch, 
-                             1.8*inch, 0.6*inch, 0.6*inch, 0.6*inch, 0.9*inch]
-                
-                risk_table = Table(risk_data, colWidths=col_widths, repeatRows=1)
-                risk_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 4),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-                    ('TOPPADDING', (0, 0), (-1, -1), 6),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-                ]))
-                story.append(risk_table)
-            else:
-                story.append(Paragraph("No risk assessment data available", normal_style))
-            
-            story.append(PageBreak())
-            
-            # Control System Assessment Section
-            story.append(Paragraph("Control System Assessment", heading_style))
-            if self.control_table.rowCount() > 0:
-                control_data = []
-                
-                # Header row
-                control_header = [
-                    Paragraph("Safety Function", header_style),
-                    Paragraph("Associated Hazard", header_style),
-                    Paragraph("Initial Risk", header_style),
-                    Paragraph("Final Risk", header_style),
-                    Paragraph("Required Category", header_style),
-                    Paragraph("Actual Category", header_style),
-                    Paragraph("Control Type", header_style),
-                    Paragraph("Verification", header_style)
-                ]
-                control_data.append(control_header)
-                
-                for row in range(self.control_table.rowCount()):
-                    # Use the same approach as get_control_system_data for consistency
-                    row_data = {}
-                    for col in range(self.control_table.columnCount()):
-                        item = self.control_table.item(row, col)
-                        if item:
-                            row_data[f'col_{col}'] = item.text()
-                        else:
-                            widget = self.control_table.cellWidget(row, col)
-                            if widget and hasattr(widget, 'currentText'):
-                                row_data[f'col_{col}'] = widget.currentText()
-                            else:
-                                row_data[f'col_{col}'] = ""
-                    
-                    # Extract values using the same logic as the save/load functions
-                    safety_function = row_data.get('col_0', "")
-                    hazard = row_data.get('col_1', "")
-                    initial_risk = row_data.get('col_2', "")
-                    final_risk = row_data.get('col_3', "")
-                    req_category = row_data.get('col_4', "")
-                    act_category = row_data.get('col_5', "")
-                    control_type = row_data.get('col_6', "")
-                    verification = row_data.get('col_7', "")
-                    
-                    control_row = [
-                        Paragraph(safety_function, cell_style),
-                        Paragraph(hazard, cell_style),
-                        Paragraph(initial_risk, cell_style),
-                        Paragraph(final_risk, cell_style),
-                        Paragraph(req_category, cell_style),
-                        Paragraph(act_category, cell_style),
-                        Paragraph(control_type, cell_style),
-                        Paragraph(verification, cell_style)
-                    ]
-                    control_data.append(control_row)
-                
-                control_table = Table(control_data, colWidths=[1.3*inch, 1.8*inch, 0.7*inch, 0.7*inch, 
-                                                              0.9*inch, 0.9*inch, 1.1*inch, 1.6*inch], repeatRows=1)
-                control_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 4),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-                    ('TOPPADDING', (0, 0), (-1, -1), 6),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-                ]))
-                story.append(control_table)
-            else:
-                story.append(Paragraph("No control system data available", normal_style))
-            
-            story.append(PageBreak())
-            
-            # Alternative Methods Section
-            story.append(Paragraph("Alternative Methods Assessment", heading_style))
-            if self.alt_method_table.rowCount() > 0:
-                alt_data = []
-                
-                # Header row
-                alt_header = [
-                    Paragraph("Task", header_style),
-                    Paragraph("Associated Hazard", header_style),
-                    Paragraph("Risk Assessment Complete", header_style),
-                    Paragraph("Justification", header_style),
-                    Paragraph("Procedure", header_style),
-                    Paragraph("Engineering Controls", header_style),
-                    Paragraph("Training Requirements", header_style),
-                    Paragraph("Verification Steps", header_style),
-                    Paragraph("Approvals", header_style)
-                ]
-                alt_data.append(alt_header)
-                
-                for row in range(self.alt_method_table.rowCount()):
-                    # Use the same approach as get_alternative_method_data for consistency
-                    row_data = {}
-                    for col in range(self.alt_method_table.columnCount()):
-                        item = self.alt_method_table.item(row, col)
-                        if item:
-                            row_data[f'col_{col}'] = item.text()
-                        else:
-                            widget = self.alt_method_table.cellWidget(row, col)
-                            if widget and hasattr(widget, 'currentText'):
-                                row_data[f'col_{col}'] = widget.currentText()
-                            else:
-                                row_data[f'col_{col}'] = ""
-                    
-                    # Extract values using the same logic as the save/load functions
-                    task = row_data.get('col_0', "")
-                    hazard = row_data.get('col_1', "")
-                    risk_complete = row_data.get('col_2', "")
-                    justification = row_data.get('col_3', "")
-                    procedure = row_data.get('col_4', "")
-                    engineering_controls = row_data.get('col_5', "")
-                    training = row_data.get('col_6', "")
-                    verification = row_data.get('col_7', "")
-                    approvals = row_data.get('col_8', "")
-                    
-                    alt_row = [
-                        Paragraph(task, cell_style),
-                        Paragraph(hazard, cell_style),
-                        Paragraph(risk_complete, cell_style),
-                        Paragraph(justification, cell_style),
-                        Paragraph(procedure, cell_style),
-                        Paragraph(engineering_controls, cell_style),
-                        Paragraph(training, cell_style),
-                        Paragraph(verification, cell_style),
-                        Paragraph(approvals, cell_style)
-                    ]
-                    alt_data.append(alt_row)
-                
-                alt_table = Table(alt_data, colWidths=[0.8*inch, 1.8*inch, 0.8*inch, 1.2*inch, 1.2*inch, 
-                                                       1.2*inch, 1.2*inch, 1.2*inch, 0.8*inch], repeatRows=1)
-                alt_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 4),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-                    ('TOPPADDING', (0, 0), (-1, -1), 6),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-                ]))
-                story.append(alt_table)
-            else:
-                story.append(Paragraph("No alternative methods data available", normal_style))
-            
-            # Build PDF
-            doc.build(story)
+            if self.report_cache is None:
+                self.report_cache = LayoutCache()
+            write_report(self.current_assessment(), file_path, cache=self.report_cache)
             
             QMessageBox.information(self, "Success", f"PDF report generated successfully: {file_path}")
             
@@ -2130,19 +1981,17 @@ class RiskReductionMethodsDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Risk Reduction Methods")
         self.setMinimumSize(800, 600)
-        self.setStyleSheet("font-size: 20px;")
+        self.setObjectName("riskReductionMethodsDialog")
         
         layout = QVBoxLayout()
         
         # Title
         title = QLabel("Select Risk Reduction Methods (Hierarchy of Controls):")
-        title.setStyleSheet("font-size: 24px; font-weight: bold; margin: 10px;")
         layout.addWidget(title)
         
         # Tree widget for hierarchical methods
         self.methods_tree = QTreeWidget()
         self.methods_tree.setHeaderLabels(["Method", "Description"])
-        self.methods_tree.setStyleSheet("font-size: 20px; QHeaderView::section { font-size: 20px; font-weight: bold; padding: 15px; }")
         self.populate_risk_reduction_methods()
         layout.addWidget(self.methods_tree)
         
@@ -2151,10 +2000,6 @@ class RiskReductionMethodsDialog(QDialog):
         ok_btn = QPushButton("OK")
         cancel_btn = QPushButton("Cancel")
         
-        btn_style = "font-size: 20px; padding: 15px; margin: 10px; background-color: #f0f0f0; border: 2px solid #ccc; border-radius: 10px;"
-        ok_btn.setStyleSheet(btn_style)
-        cancel_btn.setStyleSheet(btn_style)
-        
         ok_btn.clicked.connect(self.accept)
         cancel_btn.clicked.connect(self.reject)
         
@@ -2236,6 +2081,7 @@ class RiskReductionMethodsDialog(QDialog):
 
 def main():
     app = QApplication(sys.argv)
+    apply_theme(app)
     
     # Show startup dialog
     startup_dialog = StartupDialog()
@@ -2259,7 +2105,7 @@ def main():
         elif startup_dialog.choice == "load":
             # Show file dialog to load existing assessment
             filename, _ = QFileDialog.getOpenFileName(
-                None, "Load Assessment", "", "JSON Files (*.json);;All Files (*)"
+                None, "Load Assessment", "", ASSESSMENT_FILE_FILTER
             )
             if filename:
                 main_window = MainWindow()
@@ -2267,10 +2113,33 @@ def main():
                 main_window.show()
             else:
                 sys.exit(0)
+        elif startup_dialog.choice == "library":
+            library_dialog = LibraryDialog()
+            if library_dialog.exec_() == QDialog.Accepted and library_dialog.selected_path:
+                main_window = MainWindow()
+                main_window.current_file = library_dialog.selected_path
+                main_window.load_assessment_from_file(library_dialog.selected_path)
+                main_window.show()
+            else:
+                sys.exit(0)
+        elif startup_dialog.choice == "recover":
+            journals = find_journals()
+            labels = [describe_journal(path) for path in journals]
+            label, ok = QInputDialog.getItem(None, "Recover Unsaved Work", "Choose the work to recover:", labels, 0, False)
+            if ok and label:
+                main_window = MainWindow()
+                main_window.recover_from_journal(journals[labels.index(label)])
+                main_window.show()
+            else:
+                sys.exit(0)
     else:
         sys.exit(0)
     
-    sys.exit(app.exec_())
+    status = app.exec_()
+    LibraryScanWorker.wait_for_cancelled()
+    sys.exit(status)
 
 if __name__ == "__main__":
+    # The library index parses files in worker processes, which needs this in a frozen build
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
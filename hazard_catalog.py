@@ -0,0 +1,256 @@
+"""
+Predefined hazard catalog used by the "Identify Hazards" tab.
+
+The catalog is built once at import time into immutable tuples and lookup
+tables, so category lists and name lookups cost a dict hit and allocate
+nothing.
+"""
+
+import re
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+ALL_CATEGORIES = "All Categories"
+
+# (hazard name, cause/failure mode) pairs for each predefined category
+_CATALOG_DATA = {
+    "Mechanical": [
+        ("Crushing", "Moving parts, heavy equipment, presses"),
+        ("Cutting/Severing", "Sharp edges, blades, shears, saws"),
+        ("Drawing-in/Trapping/Entanglement", "Rotating parts, conveyors, gears"),
+        ("Pinch Point", "Between moving and stationary parts"),
+        ("Unexpected Start", "Equipment startup, stored energy release"),
+        ("Break Up During Operation", "Flying debris, component failure"),
+        ("Machine Instability", "Overturning, tipping, falling equipment"),
+        ("Impact", "Dropped parts, falling objects, collisions"),
+        ("Abrasion", "Grinding, sanding, surface contact"),
+        ("Puncture", "Sharp objects, pointed tools, fasteners")
+    ],
+    "Electrical/Electronic": [
+        ("Electric Shock", "Exposed wiring, faulty equipment, wet conditions"),
+        ("Arc Flash", "Electrical faults, short circuits, switching operations"),
+        ("Electromagnetic Interference", "Radio frequency, magnetic fields"),
+        ("Static Electricity", "Friction, dry conditions, synthetic materials"),
+        ("Electrical Fire", "Overheating, short circuits, overload"),
+        ("Battery Explosion", "Lithium batteries, overcharging, damage"),
+        ("Control System Failure", "Software bugs, hardware failure, power loss"),
+        ("Electrocution", "High voltage contact, ground faults"),
+        ("Electrical Burns", "Arc flash, contact burns, thermal effects")
+    ],
+    "Slips/Trips/Falls": [
+        ("Slips", "Wet floors, oil, grease, loose materials"),
+        ("Trips", "Uneven surfaces, cables, tools, debris"),
+        ("Falls from Height", "Ladders, platforms, elevated work areas"),
+        ("Falls on Same Level", "Slippery surfaces, obstacles, poor lighting"),
+        ("Falls Through Openings", "Floor openings, unguarded edges"),
+        ("Stairway Falls", "Wet steps, poor lighting, missing handrails"),
+        ("Ladder Falls", "Unstable footing, overreaching, improper use")
+    ],
+    "Ergonomics/Human Factors": [
+        ("Repetitive Motion", "Assembly work, typing, tool operation"),
+        ("Awkward Postures", "Bending, reaching, twisting, kneeling"),
+        ("Heavy Lifting", "Manual material handling, equipment moving"),
+        ("Forceful Exertions", "Pushing, pulling, gripping, pressing"),
+        ("Vibration", "Hand tools, equipment operation, vehicle operation"),
+        ("Eye Strain", "Poor lighting, screen work, detailed tasks"),
+        ("Mental Fatigue", "Long shifts, complex tasks, decision making"),
+        ("Stress", "High workload, time pressure, responsibility")
+    ],
+    "Fire and Explosions": [
+        ("Fire", "Hot work, electrical faults, flammable materials"),
+        ("Explosion", "Dust, gases, pressure vessels, chemical reactions"),
+        ("Flash Fire", "Flammable vapors, ignition sources"),
+        ("Thermal Burns", "Hot surfaces, steam, molten metal"),
+        ("Smoke Inhalation", "Fire, welding fumes, chemical vapors"),
+        ("Structural Collapse", "Fire damage, explosion damage")
+    ],
+    "Heat/Temperature": [
+        ("Heat Stress", "Hot environments, heavy work, protective clothing"),
+        ("Thermal Burns", "Hot surfaces, steam, molten metal, welding"),
+        ("Cold Stress", "Cold environments, refrigeration, outdoor work"),
+        ("Frostbite", "Extreme cold, wet conditions, poor protection"),
+        ("Heat Exhaustion", "High temperatures, physical exertion"),
+        ("Heat Stroke", "Severe heat stress, dehydration")
+    ],
+    "Noise/Vibration": [
+        ("Hearing Loss", "Loud equipment, impact noise, continuous exposure"),
+        ("Hand-Arm Vibration", "Power tools, equipment operation"),
+        ("Whole Body Vibration", "Vehicle operation, machinery operation"),
+        ("Tinnitus", "Loud noise exposure, acoustic trauma"),
+        ("Communication Interference", "Background noise, hearing protection")
+    ],
+    "Ingress/Egress": [
+        ("Entrapment", "Confined spaces, equipment access, emergency exits"),
+        ("Access Difficulties", "Poor lighting, narrow passages, obstacles"),
+        ("Emergency Egress", "Blocked exits, poor signage, panic"),
+        ("Vehicle Access", "Loading docks, traffic, blind spots"),
+        ("Equipment Access", "Maintenance access, operator stations")
+    ],
+    "Material Handling": [
+        ("Manual Handling", "Lifting, carrying, pushing, pulling"),
+        ("Mechanical Handling", "Cranes, forklifts, conveyors, hoists"),
+        ("Storage Hazards", "Stacking, racking, falling materials"),
+        ("Transportation", "Vehicle movement, loading, unloading"),
+        ("Packaging", "Sharp edges, heavy packages, unstable loads")
+    ],
+    "Environmental/Industrial Hygiene": [
+        ("Dust Exposure", "Grinding, sanding, material handling"),
+        ("Fume Exposure", "Welding, painting, chemical processes"),
+        ("Vapor Exposure", "Solvents, cleaning agents, process chemicals"),
+        ("Mist Exposure", "Coolants, lubricants, process fluids"),
+        ("Gas Exposure", "Compressed gases, process gases, exhaust"),
+        ("Biological Hazards", "Mold, bacteria, organic materials")
+    ],
+    "Ventilation/Confined Space": [
+        ("Oxygen Deficiency", "Confined spaces, gas displacement"),
+        ("Toxic Atmosphere", "Chemical vapors, process gases, decomposition"),
+        ("Flammable Atmosphere", "Gas accumulation, vapor buildup"),
+        ("Engulfment", "Loose materials, flowing substances"),
+        ("Entrapment", "Narrow passages, equipment, structural elements")
+    ],
+    "Chemical": [
+        ("Chemical Burns", "Acids, bases, corrosive materials"),
+        ("Chemical Inhalation", "Vapors, gases, dusts, mists"),
+        ("Chemical Ingestion", "Contamination, poor hygiene"),
+        ("Chemical Injection", "High pressure, sharp objects"),
+        ("Allergic Reactions", "Sensitizers, allergens, irritants"),
+        ("Carcinogenic Exposure", "Known carcinogens, long-term exposure")
+    ],
+    "Fluid/Pressure": [
+        ("High Pressure", "Hydraulic systems, pneumatic systems, pressure vessels"),
+        ("Fluid Injection", "High pressure fluids, hydraulic systems"),
+        ("Pressure Vessel Failure", "Overpressure, corrosion, fatigue"),
+        ("Fluid Leaks", "Hydraulic oil, coolant, process fluids"),
+        ("Vacuum Hazards", "Vacuum systems, implosion, collapse")
+    ],
+    "Wastes (Lean)": [
+        ("Waste Accumulation", "Excess inventory, scrap, unused materials"),
+        ("Storage Issues", "Poor organization, space constraints"),
+        ("Disposal Hazards", "Waste handling, disposal processes"),
+        ("Recycling Hazards", "Sorting, processing, material handling")
+    ],
+    "Other": [
+        ("Weather Conditions", "Rain, snow, wind, extreme temperatures"),
+        ("Lighting Issues", "Poor lighting, glare, shadows"),
+        ("Housekeeping", "Poor organization, clutter, debris"),
+        ("Maintenance", "Equipment failure, repair activities"),
+        ("Training", "Inadequate training, skill gaps, inexperience")
+    ]
+}
+
+
+class HazardCatalog:
+    """Immutable, indexed view of the predefined hazards"""
+
+    __slots__ = ("categories", "_by_category", "_all", "_by_name", "_by_entry")
+
+    def __init__(self, data: Dict[str, List[Tuple[str, str]]]):
+        self.categories: Tuple[str, ...] = tuple(data)
+        self._by_category = MappingProxyType({
+            category: tuple((name, cause) for name, cause in hazards)
+            for category, hazards in data.items()
+        })
+        self._all: Tuple[Tuple[str, str], ...] = tuple(chain.from_iterable(self._by_category.values()))
+        by_name = {}
+        by_entry = {}
+        for category, hazards in self._by_category.items():
+            for name, cause in hazards:
+                # The first category listing a hazard wins, as in the category list order
+                by_name.setdefault(name, (category, cause))
+                by_entry.setdefault((name, cause), category)
+        self._by_name = MappingProxyType(by_name)
+        # (name, cause) -> category tells apart hazards listed under two categories
+        self._by_entry = MappingProxyType(by_entry)
+
+    def hazards_for(self, category: str) -> Tuple[Tuple[str, str], ...]:
+        """Return the (name, cause) tuples for a category, or for every category"""
+        if category == ALL_CATEGORIES:
+            return self._all
+        return self._by_category.get(category, ())
+
+    def all_hazards(self) -> Tuple[Tuple[str, str], ...]:
+        return self._all
+
+    def lookup(self, name: str) -> Optional[Tuple[str, str]]:
+        """Return (category, cause) for a predefined hazard name, or None"""
+        return self._by_name.get(name)
+
+    def category_of(self, name: str, cause: str = "") -> Optional[str]:
+        """Return the catalog category of a hazard, preferring an exact (name, cause) match"""
+        category = self._by_entry.get((name, cause))
+        if category is None:
+            entry = self._by_name.get(name)
+            category = entry[0] if entry else None
+        return category
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+
+HAZARD_CATALOG = HazardCatalog(_CATALOG_DATA)
+
+
+# Keyword fallback for free-text hazards that are not in the catalog, in
+# priority order: when several categories match, the earliest one wins.
+_CATEGORY_KEYWORDS = [
+    ("Mechanical", ["crushing", "cutting", "drawing", "pinch", "impact", "abrasion", "puncture"]),
+    ("Electrical/Electronic", ["electric", "arc", "static", "battery", "control"]),
+    ("Slips/Trips/Falls", ["slip", "trip", "fall"]),
+    ("Ergonomics/Human Factors", ["repetitive", "awkward", "lifting", "vibration", "strain"]),
+    ("Fire and Explosions", ["fire", "explosion", "thermal", "smoke"]),
+    ("Heat/Temperature", ["heat", "cold", "temperature", "frostbite"]),
+    ("Noise/Vibration", ["noise", "hearing", "tinnitus"]),
+    ("Ingress/Egress", ["ingress", "egress", "entrapment", "access"]),
+    ("Material Handling", ["handling", "storage", "transport", "packaging"]),
+    ("Environmental/Industrial Hygiene", ["dust", "fume", "vapor", "gas", "biological"]),
+    ("Ventilation/Confined Space", ["ventilation", "confined", "oxygen", "toxic", "flammable"]),
+    ("Chemical", ["chemical", "acid", "base", "corrosive", "allergic"]),
+    ("Fluid/Pressure", ["pressure", "fluid", "hydraulic", "pneumatic", "vacuum"]),
+    ("Wastes (Lean)", ["waste", "disposal", "recycling"]),
+]
+
+# Short keywords that are mostly found inside unrelated words ("carcinogenic",
+# "database", "Vegas", "strip"); they must start a word. The other keywords
+# match anywhere, so "Overheating" still finds "heat".
+_WORD_START_KEYWORDS = {"arc", "base", "gas", "trip"}
+
+
+def _keyword_pattern(word: str) -> str:
+    return (r"\b" if word in _WORD_START_KEYWORDS else "") + re.escape(word)
+
+
+# One alternation with a named group per category, inside a lookahead so
+# that every position is tried, even within another match.
+_KEYWORD_PATTERN = re.compile(
+    r"(?=" + "|".join(
+        f"(?P<c{i}>" + "|".join(map(_keyword_pattern, words)) + ")"
+        for i, (_, words) in enumerate(_CATEGORY_KEYWORDS)
+    ) + ")",
+    re.IGNORECASE
+)
+
+
+# Bounded: free-text hazard names come from the user
+@lru_cache(maxsize=4096)
+def categorize_hazard(name: str, cause: str = "") -> str:
+    """Return the hazard category for a hazard name (and optional cause).
+
+    Catalog hazards are looked up exactly; anything else goes through a single
+    keyword scan. Results are memoized per (name, cause).
+    """
+    category = HAZARD_CATALOG.category_of(name, cause)
+    if category is not None:
+        return category
+    best = None
+    for match in _KEYWORD_PATTERN.finditer(name):
+        priority = int(match.lastgroup[1:])
+        if best is None or priority < best:
+            best = priority
+            if best == 0:
+                break
+    return _CATEGORY_KEYWORDS[best][0] if best is not None else "Other"
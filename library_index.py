@@ -0,0 +1,209 @@
+"""
+Index of an assessment library folder.
+
+A library is a folder (searched recursively) of assessment files. For each
+file the index keeps a small summary - project_info, hazard counts and a
+histogram of risk levels - so the library browser can list hundreds of
+files without opening them. Summaries are cached on disk in LIBRARY_CACHE_DIR,
+keyed by path, mtime and size; only files whose key changed since the last
+scan are parsed again, and that happens in a process pool.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from assessment_io import load_assessment, write_json_atomic
+from assessment_store import AssessmentStore, is_store_path
+from risk_assessment import RISK_LEVELS, Assessment
+
+LIBRARY_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".risk_assessment", "library")
+LIBRARY_EXTENSIONS = (".json", ".json.gz", ".rjz", ".rdb")
+INDEX_VERSION = 1
+# Fewer changed files than this are parsed in-process; starting a pool costs more
+POOL_MIN_FILES = 4
+# How often a pool scan checks whether it was cancelled, in seconds
+CANCEL_POLL_SECONDS = 0.1
+
+_LAST_FOLDER_FILE = "last_folder.txt"
+
+
+@dataclass
+class LibraryEntry:
+    """Summary of one assessment file"""
+    path: str
+    mtime: float
+    size: int
+    project_info: Dict[str, Any] = field(default_factory=dict)
+    users: int = 0
+    tasks: int = 0
+    hazards: int = 0
+    risk_rows: int = 0
+    initial_risk: Dict[str, int] = field(default_factory=dict)
+    residual_risk: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None  # set when the file could not be read
+
+    @property
+    def stat_key(self) -> Tuple[float, int]:
+        return self.mtime, self.size
+
+
+def _stat_key(path: str) -> Tuple[float, int]:
+    stat = os.stat(path)
+    return stat.st_mtime, stat.st_size
+
+
+def _risk_histogram(levels: Iterable[str]) -> Dict[str, int]:
+    counts = Counter(levels)
+    return {level: counts.get(level, 0) for level in RISK_LEVELS}
+
+
+def summarize_assessment(path: str, mtime: float, size: int, assessment: Assessment) -> LibraryEntry:
+    tasks = [task for user in assessment.project.users for task in user.tasks]
+    return LibraryEntry(
+        path=path,
+        mtime=mtime,
+        size=size,
+        project_info=assessment.project_info,
+        users=len(assessment.project.users),
+        tasks=len(tasks),
+        hazards=sum(len(task.hazards) for task in tasks),
+        risk_rows=len(assessment.risk_rows),
+        initial_risk=_risk_histogram(row.initial_risk for row in assessment.risk_rows),
+        residual_risk=_risk_histogram(row.residual_risk for row in assessment.risk_rows)
+    )
+
+
+def summarize_file(path: str) -> LibraryEntry:
+    """Read one assessment file and summarize it; failures end up in entry.error"""
+    try:
+        mtime, size = _stat_key(path)
+    except OSError as e:
+        return LibraryEntry(path=path, mtime=0, size=0, error=str(e))
+    try:
+        if is_store_path(path):
+            with AssessmentStore(path, read_only=True) as store:
+                assessment = store.load()
+        else:
+            assessment = load_assessment(path)
+    except Exception as e:
+        return LibraryEntry(path=path, mtime=mtime, size=size, error=str(e) or type(e).__name__)
+    return summarize_assessment(path, mtime, size, assessment)
+
+
+def summarize_files(paths: List[str], workers: Optional[int] = None,
+                    cancel: Optional[threading.Event] = None) -> Iterator[LibraryEntry]:
+    """Summarize files in a process pool, yielding entries as they finish.
+
+    Setting cancel stops the scan: the files that have not started are
+    dropped within CANCEL_POLL_SECONDS, without waiting for the next entry.
+    """
+    if len(paths) < POOL_MIN_FILES:
+        for path in paths:
+            if cancel is not None and cancel.is_set():
+                return
+            yield summarize_file(path)
+        return
+    # Spawned rather than forked workers: the caller is usually a GUI with threads running
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        pending = {executor.submit(summarize_file, path) for path in paths}
+        while pending:
+            if cancel is not None and cancel.is_set():
+                return
+            done, pending = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        # Closing the generator early drops the files that have not started yet
+        # and waits for the ones being read
+        executor.shutdown(cancel_futures=True)
+
+
+def library_files(folder: str) -> Dict[str, Tuple[float, int]]:
+    """Assessment files under folder -> (mtime, size)"""
+    files = {}
+    for directory, dirnames, filenames in os.walk(folder):
+        dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+        for name in filenames:
+            if name.startswith('.') or not name.lower().endswith(LIBRARY_EXTENSIONS):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                files[path] = _stat_key(path)
+            except OSError:
+                pass  # removed while we were looking
+    return files
+
+
+class LibraryIndex:
+    """The cached summaries for one library folder"""
+
+    def __init__(self, folder: str, cache_dir: str = LIBRARY_CACHE_DIR):
+        self.folder = os.path.abspath(folder)
+        digest = hashlib.sha1(self.folder.encode('utf-8')).hexdigest()[:16]
+        self.cache_path = os.path.join(cache_dir, f"{digest}.json")
+        self.entries: Dict[str, LibraryEntry] = {}
+        self._load_cache()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION or data.get('folder') != self.folder:
+                return
+            self.entries = {entry['path']: LibraryEntry(**entry) for entry in data['entries']}
+        except (OSError, ValueError, TypeError, KeyError):
+            self.entries = {}  # a missing or damaged cache just means a full scan
+
+    def scan(self) -> List[str]:
+        """Check the folder against the cache.
+
+        Entries for files that are gone are dropped; returns the paths of new
+        or changed files, which still need update().
+        """
+        files = library_files(self.folder)
+        self.entries = {path: entry for path, entry in self.entries.items() if path in files}
+        return sorted(
+            path for path, key in files.items()
+            if path not in self.entries or self.entries[path].stat_key != key
+        )
+
+    def update(self, paths: List[str], workers: Optional[int] = None,
+               cancel: Optional[threading.Event] = None) -> Iterator[LibraryEntry]:
+        """Parse paths again, yielding each new entry as it is added; see summarize_files for cancel"""
+        for entry in summarize_files(paths, workers, cancel):
+            self.entries[entry.path] = entry
+            yield entry
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        write_json_atomic(self.cache_path, {
+            'version': INDEX_VERSION,
+            'folder': self.folder,
+            'entries': [asdict(entry) for entry in self.entries.values()]
+        })
+
+
+def last_library_folder(cache_dir: str = LIBRARY_CACHE_DIR) -> Optional[str]:
+    try:
+        with open(os.path.join(cache_dir, _LAST_FOLDER_FILE), 'r', encoding='utf-8') as f:
+            folder = f.read().strip()
+    except OSError:
+        return None
+    return folder if os.path.isdir(folder) else None
+
+
+def remember_library_folder(folder: str, cache_dir: str = LIBRARY_CACHE_DIR):
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, _LAST_FOLDER_FILE), 'w', encoding='utf-8') as f:
+            f.write(folder)
+    except OSError:
+        pass
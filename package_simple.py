@@ -30,7 +30,7 @@ def create_portable_package():
     print("Created package directory structure")
     
     # Copy application files
-    app_files = ["gui.py", "risk_assessment.py"]
+    app_files = ["gui.py", "risk_assessment.py", "risk_models.py", "hazard_catalog.py", "assessment_io.py", "assessment_store.py", "autosave.py", "library_index.py", "theme.py", "report_engine.py", "report_resources.py"]
     for file in app_files:
         if os.path.exists(file):
             shutil.copy2(file, os.path.join(package_dir, "app"))
@@ -0,0 +1,481 @@
+"""
+PDF report of an assessment.
+
+The report is built from an Assessment (see risk_assessment) rather than
+from the GUI's tables, so it needs no Qt and can run on a machine without a
+display. The GUI's "Generate PDF Report" button calls write_report; from the
+command line:
+
+    python -m report_engine assessment.json [-o report.pdf]
+    python -m report_engine library/ "audits/*.rjz" --workers 8 [--output-dir pdfs/]
+
+Directories are searched recursively for assessment files. Several files are
+rendered in a process pool, and a file whose PDF is already newer than it is
+skipped unless --force is given.
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.units import inch
+from reportlab.platypus import Flowable, PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table
+
+from assessment_io import load_assessment, replacement_mode
+from assessment_store import AssessmentStore, is_store_path
+from library_index import LIBRARY_EXTENSIONS, library_files
+from report_resources import ReportStyles, data_table_style, header_row, metadata_table_style, report_styles, row_height
+from risk_assessment import Assessment
+
+RISK_HEADERS = [
+    "Item Id", "User / Task", "Hazard / Failure Mode",
+    "Initial Assessment - Severity", "Initial Assessment - Probability", "Initial Assessment - Risk Level",
+    "Risk Reduction Methods / Control System",
+    "Final Assessment - Severity", "Final Assessment - Probability", "Final Assessment - Risk Level",
+    "Status / Responsible / Comments / Reference"
+]
+RISK_COL_WIDTHS = [0.4*inch, 1.0*inch, 1.6*inch, 0.6*inch, 0.6*inch, 0.6*inch,
+                   1.8*inch, 0.6*inch, 0.6*inch, 0.6*inch, 0.9*inch]
+
+CONTROL_HEADERS = [
+    "Safety Function", "Associated Hazard", "Initial Risk", "Final Risk",
+    "Required Category", "Actual Category", "Control Type", "Verification"
+]
+CONTROL_COL_WIDTHS = [1.3*inch, 1.8*inch, 0.7*inch, 0.7*inch, 0.9*inch, 0.9*inch, 1.1*inch, 1.6*inch]
+
+ALTERNATIVE_METHOD_HEADERS = [
+    "Task", "Associated Hazard", "Risk Assessment Complete", "Justification", "Procedure",
+    "Engineering Controls", "Training Requirements", "Verification Steps", "Approvals"
+]
+ALTERNATIVE_METHOD_COL_WIDTHS = [0.8*inch, 1.8*inch, 0.8*inch, 1.2*inch, 1.2*inch,
+                                 1.2*inch, 1.2*inch, 1.2*inch, 0.8*inch]
+
+# A report takes long enough to render that a pool pays off from two files on
+POOL_MIN_FILES = 2
+# Limit of a LayoutCache, about 100 MB of paragraphs: a report of 2000 risk
+# rows with a control system and alternative method row for each
+ROW_CACHE_SIZE = 6000
+
+
+class WrappedParagraph(Paragraph):
+    """A Paragraph that keeps its line breaks for the width it was last wrapped to.
+
+    A Table wraps its cells again when it draws them, after PagedTable has
+    already wrapped them to measure the row; this one breaks its lines once.
+    """
+
+    _wrapped = None  # (availWidth, (width, height))
+
+    def wrap(self, availWidth, availHeight):
+        if self._wrapped is None or self._wrapped[0] != availWidth:
+            self._wrapped = (availWidth, super().wrap(availWidth, availHeight))
+        return self._wrapped[1]
+
+
+class LayoutCache:
+    """Wrapped cell paragraphs of the data table rows of the last report.
+
+    Rows are keyed by their text and column widths, so a report written again
+    after an edit builds and wraps only the rows that changed; the rest are
+    drawn from the paragraphs already broken into lines. Only the rows of the
+    latest report (up to max_rows) are kept. Everything goes through
+    reportlab's public Paragraph and Table API.
+    """
+
+    def __init__(self, max_rows: int = ROW_CACHE_SIZE):
+        self.max_rows = max_rows
+        self._rows: Dict[Tuple, List[WrappedParagraph]] = {}
+        self._previous: Dict[Tuple, List[WrappedParagraph]] = {}
+
+    @contextmanager
+    def report(self):
+        """Render one report; rows it does not use are dropped when it is done"""
+        self._previous, self._rows = self._rows, {}
+        try:
+            yield self
+        finally:
+            self._previous = {}
+
+    def row(self, key: Tuple) -> Optional[List[WrappedParagraph]]:
+        cells = self._rows.get(key)
+        if cells is None:
+            cells = self._previous.pop(key, None)
+            if cells is not None:
+                self.set_row(key, cells)
+        return cells
+
+    def set_row(self, key: Tuple, cells: List[WrappedParagraph]):
+        if len(self._rows) < self.max_rows:
+            self._rows[key] = cells
+
+
+class TablePage(Flowable):
+    """One page of a PagedTable: the header row and a run of measured rows"""
+
+    def __init__(self, table: "PagedTable", heights: List[float], cells: List[List[Paragraph]]):
+        super().__init__()
+        self.hAlign = 'CENTER'
+        self.table = table
+        self.heights = heights
+        self.cells = cells
+
+    def wrap(self, availWidth, availHeight):
+        self.width = sum(self.table.col_widths)
+        self.height = self.table.header_height + sum(self.heights)
+        return self.width, self.height
+
+    def draw(self):
+        table = Table([self.table.header] + self.cells, colWidths=self.table.col_widths,
+                      rowHeights=[self.table.header_height] + self.heights, repeatRows=1)
+        table.setStyle(data_table_style())
+        table.wrapOn(self.canv, self.width, self.height)
+        table.drawOn(self.canv, 0, 0)
+
+
+class PagedTable(Flowable):
+    """A data table laid out one page at a time.
+
+    A reportlab Table measures its remaining rows again each time it splits
+    across a page, which makes tables of thousands of rows superlinear, and
+    it keeps a wrapped Paragraph for every cell until the end. This builds
+    and measures the cell paragraphs of a page's rows as the page is filled,
+    hands the frame a TablePage of just those rows (with the header row
+    repeated) and leaves a PagedTable for the rest, so each page costs only
+    its own rows and only about a page of paragraphs is alive at a time.
+    Rows found in the cache are used as they are.
+    """
+
+    def __init__(self, headers, rows, col_widths, styles, cache=None, start=0):
+        super().__init__()
+        self.hAlign = 'CENTER'  # where Table puts itself
+        self.headers = headers
+        self.rows = rows
+        self.col_widths = col_widths
+        self.styles = styles
+        self.cache = cache
+        self.start = start
+        self.key = (tuple(headers), tuple(col_widths))
+        self.header, self.header_height = header_row(*self.key)
+        self.cells = []  # paragraphs of the measured rows, from rows[start] on
+        self.heights = []
+
+    def measure(self, availHeight):
+        """Measure rows until they overflow availHeight or run out; returns their height"""
+        height = self.header_height + sum(self.heights)
+        while height <= availHeight and self.start + len(self.cells) < len(self.rows):
+            text = self.rows[self.start + len(self.cells)]
+            key = (self.key[1], text)
+            row = self.cache.row(key) if self.cache is not None else None
+            if row is None:
+                row = [WrappedParagraph(cell, self.styles.cell) for cell in text]
+                if self.cache is not None:
+                    self.cache.set_row(key, row)
+            measured = row_height(row, self.col_widths)
+            self.cells.append(row)
+            self.heights.append(measured)
+            height += measured
+        return height
+
+    def page(self, count: int) -> TablePage:
+        """A page of the header and the first count measured rows"""
+        return TablePage(self, self.heights[:count], self.cells[:count])
+    def wrap(self, availWidth, availHeight):
+        # Only as many rows are measured as it takes to overflow the frame; that is enough for it to split us
+        self.width = sum(self.col_widths)
+        self.height = self.measure(availHeight)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        self.measure(availHeight)
+        count, height = 0, self.header_height
+        while count < len(self.heights) and height + self.heights[count] <= availHeight:
+            height += self.heights[count]
+            count += 1
+        if count == 0:
+            return []  # not even one row fits; try the next frame
+        page = self.page(count)
+        if self.start + count == len(self.rows):
+            return [page]
+        rest = PagedTable(self.headers, self.rows, self.col_widths, self.styles, self.cache, self.start + count)
+        rest.cells = self.cells[count:]  # measured past the end of this page
+        rest.heights = self.heights[count:]
+        return [page, rest]
+
+    def draw(self):
+        page = self.page(len(self.cells))
+        page.wrapOn(self.canv, self.width, self.height)
+        page.drawOn(self.canv, 0, 0)
+
+
+def data_table(headers: List[str], rows: List[List[str]], col_widths: List[float], styles: ReportStyles,
+               cache: Optional[LayoutCache] = None) -> PagedTable:
+    """A table of wrapped text with a header row repeated on every page"""
+    return PagedTable(headers, [tuple(row) for row in rows], col_widths, styles, cache)
+
+
+def metadata_rows(project_info: dict, date: str) -> List[List[str]]:
+    return [
+        ["Application:", project_info.get('name', 'N/A')],
+        ["Description:", project_info.get('description', 'N/A')],
+        ["Product Identifier:", project_info.get('machine_id', 'N/A')],
+        ["Assessment Type:", "Detailed"],
+        ["Limits:", "Risk assessment analysis"],
+        ["Sources:", "Personnel experiences, ANSI B11 standards, machine documentation"],
+        ["Risk Scoring System:", "ANSI B11.0 (TR3) Two Factor"],
+        ["Guide Sentence:", "When doing [task], the [user] could be injured by the [hazard] due to the [failure mode]."],
+        ["Analyst Name(s):", "Risk Assessment Team"],
+        ["Company:", project_info.get('company', 'N/A')],
+        ["Facility Location:", project_info.get('facility', 'N/A')],
+        ["Date:", date]
+    ]
+
+
+def risk_rows_text(assessment: Assessment) -> List[List[str]]:
+    """The risk rows as the report's 11 columns"""
+    rows = []
+    for row, risk_row in enumerate(assessment.risk_rows):
+        (item_id, user_role, task, hazard_category, hazard, cause,
+         init_sev, init_prob, init_risk, measures,
+         final_sev, final_prob, final_risk) = risk_row.values(row + 1)
+        user_task = f"{user_role} {task}" if user_role and task else f"{user_role}{task}"
+        hazard_failure = f"{hazard_category}: {hazard} {cause}".strip()
+        # Status (placeholder - could be enhanced with actual status tracking)
+        status = "In Progress"
+        rows.append([item_id, user_task, hazard_failure, init_sev, init_prob, init_risk,
+                     measures, final_sev, final_prob, final_risk, status])
+    return rows
+
+
+def build_story(assessment: Assessment, date: Optional[str] = None,
+                cache: Optional[LayoutCache] = None) -> List[Any]:
+    """The flowables of the report, in page order"""
+    styles = report_styles()
+    date = date or datetime.now().strftime("%m/%d/%Y")
+    story = [Paragraph("Risk Assessment Report", styles.title), Spacer(1, 15)]
+
+    story.append(Paragraph("Report Information", styles.heading))
+    metadata_table = Table(metadata_rows(assessment.project_info or {}, date), colWidths=[2*inch, 6*inch])
+    metadata_table.setStyle(metadata_table_style())
+    story.append(metadata_table)
+    story.append(Spacer(1, 15))
+
+    story.append(Paragraph("Risk Assessment Details", styles.heading))
+    if assessment.risk_rows:
+        story.append(data_table(RISK_HEADERS, risk_rows_text(assessment), RISK_COL_WIDTHS, styles, cache))
+    else:
+        story.append(Paragraph("No risk assessment data available", styles.normal))
+    story.append(PageBreak())
+
+    story.append(Paragraph("Control System Assessment", styles.heading))
+    if assessment.control_systems:
+        rows = [list(astuple(row)) for row in assessment.control_systems]
+        story.append(data_table(CONTROL_HEADERS, rows, CONTROL_COL_WIDTHS, styles, cache))
+    else:
+        story.append(Paragraph("No control system data available", styles.normal))
+    story.append(PageBreak())
+
+    story.append(Paragraph("Alternative Methods Assessment", styles.heading))
+    if assessment.alternative_methods:
+        rows = [list(astuple(row)) for row in assessment.alternative_methods]
+        story.append(data_table(ALTERNATIVE_METHOD_HEADERS, rows, ALTERNATIVE_METHOD_COL_WIDTHS, styles, cache))
+    else:
+        story.append(Paragraph("No alternative methods data available", styles.normal))
+    return story
+
+
+def write_report(assessment: Assessment, file_path: str, date: Optional[str] = None,
+                 cache: Optional[LayoutCache] = None):
+    """Write the PDF report of assessment to file_path.
+
+    Table rows already in cache are not built or wrapped again, and the cache
+    is left holding the rows of this report; cache=None lays out everything.
+    """
+    doc = SimpleDocTemplate(file_path, pagesize=landscape(letter),
+                            rightMargin=0.3*inch, leftMargin=0.3*inch,
+                            topMargin=0.3*inch, bottomMargin=0.3*inch)
+    if cache is None:
+        doc.build(build_story(assessment, date))
+        return
+    with cache.report():
+        doc.build(build_story(assessment, date, cache))
+
+
+def read_assessment(file_path: str) -> Assessment:
+    """Load an assessment file of any supported kind, including .rdb stores"""
+    if is_store_path(file_path):
+        with AssessmentStore(file_path, read_only=True) as store:
+            return store.load()
+    return load_assessment(file_path)
+
+
+def report_path(file_path: str) -> str:
+    """Default PDF name for an assessment file: its name with the assessment extension replaced.
+
+    Only the known extensions are stripped, so Press_v1.2.json becomes
+    Press_v1.2.pdf and an unknown extension is kept (notes.txt -> notes.txt.pdf).
+    """
+    directory, name = os.path.split(file_path)
+    for extension in sorted(LIBRARY_EXTENSIONS, key=len, reverse=True):
+        if name.lower().endswith(extension) and len(name) > len(extension):
+            name = name[:-len(extension)]
+            break
+    return os.path.join(directory, f"{name}.pdf")
+
+
+def render_file(input_path: str, output_path: Optional[str] = None,
+                cache: Optional[LayoutCache] = None) -> str:
+    """Render one assessment file to PDF; returns the PDF's path"""
+    output_path = output_path or report_path(input_path)
+    assessment = read_assessment(input_path)
+    # Rendered next to the PDF and renamed over it, so an interrupted render
+    # cannot leave a truncated PDF that is newer than its assessment
+    mode = replacement_mode(output_path)
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".pdf.tmp", dir=os.path.dirname(os.path.abspath(output_path)))
+    os.close(fd)
+    try:
+        write_report(assessment, tmp_path, cache=cache)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return output_path
+
+
+@dataclass
+class RenderResult:
+    """Outcome of rendering one file in a batch"""
+    input_path: str
+    output_path: str
+    seconds: float = 0.0
+    skipped: bool = False  # the PDF was already newer than the assessment
+    error: Optional[str] = None
+
+
+def render_job(input_path: str, output_path: str) -> RenderResult:
+    """Render one file, catching the failure so the rest of a batch carries on"""
+    start = time.perf_counter()
+    try:
+        render_file(input_path, output_path)  # the files of a batch share no rows to speak of, so no cache
+    except Exception as e:
+        return RenderResult(input_path, output_path, time.perf_counter() - start, error=str(e) or type(e).__name__)
+    return RenderResult(input_path, output_path, time.perf_counter() - start)
+
+
+def batch_inputs(patterns: List[str]) -> List[str]:
+    """Assessment files named by paths, directories (searched recursively) and glob patterns"""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(library_files(pattern)))
+        elif glob.has_magic(pattern):
+            paths.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            paths.append(pattern)  # a missing file is reported as a failure
+    return list(dict.fromkeys(paths))
+
+
+def is_up_to_date(input_path: str, output_path: str) -> bool:
+    try:
+        return os.path.getmtime(output_path) > os.path.getmtime(input_path)
+    except OSError:
+        return False
+
+
+def render_batch(jobs: List[Tuple[str, str]], workers: Optional[int] = None,
+                 force: bool = False) -> Iterator[RenderResult]:
+    """Render (input, output) pairs in a process pool, yielding results as they finish"""
+    pending = []
+    for input_path, output_path in jobs:
+        if not force and is_up_to_date(input_path, output_path):
+            yield RenderResult(input_path, output_path, skipped=True)
+        else:
+            pending.append((input_path, output_path))
+    if len(pending) < POOL_MIN_FILES or workers == 1:
+        for input_path, output_path in pending:
+            yield render_job(input_path, output_path)
+        return
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        futures = [executor.submit(render_job, input_path, output_path) for input_path, output_path in pending]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m report_engine",
+                                     description="Render the PDF reports of assessment files.")
+    parser.add_argument("inputs", nargs="+", metavar="assessment",
+                        help="assessment file (.json, .json.gz, .rjz or .rdb), directory or glob pattern")
+    parser.add_argument("-o", "--output", help="PDF to write when rendering a single file")
+    parser.add_argument("--output-dir", help="write the PDFs here (default: next to each assessment)")
+    parser.add_argument("-j", "--workers", type=positive_int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="render even when the PDF is newer than the assessment")
+    args = parser.parse_args(argv)
+
+    inputs = batch_inputs(args.inputs)
+    if args.output and len(inputs) != 1:
+        parser.error("--output needs exactly one assessment file")
+    # Subfolders are kept under --output-dir, so equal names in different folders don't collide
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in inputs]) if inputs else ""
+
+    def output_for(input_path):
+        if args.output:
+            return args.output
+        if args.output_dir:
+            relative = os.path.relpath(report_path(os.path.abspath(input_path)), root)
+            return os.path.join(args.output_dir, relative)
+        return report_path(input_path)
+
+    jobs = [(path, output_for(path)) for path in inputs]
+    sources = {}
+    for input_path, output_path in jobs:
+        sources.setdefault(os.path.normcase(os.path.abspath(output_path)), []).append(input_path)
+    clashes = [paths for paths in sources.values() if len(paths) > 1]
+    if clashes:
+        parser.error("these assessments would write the same PDF: "
+                     + "; ".join(", ".join(paths) for paths in clashes))
+    if args.output_dir:
+        for _input_path, output_path in jobs:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    start = time.perf_counter()
+    rendered = skipped = failed = 0
+    for result in render_batch(jobs, args.workers, args.force):
+        if result.error:
+            failed += 1
+            print(f"FAILED  {result.input_path}: {result.error}", file=sys.stderr)
+        elif result.skipped:
+            skipped += 1
+            print(f"skipped {result.input_path} (up to date)")
+        else:
+            rendered += 1
+            print(f"{result.seconds:6.2f}s {result.input_path} -> {result.output_path}")
+    print(f"{rendered} rendered, {skipped} up to date, {failed} failed in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Reportlab resources shared by every PDF report.
+
+The paragraph styles, table styles and the header rows of the data tables
+do not depend on the assessment, so each is built on first use and kept for
+the life of the process. Batch renders and repeated renders from the GUI
+then only pay for the flowables made from the assessment's data.
+
+Everything returned here is shared between reports and must not be changed.
+The header cells can be shared because a Table wraps its cells again each
+time it is laid out. Paragraphs placed directly in the story (titles,
+headings) are not cached: the doc template marks a flowable it had to move
+to the next frame, and the mark would carry over into the next report.
+"""
+
+from functools import lru_cache
+from typing import List, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import Paragraph, TableStyle
+
+# Cell padding of the data tables, in points; row_height measures rows with it
+CELL_PADDING_X = 4
+CELL_PADDING_Y = 6
+
+
+class ReportStyles:
+    """The paragraph styles used by the report"""
+
+    def __init__(self):
+        styles = getSampleStyleSheet()
+        self.title = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=16,
+            spaceAfter=20,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        )
+        self.heading = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=12,
+            spaceAfter=10,
+            spaceBefore=15,
+            fontName='Helvetica-Bold'
+        )
+        self.normal = ParagraphStyle(
+            'CustomNormal',
+            parent=styles['Normal'],
+            fontSize=9,
+            spaceAfter=4,
+            fontName='Helvetica'
+        )
+        self.cell = ParagraphStyle(
+            'CellStyle',
+            parent=styles['Normal'],
+            fontSize=8,
+            spaceAfter=2,
+            spaceBefore=2,
+            fontName='Helvetica',
+            alignment=TA_LEFT,
+            wordWrap='CJK'  # Enable word wrapping
+        )
+        self.header = ParagraphStyle(
+            'HeaderStyle',
+            parent=styles['Normal'],
+            fontSize=8,
+            spaceAfter=2,
+            spaceBefore=2,
+            fontName='Helvetica-Bold',
+            alignment=TA_CENTER,
+            wordWrap='CJK'
+        )
+
+
+@lru_cache(maxsize=None)
+def report_styles() -> ReportStyles:
+    return ReportStyles()
+
+
+@lru_cache(maxsize=None)
+def metadata_table_style() -> TableStyle:
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.grey),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('BACKGROUND', (1, 0), (1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('WORDWRAP', (0, 0), (-1, -1), True)
+    ])
+
+
+@lru_cache(maxsize=None)
+def data_table_style() -> TableStyle:
+    """Grey header row, grid and alternating row backgrounds"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('LEFTPADDING', (0, 0), (-1, -1), CELL_PADDING_X),
+        ('RIGHTPADDING', (0, 0), (-1, -1), CELL_PADDING_X),
+        ('TOPPADDING', (0, 0), (-1, -1), CELL_PADDING_Y),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), CELL_PADDING_Y),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+    ])
+
+
+def row_height(cells: List[Paragraph], col_widths: List[float]) -> float:
+    """Height of a data table row of paragraphs, as Table would lay it out"""
+    text_height = max(cell.wrap(width - 2*CELL_PADDING_X, 72000)[1] for cell, width in zip(cells, col_widths))
+    return text_height + 2*CELL_PADDING_Y
+
+
+@lru_cache(maxsize=None)
+def header_row(headers: Tuple[str, ...], col_widths: Tuple[float, ...]) -> Tuple[List[Paragraph], float]:
+    """The header cells of a data table and the height of that row"""
+    cells = [Paragraph(text, report_styles().header) for text in headers]
+    return cells, row_height(cells, list(col_widths))
+
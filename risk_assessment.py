@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 class Severity(Enum):
     LOW = auto()
@@ -36,6 +36,108 @@ def calculate_risk_level(severity: Severity, likelihood: Likelihood) -> str:
     else:
         return "Medium"
 
+# Two-factor matrix used by the assessment GUI (ANSI B11.0 TR3 style)
+SEVERITY_LEVELS = ["Catastrophic", "Serious", "Moderate", "Minor"]
+PROBABILITY_LEVELS = ["Very Likely", "Likely", "Unlikely", "Remote"]
+RISK_LEVELS = ["High", "Medium", "Low"]
+RISK_MATRIX = [
+    ["High", "High", "High", "Medium"],
+    ["High", "High", "Medium", "Low"],
+    ["High", "Medium", "Low", "Low"],
+    ["Medium", "Low", "Low", "Low"]
+]
+_SEVERITY_INDEX = {name: i for i, name in enumerate(SEVERITY_LEVELS)}
+_PROBABILITY_INDEX = {name: i for i, name in enumerate(PROBABILITY_LEVELS)}
+
+def matrix_risk_level(severity: str, probability: str) -> str:
+    """Look up the risk level for a severity/probability pair in the risk matrix.
+
+    Unknown values fall back to "Serious"/"Likely", matching the GUI's behaviour.
+    """
+    return RISK_MATRIX[_SEVERITY_INDEX.get(severity, 1)][_PROBABILITY_INDEX.get(probability, 1)]
+
+def split_hazard_text(hazard_text: str):
+    """Split a "Hazard - Cause" tree entry into its (hazard, cause) parts"""
+    if " - " in hazard_text:
+        hazard, cause = hazard_text.split(" - ", 1)
+        return hazard, cause
+    return hazard_text, ""
+
+def join_hazard_text(hazard: str, cause: str) -> str:
+    """Inverse of split_hazard_text"""
+    return f"{hazard} - {cause}" if cause else hazard
+
+RISK_TABLE_COLUMNS = [
+    "Item ID", "User/Role", "Task", "Hazard Category", "Hazard", "Cause/Failure Mode",
+    "Initial Severity", "Initial Probability", "Initial Risk Level",
+    "Risk Reduction Measures", "Residual Severity", "Residual Probability", "Residual Risk Level"
+]
+
+@dataclass
+class RiskRow:
+    """One row of the "Assess and Reduce Risk" table"""
+    user: str
+    task: str
+    category: str
+    hazard: str
+    cause: str = ""
+    initial_severity: str = SEVERITY_LEVELS[0]
+    initial_probability: str = PROBABILITY_LEVELS[0]
+    measures: str = ""
+    residual_severity: str = SEVERITY_LEVELS[0]
+    residual_probability: str = PROBABILITY_LEVELS[0]
+
+    @property
+    def key(self):
+        """(user, task, hazard text) identifying the tree hazard this row assesses"""
+        return (self.user, self.task, join_hazard_text(self.hazard, self.cause))
+
+    @property
+    def initial_risk(self) -> str:
+        return matrix_risk_level(self.initial_severity, self.initial_probability)
+
+    @property
+    def residual_risk(self) -> str:
+        return matrix_risk_level(self.residual_severity, self.residual_probability)
+
+    def values(self, item_id) -> List[str]:
+        """Return the row as the 13 display strings of RISK_TABLE_COLUMNS"""
+        return [
+            str(item_id), self.user, self.task, self.category, self.hazard, self.cause,
+            self.initial_severity, self.initial_probability, self.initial_risk,
+            self.measures, self.residual_severity, self.residual_probability, self.residual_risk
+        ]
+
+# Choices offered by the control system and alternative method tables
+CONTROL_CATEGORIES = ["Category 1", "Category 2", "Category 3", "Category 4"]
+CONTROL_TYPES = ["Interlock", "Light Curtain", "Emergency Stop", "Pressure Sensitive Mat", "Two-Hand Control", "Custom"]
+ASSESSMENT_COMPLETE_OPTIONS = ["Yes", "No", "In Progress"]
+
+@dataclass
+class ControlSystemRow:
+    """One row of the "Control System Assessment" table"""
+    safety_function: str = ""
+    hazard: str = ""
+    initial_risk: str = ""
+    final_risk: str = ""
+    required_category: str = CONTROL_CATEGORIES[0]
+    actual_category: str = CONTROL_CATEGORIES[0]
+    control_type: str = CONTROL_TYPES[0]
+    verification: str = ""
+
+@dataclass
+class AlternativeMethodRow:
+    """One row of the "Alternative Method" table"""
+    task: str = ""
+    hazard: str = ""
+    risk_assessment_complete: str = ASSESSMENT_COMPLETE_OPTIONS[0]
+    justification: str = ""
+    procedure: str = ""
+    engineering_controls: str = ""
+    training_requirements: str = ""
+    verification_steps: str = ""
+    approvals: str = ""
+
 @dataclass
 class AlternativeMethodPlan:
     justification: str = ""
@@ -48,9 +150,9 @@ class AlternativeMethodPlan:
 @dataclass
 class Hazard:
     description: str
-    energy_type: EnergyType
-    severity: Severity
-    likelihood: Likelihood
+    energy_type: EnergyType = EnergyType.OTHER
+    severity: Severity = Severity.MEDIUM
+    likelihood: Likelihood = Likelihood.OCCASIONAL
     initial_risk_level: Optional[str] = None
     controls: List[str] = field(default_factory=list)
     residual_risk_level: Optional[str] = None
@@ -66,6 +168,14 @@ class Hazard:
         self.controls = controls
         self.residual_risk_level = calculate_risk_level(new_severity, new_likelihood)
 
+    @property
+    def name(self) -> str:
+        return split_hazard_text(self.description)[0]
+
+    @property
+    def cause(self) -> str:
+        return split_hazard_text(self.description)[1]
+
 @dataclass
 class Task:
     name: str
@@ -81,15 +191,45 @@ class Task:
         self.is_alternative_method = True
         self.alt_method_plan = plan
 
+@dataclass
+class User:
+    """A user/role and the tasks they perform"""
+    name: str
+    tasks: List[Task] = field(default_factory=list)
+
+    def add_task(self, task: Task):
+        self.tasks.append(task)
+
 @dataclass
 class Project:
     name: str
     description: str = ""
     tasks: List[Task] = field(default_factory=list)
+    users: List[User] = field(default_factory=list)
 
     def add_task(self, task: Task):
         self.tasks.append(task)
 
+    def add_user(self, user: User):
+        self.users.append(user)
+
+    def iter_hazards(self):
+        """Yield (user, task, hazard) for every hazard in user -> task -> hazard order"""
+        for user in self.users:
+            for task in user.tasks:
+                for hazard in task.hazards:
+                    yield user, task, hazard
+
+@dataclass
+class Assessment:
+    """Everything stored in an assessment file"""
+    project_info: Dict[str, Any] = field(default_factory=dict)
+    project: Project = field(default_factory=lambda: Project(name=""))
+    risk_rows: List[RiskRow] = field(default_factory=list)
+    control_systems: List[ControlSystemRow] = field(default_factory=list)
+    alternative_methods: List[AlternativeMethodRow] = field(default_factory=list)
+    risk_reduction_text: str = ""
+
 def generate_report(project: Project) -> str:
     lines = []
     lines.append(f"# Risk Assessment Report\n")
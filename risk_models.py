@@ -0,0 +1,789 @@
+from collections import Counter
+from contextlib import contextmanager
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QAbstractItemModel, QAbstractListModel, QModelIndex, QTimer, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtWidgets import QStyledItemDelegate, QComboBox, QHeaderView
+
+from risk_assessment import RISK_TABLE_COLUMNS, Project, User, Task, Hazard
+
+# Risk table column indices
+COL_ITEM_ID = 0
+COL_USER = 1
+COL_TASK = 2
+COL_CATEGORY = 3
+COL_HAZARD = 4
+COL_CAUSE = 5
+COL_INITIAL_SEVERITY = 6
+COL_INITIAL_PROBABILITY = 7
+COL_INITIAL_RISK = 8
+COL_MEASURES = 9
+COL_RESIDUAL_SEVERITY = 10
+COL_RESIDUAL_PROBABILITY = 11
+COL_RESIDUAL_RISK = 12
+
+# Editable columns and the RiskRow attribute behind each one
+RISK_ROW_FIELDS = {
+    COL_USER: "user",
+    COL_TASK: "task",
+    COL_CATEGORY: "category",
+    COL_HAZARD: "hazard",
+    COL_CAUSE: "cause",
+    COL_INITIAL_SEVERITY: "initial_severity",
+    COL_INITIAL_PROBABILITY: "initial_probability",
+    COL_MEASURES: "measures",
+    COL_RESIDUAL_SEVERITY: "residual_severity",
+    COL_RESIDUAL_PROBABILITY: "residual_probability",
+}
+
+# Calculated risk column that depends on each severity/probability column
+_DEPENDENT_RISK_COLUMN = {
+    COL_INITIAL_SEVERITY: COL_INITIAL_RISK,
+    COL_INITIAL_PROBABILITY: COL_INITIAL_RISK,
+    COL_RESIDUAL_SEVERITY: COL_RESIDUAL_RISK,
+    COL_RESIDUAL_PROBABILITY: COL_RESIDUAL_RISK,
+}
+
+# Shared brushes for the colour-coded risk levels (background, foreground)
+RISK_LEVEL_BRUSHES = {
+    "High": (QBrush(QColor(Qt.red)), QBrush(QColor(Qt.white))),
+    "Medium": (QBrush(QColor(Qt.yellow)), None),
+    "Low": (QBrush(QColor(Qt.green)), QBrush(QColor(Qt.white))),
+}
+
+
+@contextmanager
+def bulk_update(view):
+    """Hold off repaints, signals and header relayouts while a table changes in bulk.
+
+    The view's own signals are blocked, not its model's, so other views and
+    the autosave journal still see every row. Stretch and ResizeToContents
+    columns are switched to Fixed for the duration, so the header is laid out
+    once at the end instead of after every inserted row.
+
+    Not for tables of cell widgets: Qt gets slower at adding each child
+    widget to a parent with updates disabled the more children it already
+    has (5,000 combo rows took 45 s instead of 1 s).
+    """
+    header = view.horizontalHeader()
+    modes = [header.sectionResizeMode(section) for section in range(header.count())]
+    updates_enabled = view.updatesEnabled()
+    view.setUpdatesEnabled(False)
+    was_blocked = view.blockSignals(True)
+    header.setSectionResizeMode(QHeaderView.Fixed)
+    try:
+        yield view
+    finally:
+        if len(set(modes)) == 1:
+            header.setSectionResizeMode(modes[0])
+        else:
+            for section, mode in enumerate(modes):
+                header.setSectionResizeMode(section, mode)
+        view.blockSignals(was_blocked)
+        view.setUpdatesEnabled(updates_enabled)
+
+
+class RiskTableModel(QAbstractTableModel):
+    """Table model holding the 13 risk assessment columns as RiskRow objects.
+
+    Only the cells a view actually paints are ever queried, so the cost of a
+    refresh no longer depends on creating widgets for every row.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        # Tree key of each row, numbered so duplicate hazards in a task stay distinct
+        self._keys = []
+        # Occurrence counts behind _keys, kept while rows are only appended
+        self._key_counts = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(RISK_TABLE_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return RISK_TABLE_COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        col = index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if col == COL_ITEM_ID:
+                return str(index.row() + 1)
+            if col == COL_INITIAL_RISK:
+                return row.initial_risk
+            if col == COL_RESIDUAL_RISK:
+                return row.residual_risk
+            return getattr(row, RISK_ROW_FIELDS[col])
+        if role in (Qt.BackgroundRole, Qt.ForegroundRole):
+            if col == COL_INITIAL_RISK:
+                brushes = RISK_LEVEL_BRUSHES.get(row.initial_risk)
+            elif col == COL_RESIDUAL_RISK:
+                brushes = RISK_LEVEL_BRUSHES.get(row.residual_risk)
+            else:
+                return None
+            if brushes is None:
+                return None
+            return brushes[0] if role == Qt.BackgroundRole else brushes[1]
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() in RISK_ROW_FIELDS:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        field_name = RISK_ROW_FIELDS.get(index.column())
+        if field_name is None:
+            return False
+        row = self._rows[index.row()]
+        if getattr(row, field_name) == value:
+            return True
+        setattr(row, field_name, value)
+        self.dataChanged.emit(index, index)
+        risk_col = _DEPENDENT_RISK_COLUMN.get(index.column())
+        if risk_col is not None:
+            risk_index = self.index(index.row(), risk_col)
+            self.dataChanged.emit(risk_index, risk_index)
+        return True
+
+    def rows(self):
+        """Return the RiskRow objects in table order"""
+        return self._rows
+
+    def row_at(self, row):
+        return self._rows[row]
+
+    def set_rows(self, rows):
+        """Replace the whole table in a single model reset"""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._key_counts = {}
+        self._keys = _number_keys([row.key for row in self._rows], self._key_counts)
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        """Add rows to the end of the table, e.g. while a file is still loading"""
+        if not rows:
+            return
+        if self._key_counts is None:
+            self._key_counts = {}
+            _number_keys([key for key, _n in self._keys], self._key_counts)
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self._keys.extend(_number_keys([row.key for row in rows], self._key_counts))
+        self.endInsertRows()
+
+    def reconcile(self, keys, make_row):
+        """Bring the table in line with an ordered list of (user, task, hazard text) keys.
+
+        Rows whose key is no longer present are removed, rows for new keys are
+        created with make_row(key) and inserted in tree order, and every other
+        row is left untouched along with the values already entered in it.
+        Returns the number of (added, removed) rows.
+        """
+        wanted = _number_keys(keys)
+        wanted_set = set(wanted)
+        self._key_counts = None
+
+        # Drop stale rows, one removeRows per contiguous run, from the bottom up
+        removed = 0
+        row = len(self._keys) - 1
+        while row >= 0:
+            if self._keys[row] in wanted_set:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self._keys[row] not in wanted_set:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            del self._rows[row + 1:last + 1]
+            del self._keys[row + 1:last + 1]
+            self.endRemoveRows()
+            removed += last - row
+
+        # Surviving rows must already be in tree order for an in-place merge
+        position = {key: i for i, key in enumerate(wanted)}
+        survivors = [position[key] for key in self._keys]
+        if any(a > b for a, b in zip(survivors, survivors[1:])):
+            existing = dict(zip(self._keys, self._rows))
+            added = len(wanted) - len(existing)
+            self.beginResetModel()
+            self._rows = [existing[key] if key in existing else make_row(key[0]) for key in wanted]
+            self._keys = wanted
+            self.endResetModel()
+            return added, removed
+
+        # Merge new keys in, one insertRows per contiguous run
+        added = 0
+        row = 0
+        i = 0
+        while i < len(wanted):
+            if row < len(self._keys) and self._keys[row] == wanted[i]:
+                row += 1
+                i += 1
+                continue
+            start = i
+            while i < len(wanted) and (row >= len(self._keys) or self._keys[row] != wanted[i]):
+                i += 1
+            new_keys = wanted[start:i]
+            self.beginInsertRows(QModelIndex(), row, row + len(new_keys) - 1)
+            self._rows[row:row] = [make_row(key[0]) for key in new_keys]
+            self._keys[row:row] = new_keys
+            self.endInsertRows()
+            row += len(new_keys)
+            added += len(new_keys)
+
+        # Item IDs are derived from the row number, so repaint them after a shift
+        if (added or removed) and self._rows:
+            self.dataChanged.emit(self.index(0, COL_ITEM_ID), self.index(len(self._rows) - 1, COL_ITEM_ID))
+        return added, removed
+
+    def clear(self):
+        self.set_rows([])
+
+
+# Hazards table columns
+HAZARD_TABLE_COLUMNS = ["Hazard", "Cause/Failure", "Selected"]
+HAZARD_COL_NAME = 0
+HAZARD_COL_CAUSE = 1
+HAZARD_COL_SELECTED = 2
+
+
+class HazardSelectionModel(QAbstractTableModel):
+    """Checkable (hazard, cause) list for the category shown in the hazards table.
+
+    Rows share the catalog's tuple until they are edited, and check state is
+    read from the window's per-category selection sets rather than stored per
+    row, so switching categories is a single model reset.
+    """
+
+    # Emitted when the user checks or unchecks a hazard: (hazard name, checked)
+    selectionToggled = pyqtSignal(str, bool)
+    # Emitted when a hazard name is edited: (old name, new name)
+    hazardRenamed = pyqtSignal(str, str)
+
+    def __init__(self, selections, parent=None):
+        super().__init__(parent)
+        self._selections = selections
+        self._category = None
+        self._hazards = ()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._hazards)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HAZARD_TABLE_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HAZARD_TABLE_COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def _is_checked(self, name):
+        return name in self._selections.get(self._category, ())
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name, cause = self._hazards[index.row()]
+        col = index.column()
+        if col == HAZARD_COL_SELECTED:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if self._is_checked(name) else Qt.Unchecked
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return name if col == HAZARD_COL_NAME else cause
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if not index.isValid():
+            return flags
+        if index.column() == HAZARD_COL_SELECTED:
+            return flags | Qt.ItemIsUserCheckable
+        return flags | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        row = index.row()
+        name, cause = self._hazards[row]
+        if index.column() == HAZARD_COL_SELECTED and role == Qt.CheckStateRole:
+            self.selectionToggled.emit(name, Qt.CheckState(value) == Qt.Checked)
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            return True
+        if role != Qt.EditRole:
+            return False
+        if index.column() == HAZARD_COL_NAME:
+            self.set_hazard(row, value, cause)
+        elif index.column() == HAZARD_COL_CAUSE:
+            self.set_hazard(row, name, value)
+        else:
+            return False
+        return True
+
+    # Editing helpers
+
+    def set_category(self, category, hazards):
+        """Show the hazards of another category (hazards is usually a shared catalog tuple)"""
+        self.beginResetModel()
+        self._category = category
+        self._hazards = hazards
+        self.endResetModel()
+
+    def _own_rows(self):
+        """Copy the shared catalog tuple before the first edit"""
+        if isinstance(self._hazards, tuple):
+            self._hazards = list(self._hazards)
+        return self._hazards
+
+    def hazard(self, row):
+        """Return the (name, cause) shown in a row"""
+        return self._hazards[row]
+
+    def add_hazard(self, name, cause):
+        rows = self._own_rows()
+        row = len(rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        rows.append((name, cause))
+        self.endInsertRows()
+
+    def set_hazard(self, row, name, cause):
+        rows = self._own_rows()
+        old_name = rows[row][0]
+        rows[row] = (name, cause)
+        if old_name != name:
+            self.hazardRenamed.emit(old_name, name)
+        self.dataChanged.emit(self.index(row, HAZARD_COL_NAME), self.index(row, HAZARD_COL_SELECTED))
+
+    def remove_hazard(self, row):
+        rows = self._own_rows()
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del rows[row]
+        self.endRemoveRows()
+
+    def checked_hazards(self):
+        """Return the (name, cause) pairs currently checked in this category"""
+        return [(name, cause) for name, cause in self._hazards if self._is_checked(name)]
+
+    def refresh_checks(self):
+        """Repaint the check column after selections changed outside the model"""
+        if self._hazards:
+            self.dataChanged.emit(
+                self.index(0, HAZARD_COL_SELECTED),
+                self.index(len(self._hazards) - 1, HAZARD_COL_SELECTED),
+                [Qt.CheckStateRole]
+            )
+
+
+# Hazard tree columns
+TREE_COLUMNS = ["User/Role", "Task", "Hazard"]
+TREE_COL_USER = 0
+TREE_COL_TASK = 1
+TREE_COL_HAZARD = 2
+
+
+class HazardTreeModel(QAbstractItemModel):
+    """Item model presenting a Project's user -> task -> hazard hierarchy.
+
+    The Project dataclasses are the single source of truth; saving, refreshing
+    and combo population read them directly instead of walking the view.
+    Each index points at its User, Task or Hazard object.
+    """
+
+    def __init__(self, project=None, parent=None):
+        super().__init__(parent)
+        self.project = project or Project(name="")
+        # id(node) -> parent node (None for users) and row under it; keep parent() lookups cheap
+        self._parents = {}
+        self._rows = {}
+        # id(task) -> Counter of hazard descriptions, for O(1) duplicate checks
+        self._task_hazards = {}
+        self._index_parents()
+
+    def _index_parents(self):
+        self._parents = {}
+        self._rows = {}
+        self._task_hazards = {}
+        for user_row, user in enumerate(self.project.users):
+            self._parents[id(user)] = None
+            self._rows[id(user)] = user_row
+            for task_row, task in enumerate(user.tasks):
+                self._parents[id(task)] = user
+                self._rows[id(task)] = task_row
+                self._task_hazards[id(task)] = Counter(hazard.description for hazard in task.hazards)
+                for hazard_row, hazard in enumerate(task.hazards):
+                    self._parents[id(hazard)] = task
+                    self._rows[id(hazard)] = hazard_row
+
+    def set_project(self, project):
+        """Show a different Project, replacing the whole tree"""
+        self.beginResetModel()
+        self.project = project
+        self._index_parents()
+        self.endResetModel()
+
+    # Qt model interface
+
+    def _children(self, node):
+        if node is None:
+            return self.project.users
+        if isinstance(node, User):
+            return node.tasks
+        if isinstance(node, Task):
+            return node.hazards
+        return []
+
+    def _row_of(self, node):
+        return self._rows.get(id(node), -1)
+
+    def node(self, index):
+        """Return the User, Task or Hazard behind an index (None for the root)"""
+        return index.internalPointer() if index.isValid() else None
+
+    def index(self, row, column, parent=QModelIndex()):
+        children = self._children(self.node(parent))
+        if 0 <= row < len(children) and 0 <= column < len(TREE_COLUMNS):
+            return self.createIndex(row, column, children[row])
+        return QModelIndex()
+
+    def index_of(self, node, column=0):
+        """Return the model index for a node"""
+        if node is None:
+            return QModelIndex()
+        return self.createIndex(self._row_of(node), column, node)
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self.index_of(self._parents.get(id(index.internalPointer())))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        return len(self._children(self.node(parent)))
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(TREE_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return TREE_COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def _text_column(self, node):
+        if isinstance(node, User):
+            return TREE_COL_USER
+        if isinstance(node, Task):
+            return TREE_COL_TASK
+        return TREE_COL_HAZARD
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        node = index.internalPointer()
+        if index.column() != self._text_column(node):
+            return ""
+        if isinstance(node, Hazard):
+            return node.description
+        return node.name
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == self._text_column(index.internalPointer()):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        node = index.internalPointer()
+        if index.column() != self._text_column(node):
+            return False
+        if isinstance(node, Hazard):
+            descriptions = self._task_hazards[id(self._parents[id(node)])]
+            descriptions[node.description] -= 1
+            if descriptions[node.description] <= 0:
+                del descriptions[node.description]
+            descriptions[value] += 1
+            node.description = value
+        else:
+            node.name = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    # Editing helpers
+
+    def add_user(self, name):
+        """Append a user and return its index"""
+        user = User(name=name)
+        row = len(self.project.users)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.project.add_user(user)
+        self._parents[id(user)] = None
+        self._rows[id(user)] = row
+        self.endInsertRows()
+        return self.index_of(user, TREE_COL_USER)
+
+    def add_task(self, user, name):
+        """Append a task to a user and return its index"""
+        task = Task(name=name)
+        row = len(user.tasks)
+        self.beginInsertRows(self.index_of(user), row, row)
+        user.add_task(task)
+        self._parents[id(task)] = user
+        self._rows[id(task)] = row
+        self._task_hazards[id(task)] = Counter()
+        self.endInsertRows()
+        return self.index_of(task, TREE_COL_TASK)
+
+    def add_hazards(self, task, descriptions):
+        """Append hazards to a task in one insert and return their Hazard objects"""
+        hazards = [Hazard(description=description) for description in descriptions]
+        if not hazards:
+            return hazards
+        row = len(task.hazards)
+        self.beginInsertRows(self.index_of(task), row, row + len(hazards) - 1)
+        descriptions = self._task_hazards[id(task)]
+        for hazard_row, hazard in enumerate(hazards, row):
+            task.add_hazard(hazard)
+            self._parents[id(hazard)] = task
+            self._rows[id(hazard)] = hazard_row
+            descriptions[hazard.description] += 1
+        self.endInsertRows()
+        return hazards
+
+    def has_hazard(self, task, description):
+        """True if task already has a hazard with this description"""
+        return description in self._task_hazards[id(task)]
+
+    def add_new_hazards(self, task, descriptions):
+        """Append only the descriptions task does not already have, in linear time"""
+        existing = self._task_hazards[id(task)]
+        seen = set()
+        new_descriptions = []
+        for description in descriptions:
+            if description not in existing and description not in seen:
+                seen.add(description)
+                new_descriptions.append(description)
+        return self.add_hazards(task, new_descriptions)
+
+    def remove(self, index):
+        """Remove the node at index along with everything below it"""
+        node = self.node(index)
+        if node is None:
+            return
+        parent_node = self._parents.get(id(node))
+        siblings = self._children(parent_node)
+        row = self._row_of(node)
+        self.beginRemoveRows(self.index_of(parent_node), row, row)
+        del siblings[row]
+        for later_row in range(row, len(siblings)):
+            self._rows[id(siblings[later_row])] = later_row
+        if isinstance(node, Hazard):
+            descriptions = self._task_hazards[id(parent_node)]
+            descriptions[node.description] -= 1
+            if descriptions[node.description] <= 0:
+                del descriptions[node.description]
+        self._forget(node)
+        self.endRemoveRows()
+
+    def _forget(self, node):
+        self._parents.pop(id(node), None)
+        self._rows.pop(id(node), None)
+        self._task_hazards.pop(id(node), None)
+        for child in self._children(node):
+            self._forget(child)
+
+    def parent_node(self, node):
+        return self._parents.get(id(node))
+
+
+def hazard_label(user, task, hazard):
+    """Text shown for a hazard in the "Associated Hazard" combo boxes"""
+    return f"{user.name} - {task.name} - {hazard.description}"
+
+
+class HazardListModel(QAbstractListModel):
+    """Flat "user - task - hazard" list shared by every Associated Hazard combo box.
+
+    The list follows a HazardTreeModel through its row signals, so tree edits
+    insert, remove or relabel only the affected entries and the combo boxes
+    keep their current selection. row_of() looks labels up through a hash
+    index instead of QComboBox.findText().
+    """
+
+    def __init__(self, tree_model, parent=None):
+        super().__init__(parent)
+        self.tree_model = tree_model
+        self._labels = []
+        self._index = None
+        self._pending_removal = None
+        tree_model.modelReset.connect(self.rebuild)
+        tree_model.rowsInserted.connect(self._on_rows_inserted)
+        tree_model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        tree_model.rowsRemoved.connect(self._on_rows_removed)
+        tree_model.dataChanged.connect(self._on_data_changed)
+        self.rebuild()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._labels)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return self._labels[index.row()]
+        return None
+
+    def labels(self):
+        return self._labels
+
+    def row_of(self, label):
+        """Return the row holding label, or -1"""
+        if self._index is None:
+            self._index = {}
+            for row, text in enumerate(self._labels):
+                self._index.setdefault(text, row)
+        return self._index.get(label, -1)
+
+    def rebuild(self):
+        self.beginResetModel()
+        self._labels = [hazard_label(*entry) for entry in self.tree_model.project.iter_hazards()]
+        self._index = None
+        self.endResetModel()
+
+    # Mapping between tree nodes and flat list rows
+
+    def _hazards_before(self, node):
+        """Number of list rows that come before the first hazard of node"""
+        tree = self.tree_model
+        count = 0
+        if isinstance(node, Hazard):
+            task = tree.parent_node(node)
+            return self._hazards_before(task) + tree._row_of(node)
+        if isinstance(node, Task):
+            user = tree.parent_node(node)
+            count = self._hazards_before(user)
+            for task in user.tasks:
+                if task is node:
+                    return count
+                count += len(task.hazards)
+        for user in tree.project.users:
+            if user is node:
+                return count
+            count += sum(len(task.hazards) for task in user.tasks)
+        return count
+
+    def _entries(self, node):
+        """(user, task, hazard) entries under a tree node, in list order"""
+        tree = self.tree_model
+        if isinstance(node, Hazard):
+            task = tree.parent_node(node)
+            return [(tree.parent_node(task), task, node)]
+        if isinstance(node, Task):
+            return [(tree.parent_node(node), node, hazard) for hazard in node.hazards]
+        return [(node, task, hazard) for task in node.tasks for hazard in task.hazards]
+
+    def _span(self, parent, first, last):
+        """List offset and entries for tree rows first..last under parent"""
+        children = self.tree_model._children(self.tree_model.node(parent))[first:last + 1]
+        entries = []
+        for child in children:
+            entries.extend(self._entries(child))
+        offset = self._hazards_before(children[0]) if children else 0
+        return offset, entries
+
+    def _on_rows_inserted(self, parent, first, last):
+        offset, entries = self._span(parent, first, last)
+        if not entries:
+            return
+        self.beginInsertRows(QModelIndex(), offset, offset + len(entries) - 1)
+        self._labels[offset:offset] = [hazard_label(*entry) for entry in entries]
+        self._index = None
+        self.endInsertRows()
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        offset, entries = self._span(parent, first, last)
+        self._pending_removal = (offset, len(entries)) if entries else None
+        if self._pending_removal:
+            self.beginRemoveRows(QModelIndex(), offset, offset + len(entries) - 1)
+
+    def _on_rows_removed(self, parent, first, last):
+        if not self._pending_removal:
+            return
+        offset, count = self._pending_removal
+        self._pending_removal = None
+        del self._labels[offset:offset + count]
+        self._index = None
+        self.endRemoveRows()
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        node = self.tree_model.node(top_left)
+        if node is None:
+            return
+        offset = self._hazards_before(node)
+        entries = self._entries(node)
+        if not entries:
+            return
+        self._labels[offset:offset + len(entries)] = [hazard_label(*entry) for entry in entries]
+        self._index = None
+        self.dataChanged.emit(self.index(offset), self.index(offset + len(entries) - 1))
+
+
+class ComboBoxDelegate(QStyledItemDelegate):
+    """Delegate that edits a cell with a QComboBox of fixed choices.
+
+    The combo box only exists while the cell is being edited; every other
+    cell is painted as plain text by the view.
+    """
+
+    def __init__(self, items, parent=None):
+        super().__init__(parent)
+        self.items = list(items)
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.addItems(self.items)
+        editor.activated.connect(lambda _: self._commit_and_close(editor))
+        QTimer.singleShot(0, editor.showPopup)
+        return editor
+
+    def setEditorData(self, editor, index):
+        i = editor.findText(index.data(Qt.EditRole))
+        editor.setCurrentIndex(max(i, 0))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
+
+    def _commit_and_close(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor, QStyledItemDelegate.NoHint)
+
+
+def _number_keys(keys, seen=None):
+    """Pair every key with its occurrence count so repeated keys stay unique.
+
+    Pass the same `seen` dict again to carry the counts on over more keys.
+    """
+    if seen is None:
+        seen = {}
+    numbered = []
+    for key in keys:
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        numbered.append((key, n))
+    return numbered
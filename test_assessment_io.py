@@ -0,0 +1,110 @@
+"""Round trips through the assessment file formats"""
+
+import json
+import os
+import sqlite3
+
+import pytest
+
+from assessment_io import decode_assessment, encode_assessment, load_assessment, write_json_atomic
+from assessment_store import AssessmentStore
+from risk_assessment import (
+    AlternativeMethodRow, Assessment, ControlSystemRow, Hazard, Project, RiskRow, Task, User,
+)
+
+
+def sample_assessment() -> Assessment:
+    project = Project(name="Press")
+    user = User(name="Operator")
+    user.add_task(Task(name="Cleaning", hazards=[Hazard(description="Pinch point - Closing die")]))
+    project.add_user(user)
+    return Assessment(
+        project_info={'name': "Press"},
+        project=project,
+        risk_rows=[
+            RiskRow("Operator", "Cleaning", "Mechanical", "Pinch point", "Closing die",
+                    "Serious", "Likely", "Guard", "Minor", "Remote"),
+            RiskRow("Operator", "Cleaning", "Mechanical", "Pinch point", "",
+                    "", "", "", "", ""),
+        ],
+        control_systems=[
+            ControlSystemRow("Guard door", "Pinch point", "Medium-High", "Low",
+                             "Category 3", "Category 2", "Interlock", "Tested"),
+            ControlSystemRow("Stop", "Pinch point", "", "", "", "", "Custom stop", ""),
+        ],
+        alternative_methods=[
+            AlternativeMethodRow("Cleaning", "Pinch point", "No", "Die open"),
+            AlternativeMethodRow("Cleaning", "Pinch point", ""),
+            AlternativeMethodRow("Cleaning", "Pinch point", "Pending sign-off"),
+        ],
+    )
+
+
+def assert_same_rows(loaded: Assessment, expected: Assessment):
+    assert loaded.risk_rows == expected.risk_rows
+    assert loaded.control_systems == expected.control_systems
+    assert loaded.alternative_methods == expected.alternative_methods
+
+
+def test_encode_decode_keeps_empty_and_free_text_cells():
+    assessment = sample_assessment()
+    data = json.loads(json.dumps(encode_assessment(assessment)))
+    assert_same_rows(decode_assessment(data), assessment)
+
+
+def test_unknown_codes_read_as_empty_cells():
+    data = encode_assessment(sample_assessment())
+    data['risk_rows']['rows'][0][5] = 99
+    data['control_systems']['rows'][0][4] = -1
+    data['alternative_methods']['rows'][0][2] = None
+    loaded = decode_assessment(data)
+    assert loaded.risk_rows[0].initial_severity == ""
+    assert loaded.control_systems[0].required_category == ""
+    assert loaded.alternative_methods[0].risk_assessment_complete == ""
+
+
+def test_compressed_file_round_trip(tmp_path):
+    assessment = sample_assessment()
+    path = str(tmp_path / "press.json.gz")
+    write_json_atomic(path, encode_assessment(assessment))
+    assert_same_rows(load_assessment(path), assessment)
+
+
+def test_store_round_trip(tmp_path):
+    assessment = sample_assessment()
+    path = str(tmp_path / "press.rdb")
+    with AssessmentStore(path) as store:
+        store.save_data(encode_assessment(assessment))
+    with AssessmentStore(path) as store:
+        assert_same_rows(store.load(), assessment)
+    with AssessmentStore(path, read_only=True) as store:
+        assert_same_rows(store.load(), assessment)
+
+
+def test_read_only_store_leaves_other_files_alone(tmp_path):
+    path = str(tmp_path / "other.rdb")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE notes (text)")
+    connection.commit()
+    connection.close()
+    with open(path, 'rb') as f:
+        before = f.read()
+    with pytest.raises(ValueError):
+        AssessmentStore(path, read_only=True)
+    with open(path, 'rb') as f:
+        assert f.read() == before
+    assert os.listdir(str(tmp_path)) == ["other.rdb"]
+
+
+def test_version_0_rows_keep_their_risk_levels():
+    levels = ("High", "Medium", "Low")
+    rows = [
+        {'col_0': "Operator", 'col_1': "Cleaning", 'col_2': "Pinch point",
+         'col_3': severity, 'col_4': likelihood, 'col_5': risk,
+         'col_7': severity, 'col_8': likelihood, 'col_9': risk}
+        for severity in levels for likelihood in ("Frequent", "Occasional", "Rare") for risk in levels
+    ]
+    loaded = decode_assessment({'hazards': [], 'risk_assessment': rows})
+    assert [(row.initial_risk, row.residual_risk) for row in loaded.risk_rows] == [
+        (row['col_5'], row['col_9']) for row in rows
+    ]
@@ -0,0 +1,71 @@
+"""
+Application-wide look for the Risk Assessment Tool.
+
+All styling lives in one style sheet installed on the QApplication, so Qt
+parses it once instead of once per widget. Widgets are matched by class
+within a named container (every button in the main window's central widget
+looks the same) or, for the few that differ, by object name.
+
+A style sheet font applies only to the widgets a rule matches; it is not
+inherited. So each container's font size is given to the container and
+everything in it ("QWidget#centralWidget, QWidget#centralWidget *"), which
+more specific rules override. That rule is the only one that matches the
+combo boxes placed in table cells: each rule that applies to a widget has
+to be resolved when it is polished, and tables can hold thousands of them.
+Create them with the table's viewport as parent, since moving an already
+polished widget into the table polishes it again.
+"""
+
+_ACTION_BUTTON = "background-color: #f0f0f0; border: 2px solid #ccc; border-radius: 10px;"
+
+STYLE_SHEET = f"""
+QDialog#startupDialog QLabel {{ font-size: 32px; font-weight: bold; margin: 40px; color: #333; }}
+QDialog#startupDialog QPushButton {{
+    font-size: 24px; padding: 20px; margin: 20px; color: white; border: none; border-radius: 10px;
+}}
+QDialog#startupDialog QPushButton#newButton {{ background-color: #4CAF50; }}
+QDialog#startupDialog QPushButton#loadButton {{ background-color: #2196F3; }}
+QDialog#startupDialog QPushButton#libraryButton {{ background-color: #607D8B; }}
+QDialog#startupDialog QPushButton#recoverButton {{ background-color: #FF9800; }}
+
+QDialog#libraryDialog, QDialog#libraryDialog * {{ font-size: 20px; }}
+QDialog#libraryDialog QTableWidget, QDialog#libraryDialog QLabel#libraryStatus {{ font-size: 18px; }}
+QDialog#libraryDialog QLineEdit, QDialog#libraryDialog QPushButton, QDialog#libraryDialog QLabel#libraryFolder {{
+    padding: 8px;
+}}
+
+QWidget#centralWidget, QWidget#centralWidget * {{ font-size: 24px; }}
+QWidget#centralWidget QTabBar::tab {{ font-size: 24px; padding: 20px; margin: 8px; }}
+QWidget#centralWidget QHeaderView::section {{ font-weight: bold; padding: 15px; }}
+QWidget#centralWidget QLabel {{ font-weight: bold; margin: 10px; }}
+QWidget#centralWidget QPushButton {{ font-size: 24px; padding: 20px; margin: 10px; {_ACTION_BUTTON} }}
+QWidget#centralWidget QPushButton#smallActionButton {{ font-size: 20px; padding: 15px; margin: 10px; }}
+QWidget#centralWidget QPushButton#navButton {{ font-size: 20px; padding: 15px; margin: 5px; }}
+QWidget#centralWidget QPushButton#transferButton {{
+    font-size: 20px; padding: 15px; margin: 10px;
+    background-color: #4CAF50; color: white; border: 2px solid #45a049; border-radius: 10px;
+}}
+QWidget#centralWidget QLabel#selectionSummary {{
+    font-size: 20px; color: #0066cc; padding: 10px;
+    background-color: #f0f8ff; border: 1px solid #ccc; border-radius: 5px;
+}}
+QWidget#centralWidget QListWidget#categoryList {{ padding: 10px; }}
+QWidget#centralWidget QTextEdit#riskReductionText {{ font-size: 20px; padding: 10px; }}
+QWidget#centralWidget QComboBox#categoryCalculator {{
+    padding: 15px; margin: 10px; border: 2px solid #ccc; border-radius: 8px;
+}}
+QWidget#centralWidget QTableWidget#matrixTable {{ font-size: 20px; }}
+QWidget#centralWidget QTableWidget#matrixTable QHeaderView::section {{ padding: 10px; }}
+
+QDialog#riskReductionMethodsDialog, QDialog#riskReductionMethodsDialog * {{ font-size: 20px; }}
+QDialog#riskReductionMethodsDialog QLabel {{ font-size: 24px; font-weight: bold; margin: 10px; }}
+QDialog#riskReductionMethodsDialog QHeaderView::section {{ font-weight: bold; padding: 15px; }}
+QDialog#riskReductionMethodsDialog QPushButton {{ font-size: 20px; padding: 15px; margin: 10px; {_ACTION_BUTTON} }}
+
+QMessageBox#validationReport {{ font-size: 16px; }}
+"""
+
+
+def apply_theme(app):
+    """Install the style sheet on the QApplication"""
+    app.setStyleSheet(STYLE_SHEET)